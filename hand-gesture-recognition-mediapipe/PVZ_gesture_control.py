@@ -9,14 +9,32 @@ import itertools
 import time
 import screeninfo  # 用于更可靠地获取屏幕分辨率
 import socket  # 导入socket库用于UDP通信
+import asyncio  # 多订阅者发布器
 import json  # 导入json库用于数据格式化
 import multiprocessing as multi_proc  # 导入多进程库
 import ctypes  # 用于创建共享内存类型
+import os
+import functools
+import signal
 from model import KeyPointClassifier
 from model import PointHistoryClassifier  # 新增历史点分类器
-import csv
-from collections import deque  # 新增deque用于历史点存储
-from collections import Counter  # 新增Counter用于统计
+from utils import HandTracker  # 多手跟踪，每只手独立的滤波和历史状态
+from utils import CursorInterpolator  # 高频UDP输出时的光标插值
+from utils import GesturePublisher  # 多订阅者UDP发布器
+from utils import SampleBundler  # 数据包附带最近K个样本，接收端可恢复丢包
+from utils import mirror_x  # 关键点坐标镜像换算，代替整帧翻转
+from utils import mirror_handedness
+from utils import FramePool  # 预分配帧缓冲池
+from utils import negotiate_capture  # 摄像头采集配置协商
+from utils import IdleScanner  # 无手时的省电扫描模式
+from utils import classify_gated  # 姿态不变时跳过关键点分类
+from utils import PipelinedExecutor  # 检测与分类流水线
+from utils import LatestFrameReader  # 丢弃驱动缓冲中的旧帧
+from utils import HotSwapClassifier  # 运行时热替换分类模型
+from utils import watch_model_files
+from utils import reload_control_listener
+from utils import TasksHandsBackend  # MediaPipe Tasks HandLandmarker 后端
+from utils.hand_landmarker_backend import HAND_LANDMARKER_MODEL_URL
 
 def get_args():
     parser = argparse.ArgumentParser()
@@ -35,6 +53,122 @@ def get_args():
                         type=int,
                         default=0.5)
 
+    # 最多跟踪的手数，大于1时每只手的状态放在数据包的hands字段中
+    parser.add_argument("--max_num_hands",
+                        help='max number of tracked hands',
+                        type=int,
+                        default=1)
+
+    # 高频UDP输出: 以固定频率发送在摄像头样本之间插值得到的坐标 (0表示每帧发送一次)
+    parser.add_argument("--udp_rate",
+                        help='interpolated UDP output rate (Hz), 0 to disable',
+                        type=int,
+                        default=0)
+    parser.add_argument("--interp_mode",
+                        choices=['linear', 'hermite'],
+                        default='linear')
+    parser.add_argument("--interp_delay",
+                        help='interpolation render delay (ms)',
+                        type=float,
+                        default=20)
+
+    # 每个数据包附带最近K个带时间戳的样本 (0表示不附带)
+    parser.add_argument("--bundle",
+                        help='number of recent samples bundled in each packet',
+                        type=int,
+                        default=0)
+
+    # 使用多订阅者发布器代替单目标UDP发送，订阅者向控制端口注册
+    parser.add_argument("--publisher", action='store_true')
+    parser.add_argument("--control_port",
+                        help='publisher control port for subscriber registration',
+                        type=int,
+                        default=12346)
+    # 默认只接受本机订阅者，需要局域网订阅者时设为 0.0.0.0
+    parser.add_argument("--control_host", default='127.0.0.1')
+
+    # 手指手势投票迟滞参数
+    parser.add_argument("--vote_min_ratio",
+                        help='finger gesture vote min majority ratio',
+                        type=float,
+                        default=0.5)
+    parser.add_argument("--vote_min_dwell",
+                        help='finger gesture vote min dwell frames',
+                        type=int,
+                        default=3)
+
+    # 采集配置协商：探测后端/像素格式/实际帧率，结果按设备缓存
+    parser.add_argument("--camera_cache",
+                        help='capture profile cache file',
+                        type=str,
+                        default='capture_profiles.json')
+    parser.add_argument("--reprobe_camera", action='store_true')
+    parser.add_argument("--no_camera_probe", action='store_true')
+
+    # 姿态变化门控：关键点向量变化小于阈值时复用上次分类结果
+    parser.add_argument("--pose_gate_threshold",
+                        help='max landmark vector change to reuse the last hand sign (0: disabled)',
+                        type=float,
+                        default=0.02)
+    parser.add_argument("--pose_gate_max_age",
+                        help='force keypoint reclassification every N frames',
+                        type=int,
+                        default=10)
+
+    # 流水线检测：MediaPipe在工作线程中运行，与主线程的分类/发送重叠 (0表示不使用)
+    parser.add_argument("--pipeline_depth",
+                        help='frames in flight in the detection thread (0: disabled)',
+                        type=int,
+                        default=0)
+
+    # 处理跟不上时每次读取最多丢弃的旧帧数 (0表示不丢弃)
+    parser.add_argument("--max_stale_drops",
+                        help='max buffered stale frames skipped per read (0: disabled)',
+                        type=int,
+                        default=4)
+
+    # 手部检测后端: legacy (mp.solutions.hands) / tasks (HandLandmarker LIVE_STREAM)
+    parser.add_argument("--hands_backend",
+                        choices=['legacy', 'tasks'],
+                        default='legacy')
+    parser.add_argument("--landmarker_model",
+                        help='hand_landmarker.task for the tasks backend',
+                        type=str,
+                        default='model/hand_landmarker.task')
+
+    # 分类模型路径及热替换
+    parser.add_argument("--keypoint_model",
+                        type=str,
+                        default='model/keypoint_classifier/keypoint_classifier1.tflite')
+    parser.add_argument("--point_history_model",
+                        type=str,
+                        default='model/point_history_classifier/point_history_classifier1.tflite')
+    parser.add_argument("--watch_models",
+                        help='reload models when model or label files change',
+                        action='store_true')
+    parser.add_argument("--reload_port",
+                        help='UDP port for model reload messages (0: disabled)',
+                        type=int,
+                        default=0)
+
+    # 无手时的省电扫描模式
+    parser.add_argument("--idle_after",
+                        help='seconds without a hand before idle scan mode (0: disabled)',
+                        type=float,
+                        default=3.0)
+    parser.add_argument("--idle_scan_rate",
+                        help='detection scan rate in idle mode (Hz)',
+                        type=float,
+                        default=5.0)
+    parser.add_argument("--idle_scan_scale",
+                        help='image scale for idle detection scans',
+                        type=float,
+                        default=0.5)
+    parser.add_argument("--idle_motion_threshold",
+                        help='frame difference gate for idle scans (0: disabled)',
+                        type=float,
+                        default=0.0)
+
     args = parser.parse_args()
 
     return args
@@ -90,14 +224,82 @@ def pre_process_point_history(image, point_history):
     return temp_point_history
 
 
+# 多手状态JSON的共享缓冲区最小大小(字节)，以及按手数估算时每只手条目的上限
+HANDS_PACKET_SIZE = 2048
+HAND_ENTRY_SIZE = 192
+
+# Tasks 后端的在途帧数上限
+TASKS_MAX_IN_FLIGHT = 2
+
+
+def create_shared_data(max_num_hands=1):
+    """
+    创建主进程与UDP发送进程之间的共享状态
+
+    参数:
+        max_num_hands: 最多检测的手数，决定多手状态缓冲区的大小
+    """
+    hands_packet_size = max(HANDS_PACKET_SIZE, max_num_hands * HAND_ENTRY_SIZE + 2)
+    return {
+        'x': multi_proc.Value(ctypes.c_double, 0.5),  # 归一化X坐标，初始为0.5
+        'y': multi_proc.Value(ctypes.c_double, 0.5),  # 归一化Y坐标，初始为0.5
+        'timestamp': multi_proc.Value(ctypes.c_double, 0.0),  # 坐标对应的采集时间 (time.perf_counter())
+        'gesture': multi_proc.Array(ctypes.c_char, b'Idle'.ljust(20)),  # 手势类型，初始为Idle，固定长度20字节
+        'finger_gesture': multi_proc.Array(ctypes.c_char, b'None'.ljust(20)),  # 新增：手指轨迹手势
+        'trigger_send': multi_proc.Value(ctypes.c_bool, False),  # 新增：发送触发器
+        'hands': multi_proc.Array(ctypes.c_char, hands_packet_size),  # 多手模式：所有手状态的JSON
+    }
+
+
+def read_shared_packet(shared_data):
+    """从共享状态读取当前数据包内容"""
+    data = {
+        "x": shared_data['x'].value,
+        "y": shared_data['y'].value,
+        "hand_gesture": shared_data['gesture'].value.decode('utf-8').strip().lower(),
+        "finger_gesture": shared_data['finger_gesture'].value.decode('utf-8').strip().lower()
+    }
+
+    # 多手模式下附带每只手的状态，加锁读取避免读到写了一半的内容
+    with shared_data['hands'].get_lock():
+        hands_json = shared_data['hands'].value
+    if hands_json:
+        try:
+            data["hands"] = json.loads(hands_json.decode('utf-8'))
+        except ValueError:
+            pass  # 内容异常时本次不附带多手状态，不能让发送进程退出
+
+    return data
+
+
+def write_shared_hands(shared_data, hand_packets):
+    """
+    写入多手状态JSON
+
+    超过缓冲区大小时整条丢弃末尾的手，保证写入的始终是完整的JSON
+    """
+    buffer_size = len(shared_data['hands'])
+    hands_json = json.dumps(hand_packets).encode('utf-8')
+    while len(hands_json) >= buffer_size and hand_packets:
+        hand_packets = hand_packets[:-1]
+        hands_json = json.dumps(hand_packets).encode('utf-8')
+    with shared_data['hands'].get_lock():
+        shared_data['hands'].value = hands_json
+
+
 # 修改UDP发送函数，使其在单独的进程中运行
-def udp_sender_process(shared_data, exit_flag):
+def udp_sender_process(shared_data, exit_flag, udp_rate=0, interp_mode='linear', interp_delay=0.02,
+                       bundle_size=0):
     """
     UDP发送进程，循环发送共享数据
     
     参数:
         shared_data: 包含共享状态的字典
         exit_flag: 退出标志
+        udp_rate: 大于0时按该频率(Hz)发送插值后的坐标，否则每个新样本发送一次
+        interp_mode: 插值模式 ('linear' / 'hermite')
+        interp_delay: 插值渲染延迟 (秒)
+        bundle_size: 大于0时每个数据包附带最近 bundle_size 个样本
     """
     # 创建UDP套接字
     udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -105,29 +307,57 @@ def udp_sender_process(shared_data, exit_flag):
     target_addr = ('127.0.0.1', 12345)
     print(f"UDP发送进程已启动，目标地址: {target_addr}")
     
+    # 插值模式: 新样本只进入插值器，由固定频率的发送时钟输出
+    interpolator = None
+    if udp_rate > 0:
+        interpolator = CursorInterpolator(delay=interp_delay, mode=interp_mode)
+        send_interval = 1.0 / udp_rate
+        next_send_time = time.perf_counter()
+        latest_data = None
+    
+    bundler = SampleBundler(bundle_size) if bundle_size > 0 else None
+    
     try:
         while not exit_flag.value:
             # 检查是否需要发送数据
             if shared_data['trigger_send'].value:
                 # 创建JSON数据包 
-                data = {
-                    "x": shared_data['x'].value,
-                    "y": shared_data['y'].value,
-                    "hand_gesture": shared_data['gesture'].value.decode('utf-8').strip().lower(),
-                    "finger_gesture": shared_data['finger_gesture'].value.decode('utf-8').strip().lower()
-                }
+                data = read_shared_packet(shared_data)
+                if bundler is not None:
+                    bundler.add(shared_data['timestamp'].value, data["x"], data["y"])
+                    bundler.encode(data)
                 
-                # 转换为JSON字符串并编码为bytes
-                json_data = json.dumps(data).encode('utf-8')
-                
-                try:
-                    # 发送数据包
-                    udp_socket.sendto(json_data, target_addr)
-                    # 重置触发标志
+                if interpolator is not None:
+                    interpolator.add_sample(shared_data['timestamp'].value, data["x"], data["y"])
+                    latest_data = data
                     with shared_data['trigger_send'].get_lock():
                         shared_data['trigger_send'].value = False
-                except Exception as e:
-                    print(f"发送UDP数据包错误: {e}")
+                else:
+                    # 转换为JSON字符串并编码为bytes
+                    json_data = json.dumps(data).encode('utf-8')
+                    
+                    try:
+                        # 发送数据包
+                        udp_socket.sendto(json_data, target_addr)
+                        # 重置触发标志
+                        with shared_data['trigger_send'].get_lock():
+                            shared_data['trigger_send'].value = False
+                    except Exception as e:
+                        print(f"发送UDP数据包错误: {e}")
+            
+            # 按固定频率发送插值坐标
+            if interpolator is not None and latest_data is not None:
+                now = time.perf_counter()
+                if now >= next_send_time:
+                    data = dict(latest_data)
+                    data["x"], data["y"] = interpolator.sample(now)
+                    try:
+                        udp_socket.sendto(json.dumps(data).encode('utf-8'), target_addr)
+                    except Exception as e:
+                        print(f"发送UDP数据包错误: {e}")
+                    next_send_time += send_interval
+                    if next_send_time < now:
+                        next_send_time = now + send_interval
             
             # 短暂休眠以减少CPU使用率，但保持响应性
             time.sleep(0.001)
@@ -152,6 +382,59 @@ def udp_sender_process(shared_data, exit_flag):
         print("UDP发送进程已终止")
 
 
+def udp_publisher_process(shared_data, exit_flag, control_port=12346, bundle_size=0,
+                          control_host='127.0.0.1'):
+    """
+    多订阅者发布进程：Qt游戏(127.0.0.1:12345)为固定订阅者，
+    其他客户端(录制、分析面板、第二个游戏实例等)通过控制端口注册，各自设置频率和格式
+
+    参数:
+        shared_data: 包含共享状态的字典
+        exit_flag: 退出标志
+        control_port: 订阅者注册端口
+        bundle_size: 大于0时JSON数据包附带最近 bundle_size 个样本
+        control_host: 控制端口绑定的地址
+    """
+    publisher = GesturePublisher(control_port=control_port,
+                                 static_targets=[('127.0.0.1', 12345)],
+                                 control_host=control_host)
+    bundler = SampleBundler(bundle_size) if bundle_size > 0 else None
+
+    async def run():
+        await publisher.start()
+        print(f"UDP发布进程已启动，控制端口: {control_host}:{control_port}")
+        while not exit_flag.value:
+            if shared_data['trigger_send'].value:
+                data = read_shared_packet(shared_data)
+                data["timestamp"] = shared_data['timestamp'].value
+                if bundler is not None:
+                    bundler.add(data["timestamp"], data["x"], data["y"])
+                    bundler.encode(data)
+                with shared_data['trigger_send'].get_lock():
+                    shared_data['trigger_send'].value = False
+                publisher.publish(data)
+            else:
+                # 受频率限制的订阅者在到达发送时间后补发最新状态
+                publisher.flush()
+            await asyncio.sleep(0.001)
+
+        # 发送最终退出消息
+        publisher.broadcast({
+            "x": shared_data['x'].value,
+            "y": shared_data['y'].value,
+            "hand_gesture": "exit",
+            "finger_gesture": "none"
+        })
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        publisher.close()
+        print("UDP发布进程已终止")
+
+
 def apply_coordinate_filter(new_point, history, smoothing_factor=0.5, history_weight=0.8):
     """
     对坐标进行双重滤波，减少抖动
@@ -188,20 +471,31 @@ def apply_coordinate_filter(new_point, history, smoothing_factor=0.5, history_we
 
 
 def main():
+    # Argument parsing #################################################################
+    args = get_args()
+    max_num_hands = args.max_num_hands
+
+    if args.hands_backend == 'tasks' and not os.path.exists(args.landmarker_model):
+        print(f"找不到 HandLandmarker 模型: {args.landmarker_model}")
+        print(f"请从 {HAND_LANDMARKER_MODEL_URL} 下载")
+        return
+
     # 创建共享状态变量
-    shared_data = {
-        'x': multi_proc.Value(ctypes.c_double, 0.5),  # 归一化X坐标，初始为0.5
-        'y': multi_proc.Value(ctypes.c_double, 0.5),  # 归一化Y坐标，初始为0.5
-        'gesture': multi_proc.Array(ctypes.c_char, b'Idle'.ljust(20)),  # 手势类型，初始为Idle，固定长度20字节
-        'finger_gesture': multi_proc.Array(ctypes.c_char, b'None'.ljust(20)),  # 新增：手指轨迹手势
-        'trigger_send': multi_proc.Value(ctypes.c_bool, False),  # 新增：发送触发器
-    }
+    shared_data = create_shared_data(max_num_hands)
     
     # 退出标志
     exit_flag = multi_proc.Value(ctypes.c_bool, False)
     
     # 启动UDP发送进程
-    udp_process = multi_proc.Process(target=udp_sender_process, args=(shared_data, exit_flag))
+    if args.publisher:
+        udp_process = multi_proc.Process(target=udp_publisher_process,
+                                         args=(shared_data, exit_flag, args.control_port, args.bundle,
+                                               args.control_host))
+    else:
+        udp_process = multi_proc.Process(target=udp_sender_process,
+                                         args=(shared_data, exit_flag, args.udp_rate,
+                                               args.interp_mode, args.interp_delay / 1000.0,
+                                               args.bundle))
     udp_process.daemon = True  # 设置为守护进程，主进程退出时自动终止
     udp_process.start()
     print("UDP发送进程已启动")
@@ -231,70 +525,100 @@ def main():
     
     # 添加变量存储最后有效的手部位置 (默认为屏幕中心)
     last_valid_position = (0.5, 0.5)  # 归一化坐标 (0-1)
-    last_valid_raw_position = (screen_width // 2, screen_height // 2)  # 原始像素坐标
     
     # 移动平均滤波器参数 (提高平滑度)
-    positions_history = []  # 存储历史位置
     history_length = 5  # 增加历史位置数量
     smoothing_factor = 0.6  # 平滑因子 (0-1)，越大越平滑
     history_weight = 0.7   # 历史数据权重
-    
-    # 添加历史点跟踪 - 类似app.py
-    point_history = deque(maxlen=16)  # 存储16个历史点
-    finger_gesture_history = deque(maxlen=16)  # 存储手指手势历史
 
-    # Argument parsing #################################################################
-    args = get_args()
+    # 多手跟踪器：每只手独立保存滤波历史、16点轨迹和手指手势投票器(增量计数 + 迟滞)
+    hand_tracker = HandTracker(
+        history_length=16,
+        vote_kwargs={'min_ratio': args.vote_min_ratio,
+                     'min_dwell': args.vote_min_dwell},
+        gate_kwargs={'threshold': args.pose_gate_threshold,
+                     'max_age': args.pose_gate_max_age})
     cap_device = args.device
     cap_width = args.width
     cap_height = args.height
 
     # Camera preparation ###############################################################
-    cap = cv.VideoCapture(cap_device)
-    cap.set(cv.CAP_PROP_FRAME_WIDTH, cap_width)
-    cap.set(cv.CAP_PROP_FRAME_HEIGHT, cap_height)
+    if args.no_camera_probe:
+        cap = cv.VideoCapture(cap_device)
+        cap.set(cv.CAP_PROP_FRAME_WIDTH, cap_width)
+        cap.set(cv.CAP_PROP_FRAME_HEIGHT, cap_height)
+        cap.set(cv.CAP_PROP_FPS, 60)  # 尝试设置高帧率
+        cap.set(cv.CAP_PROP_BUFFERSIZE, 1)
+    else:
+        # 选择该摄像头实际能提供的最低延迟模式 (首次运行探测，之后读取缓存)
+        cap, _ = negotiate_capture(cap_device, cap_width, cap_height, 60,
+                                   cache_path=args.camera_cache,
+                                   reprobe=args.reprobe_camera)
     
     # 获取实际设置的分辨率
     actual_width = int(cap.get(cv.CAP_PROP_FRAME_WIDTH))
     actual_height = int(cap.get(cv.CAP_PROP_FRAME_HEIGHT))
     print(f"摄像头分辨率: {actual_width}x{actual_height}")
 
-    # 设置摄像头帧率
-    cap.set(cv.CAP_PROP_FPS, 60)  # 尝试设置高帧率
     actual_fps = cap.get(cv.CAP_PROP_FPS)
     print(f"摄像头帧率: {actual_fps}")
 
+    # 处理跟不上摄像头时用 grab() 丢弃驱动缓冲中的旧帧，只解码最新一帧
+    camera = cap
+    if args.max_stale_drops > 0:
+        camera = LatestFrameReader(cap, fps=actual_fps if actual_fps > 0 else 60,
+                                   max_drops=args.max_stale_drops)
+
+    # 预分配帧缓冲，采集、颜色转换和调试图像每帧复用 (流水线模式下每个在途帧一个槽)
+    # Tasks 后端时，在途帧、已完成待取回的帧和主线程正在处理的帧都锁定在各自的槽中
+    num_slots = args.pipeline_depth + 1
+    if args.hands_backend == 'tasks':
+        num_slots = TASKS_MAX_IN_FLIGHT + 2
+    frame_pool = FramePool(actual_width, actual_height, num_slots=num_slots)
+
     # 初始化MediaPipe Hands，调整参数
-    mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(
-        static_image_mode=False,  # 动态模式，适合实时视频流
-        max_num_hands=1,  # 最多检测一只手
-        min_detection_confidence=0.5,  # 最小检测置信度
-        min_tracking_confidence=0.5,  # 最小跟踪置信度
-        model_complexity=1  # 使用较高复杂度的模型
-    )
-
-    # 加载关键点分类器
-    keypoint_classifier = KeyPointClassifier()
-    
-    # 加载历史点分类器
-    point_history_classifier = PointHistoryClassifier()
-
-    # 读取标签
-    with open('model/keypoint_classifier/keypoint_classifier_label.csv',
-              encoding='utf-8-sig') as f:
-        keypoint_classifier_labels = csv.reader(f)
-        keypoint_classifier_labels = [
-            row[0] for row in keypoint_classifier_labels
-        ]
-        
-    # 读取历史点分类器标签
-    with open('model/point_history_classifier/point_history_classifier_label.csv',
-              encoding='utf-8-sig') as f:
-        point_history_classifier_labels = csv.reader(f)
-        point_history_classifier_labels = [
-            row[0] for row in point_history_classifier_labels
-        ]
+    hands = None
+    tasks_backend = None
+    if args.hands_backend == 'tasks':
+        # MediaPipe Tasks HandLandmarker (LIVE_STREAM)：异步提交，结果由回调返回
+        tasks_backend = TasksHandsBackend(args.landmarker_model,
+                                          max_num_hands=max_num_hands,
+                                          min_detection_confidence=0.5,
+                                          min_tracking_confidence=0.5,
+                                          max_in_flight=TASKS_MAX_IN_FLIGHT,
+                                          on_drop=lambda context: frame_pool.unpin(context[0]))
+        print("使用 MediaPipe Tasks HandLandmarker 后端")
+    else:
+        mp_hands = mp.solutions.hands
+        hands = mp_hands.Hands(
+            static_image_mode=False,  # 动态模式，适合实时视频流
+            max_num_hands=max_num_hands,  # 最多检测的手数
+            min_detection_confidence=0.5,  # 最小检测置信度
+            min_tracking_confidence=0.5,  # 最小跟踪置信度
+            model_complexity=1  # 使用较高复杂度的模型
+        )
+
+    # 加载关键点分类器和历史点分类器 (模型和标签可在运行时热替换)
+    keypoint_model = HotSwapClassifier(KeyPointClassifier,
+                                       args.keypoint_model,
+                                       'model/keypoint_classifier/keypoint_classifier_label.csv',
+                                       name='keypoint')
+    point_history_model = HotSwapClassifier(PointHistoryClassifier,
+                                            args.point_history_model,
+                                            'model/point_history_classifier/point_history_classifier_label.csv',
+                                            name='point_history')
+    keypoint_version = keypoint_model.version
+    point_history_version = point_history_model.version
+
+    # 热替换触发方式：SIGHUP 信号 / 文件监视 / UDP控制消息
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, lambda signum, frame: (keypoint_model.request_reload(),
+                                                            point_history_model.request_reload()))
+    if args.watch_models:
+        watch_model_files([keypoint_model, point_history_model])
+    if args.reload_port > 0:
+        reload_control_listener(args.reload_port, {'keypoint': keypoint_model,
+                                                   'point_history': point_history_model})
 
     # 性能计时器
     frame_count = 0  # 帧计数器
@@ -304,224 +628,275 @@ def main():
     
     # 添加一个窗口状态标志
     window_visible = True
+
+    # 无手时降频、降分辨率扫描，发现手后恢复全速
+    idle_scanner = IdleScanner(idle_after=args.idle_after,
+                               scan_rate=args.idle_scan_rate,
+                               scan_scale=args.idle_scan_scale,
+                               motion_threshold=args.idle_motion_threshold)
+
+    # 流水线模式：检测线程运行MediaPipe，主线程同时处理上一帧的分类、滤波和发送
+    executor = None
+    if args.pipeline_depth > 0 and hands is not None:
+        executor = PipelinedExecutor(
+            functools.partial(detect_hands, hands, frame_pool, idle_scanner),
+            depth=args.pipeline_depth)
+        print(f"流水线检测已启用，在途帧数: {args.pipeline_depth}")
+    processing_frame = None  # Tasks 后端：主线程正在处理的帧 (处理完后解除锁定)
     
     try:
         while True:
+            # 空闲扫描模式下休眠到下一次扫描时间
+            idle_scanner.wait_next_scan()
+
             # 获取帧
-            ret, image = cap.read()  # 从摄像头读取一帧图像
+            ret, frame = frame_pool.read(camera)  # 从摄像头读取最新一帧图像到复用缓冲
             if not ret:
                 break  # 如果读取失败，退出循环
+            capture_time = time.perf_counter()  # 采集时间，用于UDP插值输出
             frame_count += 1  # 增加帧计数器
             
             # 计算FPS
             current_time = time.time()
             if (current_time - start_time) > 1:  # 每秒更新一次FPS
                 fps = frame_count / (current_time - start_time)
+                if camera is not cap:
+                    age_text = "未知" if camera.last_age is None else f"{camera.last_age * 1000:.1f}ms"
+                    print(f"FPS: {fps:.1f}, 帧龄: {age_text}, 累计丢弃旧帧: {camera.dropped}")
                 frame_count = 0  # 重置帧计数器
                 start_time = current_time  # 更新开始时间
                 
-            image = cv.flip(image, 1)  # 镜像显示图像
-            
-            # 创建调试图像的副本 (仅当窗口可见时)
-            if window_visible:
-                # 使用浅拷贝而不是深拷贝，提高性能
-                debug_image = image.copy()  # 替换copy.deepcopy减少性能开销
-            
+            if tasks_backend is not None:
+                # Tasks 后端：异步提交本帧 (空闲时提交缩小的扫描图像)，取回已完成的最早一帧结果
+                if idle_scanner.idle:
+                    rgb = idle_scanner.scan_image(frame, capture_time)
+                else:
+                    rgb = frame_pool.to_rgb(frame)
+                if rgb is not None:
+                    # 结果返回并处理完之前，该帧的采集槽不能被新的采集覆盖
+                    frame_pool.pin(frame)
+                    if not tasks_backend.submit(rgb, capture_time, (frame, capture_time)):
+                        frame_pool.unpin(frame)
+                completed = tasks_backend.poll()
+                if completed is None:
+                    # 结果尚未返回，继续采集，同时保持响应ESC键
+                    if cv.waitKey(1) == 27:
+                        break
+                    continue
+                if processing_frame is not None:
+                    frame_pool.unpin(processing_frame)
+                (frame, capture_time), results = completed
+                processing_frame = frame
+                # 关键点是归一化坐标，按原帧尺寸换算 (空闲扫描的小图同样适用)
+                image = frame
+            elif executor is not None:
+                # 流水线模式：提交第N帧给检测线程，同时处理第N-1帧的检测结果
+                completed = executor.submit(frame, capture_time)
+                if completed is None:
+                    continue  # 流水线尚未填满
+                (frame, capture_time), (image, results) = completed
+            else:
+                image, results = detect_hands(hands, frame_pool, idle_scanner, frame, capture_time)
 
-            # 转换为RGB格式并处理
-            image = cv.cvtColor(image, cv.COLOR_BGR2RGB)  # 转换为RGB格式
-            image.flags.writeable = False  # 设置为只读以提高性能
-            results = hands.process(image)  # 使用MediaPipe Hands处理图像
-            image.flags.writeable = True  # 恢复为可写
+            # 不再翻转整帧：MediaPipe 在未镜像帧上运行，关键点x坐标和左右手标签按镜像换算，
+            # 只有窗口可见时才翻转生成调试图像 (写入缓冲池中的调试缓冲)
+            if window_visible:
+                debug_image = frame_pool.debug_view(frame)
                 
             # 初始化当前帧的手势检测
             current_hand_gesture = ""
             hand_detected = False
-                
-            # 处理手势识别结果
-            if results.multi_hand_landmarks is not None:
+            hand_packets = []  # 多手模式下每只手的状态
+
+            # 取得本帧使用的模型，热替换只发生在两帧之间
+            # 版本号取自同一个快照，不会出现新模型配旧版本号而漏掉重置
+            (keypoint_classifier, keypoint_classifier_labels,
+             snapshot_keypoint_version) = keypoint_model.snapshot()
+            (point_history_classifier, point_history_classifier_labels,
+             snapshot_point_history_version) = point_history_model.snapshot()
+            if snapshot_keypoint_version != keypoint_version:
+                # 旧模型的缓存分类结果不再有效
+                keypoint_version = snapshot_keypoint_version
+                for track in hand_tracker.tracks():
+                    track.pose_gate.reset()
+            if snapshot_point_history_version != point_history_version:
+                point_history_version = snapshot_point_history_version
+                for track in hand_tracker.tracks():
+                    track.finger_gesture_vote.reset()
+
+            # 收集本帧需要处理的手
+            detections = []
+            if results is not None and results.multi_hand_landmarks is not None:
                 for hand_landmarks, handedness in zip(results.multi_hand_landmarks,
                                                       results.multi_handedness):
-                    # 只处理右手
-                    if handedness.classification[0].label == 'Right':
-                        hand_detected = True
-                        # 计算关键点列表 - 优化版本
-                        landmark_list = calc_landmark_list(image, hand_landmarks)
-                            
-                        # 修改：使用索引为0的点(手腕点)而不是中心点
-                        wrist_point = None
-                        if len(landmark_list) > 0:
-                            wrist_point = landmark_list[0]  # 索引0是手腕点
-                            
-                        # 处理检测到的手腕点
-                        if wrist_point:
-                            # 归一化坐标 (0-1范围内的原始值)
-                            x_ratio = wrist_point[0] / actual_width
-                            y_ratio = wrist_point[1] / actual_height
-                                
-                            # 判断是否在有效操作区域内
-                            in_valid_area = (x_min_range <= x_ratio <= x_max_range and 
-                                            y_min_range <= y_ratio <= y_max_range)
-                                
-                            # 将有效区域(0.2-0.8)重新映射为全屏(0-1)
-                            # 映射公式: newValue = (value - oldMin) / (oldMax - oldMin)
-                            if in_valid_area:
-                                # 重新映射x坐标 (0.2-0.8) -> (0-1)
-                                x_mapped = (x_ratio - x_min_range) / (x_max_range - x_min_range)
-                                # 重新映射y坐标 (0.2-0.8) -> (0-1)
-                                y_mapped = (y_ratio - y_min_range) / (y_max_range - y_min_range)
-                            else:
-                                # 如果在有效区域外，取边界值
-                                x_mapped = max(0, min(1, (x_ratio - x_min_range) / (x_max_range - x_min_range)))
-                                y_mapped = max(0, min(1, (y_ratio - y_min_range) / (y_max_range - y_min_range)))
-                                
-                            # 直接计算目标坐标，确保精确性
-                            raw_target_x = int(x_mapped * screen_width)
-                            raw_target_y = int(y_mapped * screen_height)
-                                
-                            # 应用坐标滤波减少抖动
-                            raw_point = [raw_target_x, raw_target_y]
-                                
-                            # 添加当前原始点到历史记录
-                            positions_history.append(raw_point)
-                            # 保持历史记录在指定长度
-                            if len(positions_history) > history_length:
-                                positions_history.pop(0)
-                                    
-                            # 应用滤波器获得平滑坐标
-                            filtered_point = apply_coordinate_filter(
-                                raw_point, 
-                                positions_history,
-                                smoothing_factor,
-                                history_weight
-                            )
-                                
-                            target_x = filtered_point[0]
-                            target_y = filtered_point[1]
-                                
-                            # 发送归一化的坐标值(0-1范围)给Qt程序
-                            norm_x = target_x / screen_width
-                            norm_y = target_y / screen_height
-                                
-                            # 更新最后有效位置
-                            last_valid_position = (norm_x, norm_y)
-                            last_valid_raw_position = (target_x, target_y)
-                                
-                            # 如果窗口可见，显示原始点和滤波点用于调试
-                            if window_visible and wrist_point:
-                                # 绘制原始点 (红色)
-                                cv.circle(debug_image, (wrist_point[0], wrist_point[1]), 
-                                        12, (0, 0, 255), -1)
-                                    
-                                # 显示文本标注
-                                cv.putText(debug_image, "Control Point", (wrist_point[0]+10, wrist_point[1]),
-                                        cv.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1, cv.LINE_AA)
-                                    
-                                # 显示有效操作区域的边界 (蓝色矩形)
-                                area_left = int(x_min_range * actual_width)
-                                area_right = int(x_max_range * actual_width)
-                                area_top = int(y_min_range * actual_height)
-                                area_bottom = int(y_max_range * actual_height)
-                                    
-                                # 绘制有效操作区域边框
-                                cv.rectangle(debug_image, 
-                                            (area_left, area_top), 
-                                            (area_right, area_bottom), 
-                                            (255, 0, 0), 2)
-                                    
-                                # 添加区域标签
-                                cv.putText(debug_image, "Valid Control Area", 
-                                              (area_left + 10, area_top + 20),
-                                            cv.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 1, cv.LINE_AA)
-                                    
-                                # 显示是否在有效区域内
-                                status_color = (0, 255, 0) if in_valid_area else (0, 0, 255)  # 绿色或红色
-                                status_text = "In Control Area" if in_valid_area else "Outside Control Area"
-                                cv.putText(debug_image, status_text, 
-                                            (wrist_point[0]+10, wrist_point[1]+20),
-                                            cv.FONT_HERSHEY_SIMPLEX, 0.5, status_color, 1, cv.LINE_AA)
-                                            
-                                # 显示滤波后的映射坐标 (绿色)
-                                # 将屏幕坐标映射回摄像头坐标空间进行可视化
-                                cam_x = int((x_mapped * (x_max_range - x_min_range) + x_min_range) * actual_width)
-                                cam_y = int((y_mapped * (y_max_range - y_min_range) + y_min_range) * actual_height)
-                                cv.circle(debug_image, (cam_x, cam_y), 
-                                        8, (0, 255, 0), -1)
-                                    
-                                # 显示文本标注
-                                cv.putText(debug_image, "Mapped Point", (cam_x+10, cam_y),
-                                        cv.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1, cv.LINE_AA)
-                            
-                        # 获取手势分类
-                        pre_processed_landmark_list = pre_process_landmark(landmark_list)
-                        hand_sign_id = keypoint_classifier(pre_processed_landmark_list)
-                        current_hand_gesture = keypoint_classifier_labels[hand_sign_id]
-                        
-                        # 处理历史点 - 类似app.py中的逻辑
-                        if hand_sign_id == 2:  # Point gesture - 假设2是指向手势
-                            point_history.append(landmark_list[8])  # 使用食指指尖
-                        else:
-                            point_history.append([0, 0])  # 非指向手势时添加空点
-                        
-                        # 处理历史点分类
-                        pre_processed_point_history_list = pre_process_point_history(image, point_history)
-                        finger_gesture_id = 0
-                        
-                        # 只有当积累了足够的历史点时才进行分类
-                        if len(pre_processed_point_history_list) == 32:  # 16点 * 2坐标 = 32
-                            finger_gesture_id = point_history_classifier(pre_processed_point_history_list)
-                            
-                        # 添加到手势历史
-                        finger_gesture_history.append(finger_gesture_id)
-                        
-                        # 获取最常见的手势ID
-                        most_common_fg_id = Counter(finger_gesture_history).most_common()
-                        if most_common_fg_id:
-                            finger_gesture_text = point_history_classifier_labels[most_common_fg_id[0][0]]
-                        else:
-                            finger_gesture_text = "None"
-                            
-                        # 更新共享状态中的手指手势
-                        with shared_data['finger_gesture'].get_lock():
-                            gesture_bytes = finger_gesture_text.encode('utf-8')[:19]
-                            shared_data['finger_gesture'].value = gesture_bytes.ljust(20, b' ')
-                            
-                            
-                        # 更新共享状态
-                        if wrist_point:  # 只有当检测到手腕点时才更新坐标
-                            # 更新所有状态值
-                            with shared_data['x'].get_lock():
-                                shared_data['x'].value = norm_x
-                            with shared_data['y'].get_lock():
-                                shared_data['y'].value = norm_y
-                            with shared_data['gesture'].get_lock():
-                                # 截断并填充字符串，确保固定长度
-                                gesture_bytes = current_hand_gesture.encode('utf-8')[:19]
-                                shared_data['gesture'].value = gesture_bytes.ljust(20, b' ')
-                                
-                            # 触发数据发送
-                            with shared_data['trigger_send'].get_lock():
-                                shared_data['trigger_send'].value = True
-                            
-                        # 仅当窗口可见时执行绘制操作
-                        if window_visible:
-                            # 计算边界框
-                            brect = calc_bounding_rect(debug_image, hand_landmarks)
-                                
-                            # 绘制结果
-                            debug_image = draw_landmarks(debug_image, landmark_list)
-                            debug_image = draw_info_text(
-                                debug_image,
-                                brect,
-                                handedness.classification[0].label,
-                                current_hand_gesture,
-                                point_history_classifier_labels[most_common_fg_id[0][0]] if most_common_fg_id else "None"
-                            )
-                            
-                            # 绘制历史点轨迹
-                            debug_image = draw_point_history(debug_image, point_history)
-                
-            # 如果没有检测到手，但上次是"Close"状态或需要保持位置状态
+                    handedness_label = mirror_handedness(handedness.classification[0].label)
+                    # 单手模式只处理右手
+                    if max_num_hands == 1 and handedness_label != 'Right':
+                        continue
+                    # 计算关键点列表
+                    landmark_list = calc_landmark_list(image, hand_landmarks, mirror=True)
+                    detections.append((hand_landmarks, handedness_label, landmark_list))
+
+            # 任意一只手出现都会退出空闲扫描模式
+            idle_scanner.update(results is not None and results.multi_hand_landmarks is not None,
+                                capture_time)
+
+            # 为每只手分配跟踪ID，每只手拥有独立的滤波和历史状态
+            tracks = hand_tracker.update(
+                [(handedness_label, landmark_list[0])
+                 for _, handedness_label, landmark_list in detections])
+
+            # 批量关键点分类 - 姿态未变化的手复用上次结果，其余手只调用一次解释器
+            hand_sign_ids = classify_gated(
+                keypoint_classifier,
+                [track.pose_gate for track in tracks],
+                [pre_process_landmark(landmark_list) for _, _, landmark_list in detections])
+
+            # 处理历史点 - 类似app.py中的逻辑
+            for (_, _, landmark_list), track, hand_sign_id in zip(detections, tracks, hand_sign_ids):
+                if hand_sign_id == 2:  # Point gesture - 假设2是指向手势
+                    track.point_history.append(landmark_list[8])  # 使用食指指尖
+                else:
+                    track.point_history.append([0, 0])  # 非指向手势时添加空点
+
+            # 批量历史点分类 - 只有积累了足够历史点(16点 * 2坐标 = 32)的手才进行分类
+            finger_gesture_ids = [0] * len(tracks)
+            point_history_lists = [pre_process_point_history(image, track.point_history)
+                                   for track in tracks]
+            ready_indexes = [i for i, history_list in enumerate(point_history_lists)
+                             if len(history_list) == 32]
+            ready_ids = point_history_classifier.classify_batch(
+                [point_history_lists[i] for i in ready_indexes])
+            for i, finger_gesture_id in zip(ready_indexes, ready_ids):
+                finger_gesture_ids[i] = finger_gesture_id
+
+            for (hand_landmarks, handedness_label, landmark_list), track, hand_sign_id, finger_gesture_id in zip(
+                    detections, tracks, hand_sign_ids, finger_gesture_ids):
+                # 使用索引为0的点(手腕点)作为控制点
+                wrist_point = landmark_list[0]
+
+                # 归一化坐标 (0-1范围内的原始值)
+                x_ratio = wrist_point[0] / actual_width
+                y_ratio = wrist_point[1] / actual_height
+
+                # 判断是否在有效操作区域内
+                in_valid_area = (x_min_range <= x_ratio <= x_max_range and
+                                 y_min_range <= y_ratio <= y_max_range)
+
+                # 将有效区域重新映射为全屏(0-1)，区域外取边界值
+                # 映射公式: newValue = (value - oldMin) / (oldMax - oldMin)
+                x_mapped = max(0, min(1, (x_ratio - x_min_range) / (x_max_range - x_min_range)))
+                y_mapped = max(0, min(1, (y_ratio - y_min_range) / (y_max_range - y_min_range)))
+
+                # 直接计算目标坐标，确保精确性
+                raw_point = [int(x_mapped * screen_width), int(y_mapped * screen_height)]
+
+                # 添加当前原始点到该手的历史记录，保持历史记录在指定长度
+                track.positions_history.append(raw_point)
+                if len(track.positions_history) > history_length:
+                    track.positions_history.pop(0)
+
+                # 应用滤波器获得平滑坐标
+                target_x, target_y = apply_coordinate_filter(
+                    raw_point,
+                    track.positions_history,
+                    smoothing_factor,
+                    history_weight
+                )
+
+                # 发送归一化的坐标值(0-1范围)给Qt程序
+                norm_x = target_x / screen_width
+                norm_y = target_y / screen_height
+                track.last_valid_position = (norm_x, norm_y)
+
+                # 获取手势分类，投票得到稳定的手指手势
+                track.hand_gesture = keypoint_classifier_labels[hand_sign_id]
+                voted_fg_id = track.finger_gesture_vote.update(finger_gesture_id)
+                track.finger_gesture = point_history_classifier_labels[voted_fg_id]
+
+                # 第一只右手作为主控制手，沿用原有的单手数据字段
+                if not hand_detected and handedness_label == 'Right':
+                    hand_detected = True
+                    current_hand_gesture = track.hand_gesture
+                    last_valid_position = track.last_valid_position
+
+                    with shared_data['x'].get_lock():
+                        shared_data['x'].value = norm_x
+                    with shared_data['y'].get_lock():
+                        shared_data['y'].value = norm_y
+                    shared_data['timestamp'].value = capture_time
+                    with shared_data['gesture'].get_lock():
+                        # 截断并填充字符串，确保固定长度
+                        gesture_bytes = track.hand_gesture.encode('utf-8')[:19]
+                        shared_data['gesture'].value = gesture_bytes.ljust(20, b' ')
+                    with shared_data['finger_gesture'].get_lock():
+                        gesture_bytes = track.finger_gesture.encode('utf-8')[:19]
+                        shared_data['finger_gesture'].value = gesture_bytes.ljust(20, b' ')
+
+                hand_packets.append({
+                    "id": track.track_id,
+                    "handedness": handedness_label.lower(),
+                    "x": round(norm_x, 4),
+                    "y": round(norm_y, 4),
+                    "hand_gesture": track.hand_gesture.strip().lower(),
+                    "finger_gesture": track.finger_gesture.strip().lower()
+                })
+
+                # 仅当窗口可见时执行绘制操作
+                if window_visible:
+                    # 绘制原始点 (红色)
+                    cv.circle(debug_image, (wrist_point[0], wrist_point[1]),
+                              12, (0, 0, 255), -1)
+                    cv.putText(debug_image, "Control Point", (wrist_point[0]+10, wrist_point[1]),
+                               cv.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1, cv.LINE_AA)
+
+                    # 显示有效操作区域的边界 (蓝色矩形)
+                    area_left = int(x_min_range * actual_width)
+                    area_right = int(x_max_range * actual_width)
+                    area_top = int(y_min_range * actual_height)
+                    area_bottom = int(y_max_range * actual_height)
+                    cv.rectangle(debug_image,
+                                 (area_left, area_top),
+                                 (area_right, area_bottom),
+                                 (255, 0, 0), 2)
+                    cv.putText(debug_image, "Valid Control Area",
+                               (area_left + 10, area_top + 20),
+                               cv.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 1, cv.LINE_AA)
+
+                    # 显示是否在有效区域内
+                    status_color = (0, 255, 0) if in_valid_area else (0, 0, 255)  # 绿色或红色
+                    status_text = "In Control Area" if in_valid_area else "Outside Control Area"
+                    cv.putText(debug_image, status_text,
+                               (wrist_point[0]+10, wrist_point[1]+20),
+                               cv.FONT_HERSHEY_SIMPLEX, 0.5, status_color, 1, cv.LINE_AA)
+
+                    # 显示映射坐标 (绿色)，将屏幕坐标映射回摄像头坐标空间进行可视化
+                    cam_x = int((x_mapped * (x_max_range - x_min_range) + x_min_range) * actual_width)
+                    cam_y = int((y_mapped * (y_max_range - y_min_range) + y_min_range) * actual_height)
+                    cv.circle(debug_image, (cam_x, cam_y),
+                              8, (0, 255, 0), -1)
+                    cv.putText(debug_image, "Mapped Point", (cam_x+10, cam_y),
+                               cv.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1, cv.LINE_AA)
+
+                    # 绘制结果
+                    brect = calc_bounding_rect(debug_image, hand_landmarks, mirror=True)
+                    debug_image = draw_landmarks(debug_image, landmark_list)
+                    debug_image = draw_info_text(
+                        debug_image,
+                        brect,
+                        f"{handedness_label} #{track.track_id}" if max_num_hands > 1 else handedness_label,
+                        track.hand_gesture,
+                        track.finger_gesture
+                    )
+
+                    # 绘制历史点轨迹
+                    debug_image = draw_point_history(debug_image, track.point_history)
+
+            # 多手模式：所有手的状态放入同一个数据包
+            if max_num_hands > 1:
+                write_shared_hands(shared_data, hand_packets)
+
+            # 如果没有检测到主控制手，保持最后有效位置
             if not hand_detected:
                     
                 # 使用最后有效位置
@@ -562,27 +937,28 @@ def main():
                     cv.putText(debug_image, "Last Position", (last_pos_cam_x+10, last_pos_cam_y),
                                 cv.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1, cv.LINE_AA)
                 
-                # 添加空点到历史
-                point_history.append([0, 0])
-                
                 # 重置手指手势
                 with shared_data['finger_gesture'].get_lock():
                     none_bytes = b'None'
                     shared_data['finger_gesture'].value = none_bytes.ljust(20, b' ')
                 
-                # 触发数据发送 - 即使没有手也发送当前状态
-                with shared_data['trigger_send'].get_lock():
-                    shared_data['trigger_send'].value = True
-                
+            # 触发数据发送 - 即使没有手也发送当前状态
+            with shared_data['trigger_send'].get_lock():
+                shared_data['trigger_send'].value = True
+
             # 更新上一次的手势状态
             last_hand_gesture = current_hand_gesture
 
             # 只有在窗口可见时才显示图像和信息
             if window_visible:
-                # 显示FPS和控制提示
-                cv.putText(debug_image, f"FPS: {fps:.1f}", (10, 30), 
+                # 显示FPS、帧龄和控制提示
+                fps_text = f"FPS: {fps:.1f}"
+                if camera is not cap:
+                    age_text = "n/a" if camera.last_age is None else f"{camera.last_age * 1000:.0f}ms"
+                    fps_text += f"  Frame age: {age_text}  Dropped: {camera.dropped}"
+                cv.putText(debug_image, fps_text, (10, 30), 
                           cv.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 4, cv.LINE_AA)
-                cv.putText(debug_image, f"FPS: {fps:.1f}", (10, 30), 
+                cv.putText(debug_image, fps_text, (10, 30), 
                            cv.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2, cv.LINE_AA)
                 cv.putText(debug_image, "Hand Gesture UDP Control (Multi-Process)", (10, 60), 
                            cv.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 4, cv.LINE_AA)
@@ -622,6 +998,7 @@ def main():
                 except:
                     # 如果显示失败，可能窗口已关闭或最小化
                     window_visible = False
+                    frame_pool.release_debug()
             else:
                 # 尝试创建一个窗口 (如果窗口被关闭)
                 try:
@@ -649,17 +1026,51 @@ def main():
             udp_process.terminate()
         
         # 关闭资源
+        if executor is not None:
+            executor.close()
+        if tasks_backend is not None:
+            tasks_backend.close()
         cap.release()
         cv.destroyAllWindows()
         print("程序已正常退出")
 
 
-def calc_bounding_rect(image, landmarks):
+def detect_hands(hands, frame_pool, idle_scanner, frame, capture_time):
+    """
+    检测阶段：空闲扫描 + 全分辨率MediaPipe推理
+
+    参数:
+        hands: MediaPipe Hands
+        frame_pool: 帧缓冲池
+        idle_scanner: 空闲扫描状态
+        frame: 采集到的BGR帧
+        capture_time: 采集时间
+    返回:
+        (image, results)，未运行全分辨率检测时 image 为原帧、results 为 None
+    """
+    # 空闲状态下先在小图上扫描，发现手后再对本帧做全分辨率检测
+    if idle_scanner.idle:
+        scan_image = idle_scanner.scan_image(frame, capture_time)
+        if scan_image is None or hands.process(scan_image).multi_hand_landmarks is None:
+            return frame, None
+
+    # 转换为RGB格式并处理
+    image = frame_pool.to_rgb(frame)  # 转换为RGB格式 (写入复用缓冲)
+    image.flags.writeable = False  # 设置为只读以提高性能
+    results = hands.process(image)  # 使用MediaPipe Hands处理图像
+    image.flags.writeable = True  # 恢复为可写
+    return image, results
+
+
+def calc_bounding_rect(image, landmarks, mirror=False):
     image_width, image_height = image.shape[1], image.shape[0]
     landmark_array = np.empty((0, 2), int)
 
     for _, landmark in enumerate(landmarks.landmark):
-        landmark_x = min(int(landmark.x * image_width), image_width - 1)
+        if mirror:
+            landmark_x = mirror_x(landmark.x, image_width)
+        else:
+            landmark_x = min(int(landmark.x * image_width), image_width - 1)
         landmark_y = min(int(landmark.y * image_height), image_height - 1)
         landmark_point = [np.array((landmark_x, landmark_y))]
         landmark_array = np.append(landmark_array, landmark_point, axis=0)
@@ -668,12 +1079,16 @@ def calc_bounding_rect(image, landmarks):
     return [x, y, x + w, y + h]
 
 
-def calc_landmark_list(image, landmarks):
+def calc_landmark_list(image, landmarks, mirror=False):
     image_width, image_height = image.shape[1], image.shape[0]
     landmark_point = []
 
     for _, landmark in enumerate(landmarks.landmark):
-        landmark_x = min(int(landmark.x * image_width), image_width - 1)
+        # mirror=True: 在未镜像帧上运行MediaPipe，坐标按镜像图像换算
+        if mirror:
+            landmark_x = mirror_x(landmark.x, image_width)
+        else:
+            landmark_x = min(int(landmark.x * image_width), image_width - 1)
         landmark_y = min(int(landmark.y * image_height), image_height - 1)
         landmark_point.append([landmark_x, landmark_y])
 
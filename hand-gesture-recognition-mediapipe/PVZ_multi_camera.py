@@ -0,0 +1,308 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import argparse
+import cv2 as cv
+import mediapipe as mp
+import time
+import screeninfo  # 用于更可靠地获取屏幕分辨率
+import multiprocessing as multi_proc  # 导入多进程库
+import ctypes  # 用于创建共享内存类型
+import csv
+from collections import deque
+from model import KeyPointClassifier
+from model import PointHistoryClassifier
+from utils import GestureVote
+from utils import mirror_handedness
+from utils import FramePool
+from utils import negotiate_capture
+from PVZ_gesture_control import (
+    create_shared_data,
+    udp_sender_process,
+    apply_coordinate_filter,
+    calc_landmark_list,
+    pre_process_landmark,
+    pre_process_point_history,
+)
+
+# 每个摄像头共享记录的字段布局 (c_double 数组)
+SLOT_TIMESTAMP = 0   # 采集时间戳 (time.time())
+SLOT_VALID = 1       # 是否检测到手 (1.0 / 0.0)
+SLOT_X = 2           # 有效区域映射后的归一化X (0-1)
+SLOT_Y = 3           # 有效区域映射后的归一化Y (0-1)
+SLOT_SCORE = 4       # 左右手分类置信度
+SLOT_HAND_SIGN = 5   # 关键点分类ID
+SLOT_FINGER = 6      # 手指手势投票ID
+SLOT_SIZE = 7
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+
+    # 摄像头编号或视频文件路径，每个来源一个工作进程
+    parser.add_argument("--sources", nargs='+', default=['0'])
+    parser.add_argument("--width", help='cap width', type=int, default=960)
+    parser.add_argument("--height", help='cap height', type=int, default=540)
+
+    parser.add_argument("--min_detection_confidence",
+                        help='min_detection_confidence',
+                        type=float,
+                        default=0.5)
+    parser.add_argument("--min_tracking_confidence",
+                        help='min_tracking_confidence',
+                        type=float,
+                        default=0.5)
+
+    # 融合策略: confidence=选择置信度最高的摄像头, priority=按来源顺序选择第一个看到手的摄像头
+    parser.add_argument("--fusion",
+                        choices=['confidence', 'priority'],
+                        default='confidence')
+    parser.add_argument("--max_age",
+                        help='max age (s) of a camera observation used for fusion',
+                        type=float,
+                        default=0.1)
+
+    parser.add_argument("--vote_min_ratio", type=float, default=0.5)
+    parser.add_argument("--vote_min_dwell", type=int, default=3)
+
+    parser.add_argument("--camera_cache", type=str, default='capture_profiles.json')
+    parser.add_argument("--reprobe_camera", action='store_true')
+
+    args = parser.parse_args()
+
+    return args
+
+
+def camera_worker_process(source, slot, exit_flag, args):
+    """
+    单个摄像头的采集和推理进程，结果写入共享记录
+
+    参数:
+        source: 摄像头编号或视频文件路径
+        slot: 该摄像头的共享记录 (multi_proc.Array(c_double, SLOT_SIZE))
+        exit_flag: 退出标志
+        args: 命令行参数
+    """
+    if source.isdigit():
+        # 本地摄像头：协商最低延迟采集模式，配置按设备缓存
+        cap, _ = negotiate_capture(int(source), args.width, args.height, 60,
+                                   cache_path=args.camera_cache,
+                                   reprobe=args.reprobe_camera)
+    else:
+        cap = cv.VideoCapture(source)
+        cap.set(cv.CAP_PROP_FRAME_WIDTH, args.width)
+        cap.set(cv.CAP_PROP_FRAME_HEIGHT, args.height)
+        cap.set(cv.CAP_PROP_FPS, 60)
+    frame_pool = FramePool(int(cap.get(cv.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv.CAP_PROP_FRAME_HEIGHT)))
+
+    hands = mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=1,
+        min_detection_confidence=args.min_detection_confidence,
+        min_tracking_confidence=args.min_tracking_confidence,
+        model_complexity=1
+    )
+    keypoint_classifier = KeyPointClassifier()
+    point_history_classifier = PointHistoryClassifier()
+
+    # 有效操作区域，与PVZ_gesture_control保持一致
+    x_min_range, x_max_range = 0.2, 0.8
+    y_min_range, y_max_range = 0.3, 0.7
+
+    point_history = deque(maxlen=16)
+    finger_gesture_vote = GestureVote(window_len=16,
+                                      min_ratio=args.vote_min_ratio,
+                                      min_dwell=args.vote_min_dwell)
+
+    print(f"摄像头工作进程已启动: {source}")
+
+    try:
+        while not exit_flag.value:
+            ret, image = frame_pool.read(cap)
+            if not ret:
+                break
+            timestamp = time.time()
+
+            # 不翻转整帧，关键点坐标和左右手标签按镜像换算
+            image = frame_pool.to_rgb(image)
+            image.flags.writeable = False
+            results = hands.process(image)
+            # 缓冲区下一帧还要作为 cvtColor 的输出，必须恢复可写
+            image.flags.writeable = True
+
+            record = [timestamp, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+            hand_detected = False
+            if results.multi_hand_landmarks is not None:
+                for hand_landmarks, handedness in zip(results.multi_hand_landmarks,
+                                                      results.multi_handedness):
+                    if mirror_handedness(handedness.classification[0].label) != 'Right':
+                        continue
+                    hand_detected = True
+                    landmark_list = calc_landmark_list(image, hand_landmarks, mirror=True)
+
+                    # 手腕点映射到有效区域
+                    x_ratio = landmark_list[0][0] / image.shape[1]
+                    y_ratio = landmark_list[0][1] / image.shape[0]
+                    x_mapped = max(0, min(1, (x_ratio - x_min_range) / (x_max_range - x_min_range)))
+                    y_mapped = max(0, min(1, (y_ratio - y_min_range) / (y_max_range - y_min_range)))
+
+                    hand_sign_id = keypoint_classifier(pre_process_landmark(landmark_list))
+                    if hand_sign_id == 2:
+                        point_history.append(landmark_list[8])
+                    else:
+                        point_history.append([0, 0])
+
+                    finger_gesture_id = 0
+                    pre_processed_point_history_list = pre_process_point_history(image, point_history)
+                    if len(pre_processed_point_history_list) == 32:
+                        finger_gesture_id = point_history_classifier(pre_processed_point_history_list)
+
+                    record = [timestamp, 1.0, x_mapped, y_mapped,
+                              handedness.classification[0].score,
+                              float(hand_sign_id),
+                              float(finger_gesture_vote.update(finger_gesture_id))]
+                    break
+
+            if not hand_detected:
+                point_history.append([0, 0])
+
+            # 整条记录在同一把锁内写入，聚合进程不会读到半条记录
+            with slot.get_lock():
+                slot[:] = record
+
+    except KeyboardInterrupt:
+        pass
+    finally:
+        cap.release()
+        print(f"摄像头工作进程已退出: {source}")
+
+
+def aggregator_process(slots, shared_data, exit_flag, args):
+    """
+    聚合进程：从所有摄像头的共享记录中选出最佳观测，写入UDP发送进程的共享状态
+
+    参数:
+        slots: 每个摄像头的共享记录列表
+        shared_data: UDP发送进程使用的共享状态
+        exit_flag: 退出标志
+        args: 命令行参数
+    """
+    with open('model/keypoint_classifier/keypoint_classifier_label.csv',
+              encoding='utf-8-sig') as f:
+        keypoint_classifier_labels = [row[0] for row in csv.reader(f)]
+    with open('model/point_history_classifier/point_history_classifier_label.csv',
+              encoding='utf-8-sig') as f:
+        point_history_classifier_labels = [row[0] for row in csv.reader(f)]
+
+    try:
+        monitors = screeninfo.get_monitors()
+        screen_width = monitors[0].width
+        screen_height = monitors[0].height
+    except:
+        screen_width, screen_height = 1920, 1080
+
+    positions_history = []
+    history_length = 5
+    smoothing_factor = 0.6
+    history_weight = 0.7
+
+    last_timestamps = [0.0] * len(slots)
+
+    try:
+        while not exit_flag.value:
+            now = time.time()
+            records = []
+            updated = False
+            for index, slot in enumerate(slots):
+                with slot.get_lock():
+                    record = slot[:]
+                if record[SLOT_TIMESTAMP] > last_timestamps[index]:
+                    last_timestamps[index] = record[SLOT_TIMESTAMP]
+                    updated = True
+                records.append(record)
+
+            # 没有任何摄像头产生新帧时不重复发送
+            if not updated:
+                time.sleep(0.001)
+                continue
+
+            candidates = [record for record in records
+                          if record[SLOT_VALID] and now - record[SLOT_TIMESTAMP] <= args.max_age]
+            best = None
+            if candidates:
+                if args.fusion == 'confidence':
+                    best = max(candidates, key=lambda record: record[SLOT_SCORE])
+                else:
+                    best = candidates[0]
+
+            if best is not None:
+                raw_point = [int(best[SLOT_X] * screen_width), int(best[SLOT_Y] * screen_height)]
+                positions_history.append(raw_point)
+                if len(positions_history) > history_length:
+                    positions_history.pop(0)
+                target_x, target_y = apply_coordinate_filter(
+                    raw_point, positions_history, smoothing_factor, history_weight)
+
+                hand_gesture = keypoint_classifier_labels[int(best[SLOT_HAND_SIGN])]
+                finger_gesture = point_history_classifier_labels[int(best[SLOT_FINGER])]
+
+                with shared_data['x'].get_lock():
+                    shared_data['x'].value = target_x / screen_width
+                with shared_data['y'].get_lock():
+                    shared_data['y'].value = target_y / screen_height
+                shared_data['timestamp'].value = time.perf_counter()
+            else:
+                hand_gesture = 'Idle'
+                finger_gesture = 'None'
+
+            with shared_data['gesture'].get_lock():
+                shared_data['gesture'].value = hand_gesture.encode('utf-8')[:19].ljust(20, b' ')
+            with shared_data['finger_gesture'].get_lock():
+                shared_data['finger_gesture'].value = finger_gesture.encode('utf-8')[:19].ljust(20, b' ')
+            with shared_data['trigger_send'].get_lock():
+                shared_data['trigger_send'].value = True
+
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("聚合进程已退出")
+
+
+def main():
+    args = get_args()
+
+    shared_data = create_shared_data()
+    exit_flag = multi_proc.Value(ctypes.c_bool, False)
+
+    # 每个摄像头一条共享记录
+    slots = [multi_proc.Array(ctypes.c_double, SLOT_SIZE) for _ in args.sources]
+
+    processes = [multi_proc.Process(target=udp_sender_process, args=(shared_data, exit_flag))]
+    processes.append(multi_proc.Process(target=aggregator_process,
+                                        args=(slots, shared_data, exit_flag, args)))
+    for source, slot in zip(args.sources, slots):
+        processes.append(multi_proc.Process(target=camera_worker_process,
+                                            args=(source, slot, exit_flag, args)))
+
+    for process in processes:
+        process.daemon = True
+        process.start()
+    print(f"多摄像头模式已启动: {len(args.sources)} 个来源, 融合策略: {args.fusion}")
+
+    try:
+        # 所有摄像头进程结束(例如视频文件读完)时退出
+        while any(process.is_alive() for process in processes[2:]):
+            time.sleep(0.1)
+    except KeyboardInterrupt:
+        print("接收到键盘中断，程序即将退出")
+    finally:
+        exit_flag.value = True
+        for process in processes:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+        print("程序已正常退出")
+
+
+if __name__ == '__main__':
+    multi_proc.freeze_support()
+    main()
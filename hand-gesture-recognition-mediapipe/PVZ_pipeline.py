@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import argparse
+import cv2 as cv
+import numpy as np
+import mediapipe as mp
+import time
+import screeninfo  # 用于更可靠地获取屏幕分辨率
+import multiprocessing as multi_proc  # 导入多进程库
+import ctypes  # 用于创建共享内存类型
+import csv
+from collections import deque
+from model import KeyPointClassifier
+from model import PointHistoryClassifier
+from utils import GestureVote
+from utils import SharedArrayRing
+from utils import LatestArrayRing
+from utils import mirror_x
+from utils import mirror_handedness
+from PVZ_gesture_control import (
+    create_shared_data,
+    udp_sender_process,
+    apply_coordinate_filter,
+    pre_process_landmark,
+    pre_process_point_history,
+)
+
+# 关键点记录布局: [是否检测到右手, 置信度, 21个关键点的像素坐标(x, y)]
+RECORD_VALID = 0
+RECORD_SCORE = 1
+RECORD_LANDMARKS = 2
+RECORD_SIZE = RECORD_LANDMARKS + 21 * 2
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("--device", type=int, default=0)
+    parser.add_argument("--width", help='cap width', type=int, default=960)
+    parser.add_argument("--height", help='cap height', type=int, default=540)
+
+    parser.add_argument("--min_detection_confidence",
+                        help='min_detection_confidence',
+                        type=float,
+                        default=0.5)
+    parser.add_argument("--min_tracking_confidence",
+                        help='min_tracking_confidence',
+                        type=float,
+                        default=0.5)
+
+    # 图像环形缓冲区槽数量 (最新帧优先，至少3个)
+    parser.add_argument("--frame_slots", type=int, default=4)
+
+    parser.add_argument("--vote_min_ratio", type=float, default=0.5)
+    parser.add_argument("--vote_min_dwell", type=int, default=3)
+
+    args = parser.parse_args()
+
+    return args
+
+
+def capture_stage_process(device, width, height, frame_ring, exit_flag):
+    """
+    采集阶段：读取摄像头，转换为RGB后直接写入共享图像槽 (镜像在推理阶段按关键点坐标换算)
+
+    参数:
+        device: 摄像头编号
+        width, height: 图像槽尺寸
+        frame_ring: 图像环形缓冲区 (LatestArrayRing)
+        exit_flag: 退出标志
+    """
+    cap = cv.VideoCapture(device)
+    cap.set(cv.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv.CAP_PROP_FRAME_HEIGHT, height)
+    cap.set(cv.CAP_PROP_FPS, 60)
+
+    # 预分配采集缓冲，cap.read 每帧复用
+    buffer = np.empty((height, width, 3), dtype=np.uint8)
+    seq = 0
+    try:
+        while not exit_flag.value:
+            ret, image = cap.read(buffer)
+            if not ret:
+                break
+            if image is not buffer:
+                buffer = image  # 驱动返回的尺寸不同，改用新数组作为缓冲
+            timestamp = time.time()
+            seq += 1
+
+            # 推理阶段跟不上时覆盖最早的未读帧，推理总是处理最新一帧，不阻塞摄像头读取
+            acquired = frame_ring.acquire_write(timeout=0)
+            if acquired is None:
+                continue
+            index, slot = acquired
+
+            if image.shape[:2] != slot.shape[:2]:
+                image = cv.resize(image, (slot.shape[1], slot.shape[0]))
+            cv.cvtColor(image, cv.COLOR_BGR2RGB, dst=slot)
+            frame_ring.commit_write(index, seq, timestamp)
+
+    except KeyboardInterrupt:
+        pass
+    finally:
+        cap.release()
+        # 被覆盖或被推理阶段跳过的旧帧
+        dropped = frame_ring.skipped
+        print(f"采集进程已退出，丢弃帧数: {dropped}")
+
+
+def inference_stage_process(frame_ring, landmark_ring, exit_flag, args):
+    """
+    推理阶段：直接在共享图像槽上运行MediaPipe，把关键点写入共享记录
+
+    参数:
+        frame_ring: 图像环形缓冲区
+        landmark_ring: 关键点记录环形缓冲区
+        exit_flag: 退出标志
+        args: 命令行参数
+    """
+    hands = mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=1,
+        min_detection_confidence=args.min_detection_confidence,
+        min_tracking_confidence=args.min_tracking_confidence,
+        model_complexity=1
+    )
+
+    try:
+        while not exit_flag.value:
+            acquired = frame_ring.acquire_read(timeout=0.1)
+            if acquired is None:
+                continue
+            index, image, seq, timestamp = acquired
+            image_height, image_width = image.shape[0], image.shape[1]
+
+            results = hands.process(image)
+            frame_ring.release_read(index)
+
+            acquired = landmark_ring.acquire_write(timeout=0.1)
+            if acquired is None:
+                continue
+            record_index, record = acquired
+
+            record[RECORD_VALID] = 0.0
+            if results.multi_hand_landmarks is not None:
+                for hand_landmarks, handedness in zip(results.multi_hand_landmarks,
+                                                      results.multi_handedness):
+                    if mirror_handedness(handedness.classification[0].label) != 'Right':
+                        continue
+                    record[RECORD_VALID] = 1.0
+                    record[RECORD_SCORE] = handedness.classification[0].score
+                    for i, landmark in enumerate(hand_landmarks.landmark):
+                        record[RECORD_LANDMARKS + i * 2] = mirror_x(landmark.x, image_width)
+                        record[RECORD_LANDMARKS + i * 2 + 1] = min(int(landmark.y * image_height), image_height - 1)
+                    break
+
+            landmark_ring.commit_write(record_index, seq, timestamp)
+
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("推理进程已退出")
+
+
+def main():
+    args = get_args()
+
+    shared_data = create_shared_data()
+    exit_flag = multi_proc.Value(ctypes.c_bool, False)
+
+    # 图像和关键点都通过预分配的共享内存槽传递
+    # 图像槽最新帧优先，推理落后时跳过旧帧而不是排队
+    frame_ring = LatestArrayRing((args.height, args.width, 3), np.uint8, args.frame_slots)
+    landmark_ring = SharedArrayRing((RECORD_SIZE,), np.float64, 8)
+
+    processes = [
+        multi_proc.Process(target=udp_sender_process, args=(shared_data, exit_flag)),
+        multi_proc.Process(target=capture_stage_process,
+                           args=(args.device, args.width, args.height, frame_ring, exit_flag)),
+        multi_proc.Process(target=inference_stage_process,
+                           args=(frame_ring, landmark_ring, exit_flag, args)),
+    ]
+    for process in processes:
+        process.daemon = True
+        process.start()
+    print("流水线已启动: 采集 -> 推理 -> 分类/滤波 -> UDP")
+
+    # 分类/滤波阶段在主进程中运行 ##################################################
+    keypoint_classifier = KeyPointClassifier()
+    point_history_classifier = PointHistoryClassifier()
+    with open('model/keypoint_classifier/keypoint_classifier_label.csv',
+              encoding='utf-8-sig') as f:
+        keypoint_classifier_labels = [row[0] for row in csv.reader(f)]
+    with open('model/point_history_classifier/point_history_classifier_label.csv',
+              encoding='utf-8-sig') as f:
+        point_history_classifier_labels = [row[0] for row in csv.reader(f)]
+
+    try:
+        monitors = screeninfo.get_monitors()
+        screen_width = monitors[0].width
+        screen_height = monitors[0].height
+    except:
+        screen_width, screen_height = 1920, 1080
+
+    # 有效操作区域，与PVZ_gesture_control保持一致
+    x_min_range, x_max_range = 0.2, 0.8
+    y_min_range, y_max_range = 0.3, 0.7
+
+    positions_history = []
+    history_length = 5
+    smoothing_factor = 0.6
+    history_weight = 0.7
+    point_history = deque(maxlen=16)
+    finger_gesture_vote = GestureVote(window_len=16,
+                                      min_ratio=args.vote_min_ratio,
+                                      min_dwell=args.vote_min_dwell)
+    # pre_process_point_history只需要图像尺寸
+    image_shape = np.empty((args.height, args.width, 0), dtype=np.uint8)
+
+    frame_count = 0
+    latency_sum = 0.0
+    start_time = time.time()
+
+    try:
+        while processes[1].is_alive():
+            acquired = landmark_ring.acquire_read(timeout=0.1)
+            if acquired is None:
+                continue
+            index, record, seq, timestamp = acquired
+            valid = record[RECORD_VALID] > 0
+            landmark_list = record[RECORD_LANDMARKS:].reshape(21, 2).astype(int).tolist()
+            landmark_ring.release_read(index)
+
+            if valid:
+                x_ratio = landmark_list[0][0] / args.width
+                y_ratio = landmark_list[0][1] / args.height
+                x_mapped = max(0, min(1, (x_ratio - x_min_range) / (x_max_range - x_min_range)))
+                y_mapped = max(0, min(1, (y_ratio - y_min_range) / (y_max_range - y_min_range)))
+
+                raw_point = [int(x_mapped * screen_width), int(y_mapped * screen_height)]
+                positions_history.append(raw_point)
+                if len(positions_history) > history_length:
+                    positions_history.pop(0)
+                target_x, target_y = apply_coordinate_filter(
+                    raw_point, positions_history, smoothing_factor, history_weight)
+
+                hand_sign_id = keypoint_classifier(pre_process_landmark(landmark_list))
+                if hand_sign_id == 2:
+                    point_history.append(landmark_list[8])
+                else:
+                    point_history.append([0, 0])
+
+                finger_gesture_id = 0
+                pre_processed_point_history_list = pre_process_point_history(image_shape, point_history)
+                if len(pre_processed_point_history_list) == 32:
+                    finger_gesture_id = point_history_classifier(pre_processed_point_history_list)
+
+                hand_gesture = keypoint_classifier_labels[hand_sign_id]
+                finger_gesture = point_history_classifier_labels[
+                    finger_gesture_vote.update(finger_gesture_id)]
+
+                with shared_data['x'].get_lock():
+                    shared_data['x'].value = target_x / screen_width
+                with shared_data['y'].get_lock():
+                    shared_data['y'].value = target_y / screen_height
+                shared_data['timestamp'].value = time.perf_counter()
+            else:
+                point_history.append([0, 0])
+                hand_gesture = 'Idle'
+                finger_gesture = 'None'
+
+            with shared_data['gesture'].get_lock():
+                shared_data['gesture'].value = hand_gesture.encode('utf-8')[:19].ljust(20, b' ')
+            with shared_data['finger_gesture'].get_lock():
+                shared_data['finger_gesture'].value = finger_gesture.encode('utf-8')[:19].ljust(20, b' ')
+            with shared_data['trigger_send'].get_lock():
+                shared_data['trigger_send'].value = True
+
+            # 每秒输出吞吐量和端到端延迟
+            frame_count += 1
+            latency_sum += time.time() - timestamp
+            current_time = time.time()
+            if current_time - start_time > 1:
+                print(f"FPS: {frame_count / (current_time - start_time):.1f}, "
+                      f"平均延迟: {latency_sum / frame_count * 1000:.1f}ms")
+                frame_count = 0
+                latency_sum = 0.0
+                start_time = current_time
+
+    except KeyboardInterrupt:
+        print("接收到键盘中断，程序即将退出")
+    finally:
+        exit_flag.value = True
+        for process in processes:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+        frame_ring.close()
+        frame_ring.unlink()
+        landmark_ring.close()
+        landmark_ring.unlink()
+        print("程序已正常退出")
+
+
+if __name__ == '__main__':
+    multi_proc.freeze_support()
+    main()
@@ -4,7 +4,6 @@ import csv
 import copy
 import argparse
 import itertools
-from collections import Counter
 from collections import deque
 
 import cv2 as cv
@@ -12,6 +11,9 @@ import numpy as np
 import mediapipe as mp
 
 from utils import CvFpsCalc
+from utils import GestureVote
+from utils import mirror_x
+from utils import mirror_handedness
 from model import KeyPointClassifier
 from model import PointHistoryClassifier
 
@@ -33,6 +35,15 @@ def get_args():
                         type=int,
                         default=0.5)
 
+    parser.add_argument("--vote_min_ratio",
+                        help='finger gesture vote min majority ratio',
+                        type=float,
+                        default=0.5)
+    parser.add_argument("--vote_min_dwell",
+                        help='finger gesture vote min dwell frames',
+                        type=int,
+                        default=3)
+
     args = parser.parse_args()
 
     return args
@@ -93,7 +104,9 @@ def main():
     point_history = deque(maxlen=history_length)
 
     # Finger gesture history ################################################
-    finger_gesture_history = deque(maxlen=history_length)
+    finger_gesture_vote = GestureVote(window_len=history_length,
+                                      min_ratio=args.vote_min_ratio,
+                                      min_dwell=args.vote_min_dwell)
 
     #  ########################################################################
     mode = 0
@@ -111,8 +124,9 @@ def main():
         ret, image = cap.read()
         if not ret:
             break
-        image = cv.flip(image, 1)  # Mirror display
-        debug_image = copy.deepcopy(image)
+        # Mirror display: only the debug image is flipped, landmarks are
+        # mirrored arithmetically so MediaPipe runs on the unflipped frame
+        debug_image = cv.flip(image, 1)
 
         # Detection implementation #############################################################
         image = cv.cvtColor(image, cv.COLOR_BGR2RGB)
@@ -126,9 +140,9 @@ def main():
             for hand_landmarks, handedness in zip(results.multi_hand_landmarks,
                                                   results.multi_handedness):
                 # Bounding box calculation
-                brect = calc_bounding_rect(debug_image, hand_landmarks)
+                brect = calc_bounding_rect(debug_image, hand_landmarks, mirror=True)
                 # Landmark calculation
-                landmark_list = calc_landmark_list(debug_image, hand_landmarks)
+                landmark_list = calc_landmark_list(debug_image, hand_landmarks, mirror=True)
 
                 # Conversion to relative coordinates / normalized coordinates
                 pre_processed_landmark_list = pre_process_landmark(
@@ -154,9 +168,7 @@ def main():
                         pre_processed_point_history_list)
 
                 # Calculates the gesture IDs in the latest detection
-                finger_gesture_history.append(finger_gesture_id)
-                most_common_fg_id = Counter(
-                    finger_gesture_history).most_common()
+                voted_fg_id = finger_gesture_vote.update(finger_gesture_id)
 
                 # Drawing part
                 debug_image = draw_bounding_rect(use_brect, debug_image, brect)
@@ -164,11 +176,11 @@ def main():
                 debug_image = draw_info_text(
                     debug_image,
                     brect,
-                    handedness,
+                    mirror_handedness(handedness.classification[0].label),
                     keypoint_classifier_labels[hand_sign_id],
-                    point_history_classifier_labels[most_common_fg_id[0][0]],
+                    point_history_classifier_labels[voted_fg_id],
                 )
-                print(point_history_classifier_labels[most_common_fg_id[0][0]])
+                print(point_history_classifier_labels[voted_fg_id])
         else:
             point_history.append([0, 0])
 
@@ -195,13 +207,16 @@ def select_mode(key, mode):
     return number, mode
 
 
-def calc_bounding_rect(image, landmarks):
+def calc_bounding_rect(image, landmarks, mirror=False):
     image_width, image_height = image.shape[1], image.shape[0]
 
     landmark_array = np.empty((0, 2), int)
 
     for _, landmark in enumerate(landmarks.landmark):
-        landmark_x = min(int(landmark.x * image_width), image_width - 1)
+        if mirror:
+            landmark_x = mirror_x(landmark.x, image_width)
+        else:
+            landmark_x = min(int(landmark.x * image_width), image_width - 1)
         landmark_y = min(int(landmark.y * image_height), image_height - 1)
 
         landmark_point = [np.array((landmark_x, landmark_y))]
@@ -213,14 +228,18 @@ def calc_bounding_rect(image, landmarks):
     return [x, y, x + w, y + h]
 
 
-def calc_landmark_list(image, landmarks):
+def calc_landmark_list(image, landmarks, mirror=False):
     image_width, image_height = image.shape[1], image.shape[0]
 
     landmark_point = []
 
     # Keypoint
     for _, landmark in enumerate(landmarks.landmark):
-        landmark_x = min(int(landmark.x * image_width), image_width - 1)
+        # mirror=True: landmarks come from the unflipped frame
+        if mirror:
+            landmark_x = mirror_x(landmark.x, image_width)
+        else:
+            landmark_x = min(int(landmark.x * image_width), image_width - 1)
         landmark_y = min(int(landmark.y * image_height), image_height - 1)
         # landmark_z = landmark.z
 
@@ -497,7 +516,7 @@ def draw_info_text(image, brect, handedness, hand_sign_text,
     cv.rectangle(image, (brect[0], brect[1]), (brect[2], brect[1] - 22),
                  (0, 0, 0), -1)
 
-    info_text = handedness.classification[0].label[0:]
+    info_text = handedness
     if hand_sign_text != "":
         info_text = info_text + ':' + hand_sign_text
     cv.putText(image, info_text, (brect[0] + 5, brect[1] - 4),
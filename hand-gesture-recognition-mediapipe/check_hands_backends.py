@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import argparse
+import sys
+
+import cv2 as cv
+import mediapipe as mp
+
+from model import KeyPointClassifier
+from utils import TasksHandsBackend
+from utils import mirror_handedness
+from PVZ_gesture_control import calc_landmark_list, pre_process_landmark
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+
+    # 视频文件或摄像头编号
+    parser.add_argument("--source", default='0')
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--landmarker_model", default='model/hand_landmarker.task')
+    parser.add_argument("--max_num_hands", type=int, default=1)
+    # 判定等价的阈值
+    parser.add_argument("--max_landmark_error",
+                        help='max mean landmark error (pixels)',
+                        type=float,
+                        default=10.0)
+    parser.add_argument("--min_agreement",
+                        help='min detection / handedness / hand sign agreement ratio',
+                        type=float,
+                        default=0.95)
+
+    args = parser.parse_args()
+
+    return args
+
+
+def first_hand(image, results):
+    """返回第一只手的 (左右手标签, 关键点列表)，未检测到时返回 None"""
+    if results.multi_hand_landmarks is None:
+        return None
+    label = mirror_handedness(results.multi_handedness[0].classification[0].label)
+    return label, calc_landmark_list(image, results.multi_hand_landmarks[0], mirror=True)
+
+
+def main():
+    args = get_args()
+
+    legacy = mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=args.max_num_hands,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5,
+        model_complexity=1
+    )
+    # VIDEO 模式与 LIVE_STREAM 使用相同的图，同步返回结果便于逐帧对比
+    tasks = TasksHandsBackend(args.landmarker_model,
+                              max_num_hands=args.max_num_hands,
+                              running_mode='video')
+    keypoint_classifier = KeyPointClassifier()
+
+    cap = cv.VideoCapture(int(args.source) if args.source.isdigit() else args.source)
+    fps = cap.get(cv.CAP_PROP_FPS) or 30.0
+
+    frames = 0
+    both_detected = 0
+    detection_agree = 0
+    handedness_agree = 0
+    hand_sign_agree = 0
+    landmark_errors = []
+
+    while frames < args.frames:
+        ret, image = cap.read()
+        if not ret:
+            break
+        rgb = cv.cvtColor(image, cv.COLOR_BGR2RGB)
+        legacy_hand = first_hand(image, legacy.process(rgb))
+        tasks_hand = first_hand(image, tasks.process(rgb, frames / fps))
+        frames += 1
+
+        if (legacy_hand is None) == (tasks_hand is None):
+            detection_agree += 1
+        if legacy_hand is None or tasks_hand is None:
+            continue
+
+        both_detected += 1
+        if legacy_hand[0] == tasks_hand[0]:
+            handedness_agree += 1
+        errors = [max(abs(a[0] - b[0]), abs(a[1] - b[1]))
+                  for a, b in zip(legacy_hand[1], tasks_hand[1])]
+        landmark_errors.append(sum(errors) / len(errors))
+        if (keypoint_classifier(pre_process_landmark(legacy_hand[1])) ==
+                keypoint_classifier(pre_process_landmark(tasks_hand[1]))):
+            hand_sign_agree += 1
+
+    cap.release()
+    legacy.close()
+    tasks.close()
+
+    if frames == 0:
+        print("没有读取到任何帧")
+        sys.exit(1)
+
+    detection_ratio = detection_agree / frames
+    handedness_ratio = handedness_agree / both_detected if both_detected else 1.0
+    hand_sign_ratio = hand_sign_agree / both_detected if both_detected else 1.0
+    mean_error = sum(landmark_errors) / len(landmark_errors) if landmark_errors else 0.0
+
+    print(f"对比帧数: {frames}, 两个后端都检测到手: {both_detected}")
+    print(f"检测结果一致: {detection_ratio:.3f}")
+    print(f"左右手标签一致: {handedness_ratio:.3f}")
+    print(f"关键点分类一致: {hand_sign_ratio:.3f}")
+    print(f"关键点平均误差: {mean_error:.2f}px, 最大 {max(landmark_errors, default=0.0):.2f}px")
+
+    passed = (detection_ratio >= args.min_agreement and
+              handedness_ratio >= args.min_agreement and
+              hand_sign_ratio >= args.min_agreement and
+              mean_error <= args.max_landmark_error)
+    print("等价检查通过" if passed else "等价检查未通过")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import argparse
+import time
+
+from utils import compile_dataset
+from utils.dataset_cache import DEFAULT_CACHE_DIR
+
+# 训练集去除近似重复样本，测试集只编译不去重，保持评估结果与原CSV一致
+TRAIN_DATASETS = [
+    'model/keypoint_classifier/keypoint.csv',
+    'model/point_history_classifier/point_history.csv',
+]
+TEST_DATASETS = [
+    'model/keypoint_classifier/keypoint_test.csv',
+    'model/keypoint_classifier/keypoint_test2.csv',
+    'model/point_history_classifier/point_history_test.csv',
+    'model/point_history_classifier/point_history_test2.csv',
+]
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("datasets", nargs='*',
+                        help='training csv files (default: keypoint.csv and point_history.csv)')
+    parser.add_argument("--test_datasets", nargs='*', default=None,
+                        help='evaluation csv files compiled without deduplication')
+    parser.add_argument("--cache_dir", default=DEFAULT_CACHE_DIR)
+    # 近似重复的量化步长 (归一化坐标)，0 表示只去除完全相同的样本
+    parser.add_argument("--near_step", type=float, default=0.01)
+    parser.add_argument("--rebuild", action='store_true')
+    # 打印分层划分的统计，确认各类别比例
+    parser.add_argument("--train_size", type=float, default=0.75)
+    parser.add_argument("--seed", type=int, default=42)
+
+    args = parser.parse_args()
+
+    return args
+
+
+def main():
+    args = get_args()
+
+    train_datasets = args.datasets or TRAIN_DATASETS
+    test_datasets = TEST_DATASETS if args.test_datasets is None else args.test_datasets
+
+    jobs = ([(path, True) for path in train_datasets] +
+            [(path, False) for path in test_datasets])
+    for csv_path, dedup in jobs:
+        start_time = time.time()
+        dataset = compile_dataset(csv_path, args.cache_dir, dedup=dedup,
+                                  near_step=args.near_step if dedup else 0.0,
+                                  rebuild=args.rebuild)
+        info = dataset.info
+        print(f"{csv_path}: {info['rows']} 行 -> {info['samples']} 条 "
+              f"(去除 {info['rows'] - info['samples']} 条重复), "
+              f"特征维度 {info['feature_size']}, 用时 {(time.time() - start_time) * 1000:.0f}ms")
+        print(f"  缓存: {dataset.path}")
+        print(f"  各类别样本数: {info['class_counts']}")
+        if dedup and len(dataset) > 0:
+            _, _, y_train, y_test = dataset.split(args.train_size, args.seed)
+            print(f"  分层划分 (seed={args.seed}): 训练 {len(y_train)} 条, 测试 {len(y_test)} 条")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import argparse
+import sys
+
+from utils import EvaluationIndex
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("report", nargs='?', choices=['trend', 'best', 'regressions'],
+                        default='trend')
+    parser.add_argument("--eval_root", default='evaluation')
+    parser.add_argument("--db", default='evaluation/index.sqlite')
+    parser.add_argument("--model_type", choices=['keypoint', 'point_history'], default=None)
+    # 数据集为评估时的CSV相对路径，例如 model/keypoint_classifier/keypoint_test.csv
+    parser.add_argument("--dataset", default=None)
+    parser.add_argument("--arch", default=None)
+    parser.add_argument("--metric", choices=['accuracy', 'recall', 'precision', 'f1_score'],
+                        default='f1_score')
+    # 相邻两次评估的指标下降超过该值时记为回退
+    parser.add_argument("--threshold", type=float, default=0.01)
+    parser.add_argument("--fail_on_regression", action='store_true')
+
+    args = parser.parse_args()
+
+    return args
+
+
+def print_trend(index, model_type, dataset, arch):
+    runs = index.trend(model_type, dataset, arch)
+    if not runs:
+        print(f"没有 {model_type} 的评估记录")
+        return
+    labels = []
+    for _, class_f1 in runs:
+        labels += [label for label in class_f1 if label not in labels]
+
+    print(f"\n{model_type} 评估趋势 (各类别为 F1):")
+    header = f"{'evaluated_at':<19}  {'arch':>4}  {'dataset':<28}  {'Acc':>6}  {'F1':>6}"
+    print(header + ''.join(f"  {label[:10]:>10}" for label in labels))
+    for run, class_f1 in runs:
+        dataset_name = run['dataset'].rsplit('/', 1)[-1]
+        line = (f"{run['evaluated_at']:<19}  {run['arch']:>4}  {dataset_name:<28}  "
+                f"{run['accuracy']:6.4f}  {run['f1_score']:6.4f}")
+        line += ''.join(f"  {class_f1[label]:10.4f}" if label in class_f1 else f"  {'-':>10}"
+                        for label in labels)
+        print(line)
+
+
+def main():
+    args = get_args()
+
+    index = EvaluationIndex(args.db)
+    updated, removed = index.update(args.eval_root)
+    print(f"索引: {args.db} (新增/更新 {updated} 条, 删除 {removed} 条)")
+
+    model_types = [args.model_type] if args.model_type else ['keypoint', 'point_history']
+    regression_count = 0
+
+    if args.report == 'trend':
+        for model_type in model_types:
+            print_trend(index, model_type, args.dataset, args.arch)
+
+    elif args.report == 'best':
+        for model_type in model_types:
+            print(f"\n{model_type} 各数据集上 {args.metric} 最高的评估:")
+            for run in index.best(model_type, args.dataset, args.metric):
+                print(f"  {run['dataset']}: {run['run_dir']} (arch={run['arch']}, "
+                      f"{args.metric}={run[args.metric]:.4f}, 评估时间 {run['evaluated_at']})")
+
+    else:
+        for model_type in model_types:
+            flagged = index.regressions(model_type, args.threshold, args.metric)
+            regression_count += len(flagged)
+            print(f"\n{model_type} 回退 (下降超过 {args.threshold}): {len(flagged)} 处")
+            for previous, current, drops in flagged:
+                print(f"  {current['dataset']} arch={current['arch']}: "
+                      f"{previous['run_dir']} -> {current['run_dir']}")
+                for name, previous_value, current_value in drops:
+                    print(f"    {name}: {previous_value:.4f} -> {current_value:.4f} "
+                          f"({current_value - previous_value:+.4f})")
+
+    index.close()
+    if args.fail_on_regression and regression_count > 0:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import argparse
+import csv
+import os
+import time
+import multiprocessing as multi_proc
+
+import cv2 as cv
+import mediapipe as mp
+
+from utils import mirror_handedness
+from PVZ_gesture_control import calc_landmark_list, pre_process_landmark
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+
+    # 目录结构: <image_root>/<标签名或标签编号>/*.jpg
+    parser.add_argument("image_root", help='folder with one sub-folder per label')
+    parser.add_argument("--output",
+                        help='keypoint dataset csv to append to',
+                        default='model/keypoint_classifier/keypoint.csv')
+    parser.add_argument("--label_csv",
+                        default='model/keypoint_classifier/keypoint_classifier_label.csv')
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--min_detection_confidence", type=float, default=0.5)
+    # 照片未经镜像时，与实时程序一样按镜像换算关键点
+    parser.add_argument("--no_mirror", action='store_true')
+    parser.add_argument("--right_only", action='store_true')
+    # 每处理多少张图片写入一次 (同时更新断点记录)
+    parser.add_argument("--flush_every", type=int, default=200)
+
+    args = parser.parse_args()
+
+    return args
+
+
+def load_label_ids(label_csv):
+    with open(label_csv, encoding='utf-8-sig') as f:
+        return {row[0]: index for index, row in enumerate(csv.reader(f)) if row}
+
+
+def collect_images(image_root, label_ids):
+    """
+    遍历标签目录，返回 [(相对路径, 标签编号), ...]
+    子目录名可以是标签名 (keypoint_classifier_label.csv 中的名称) 或标签编号
+    """
+    images = []
+    for folder in sorted(os.listdir(image_root)):
+        folder_path = os.path.join(image_root, folder)
+        if not os.path.isdir(folder_path):
+            continue
+        if folder in label_ids:
+            label_id = label_ids[folder]
+        elif folder.isdigit():
+            label_id = int(folder)
+        else:
+            print(f"跳过未知标签目录: {folder}")
+            continue
+        for directory, _, files in os.walk(folder_path):
+            for file_name in sorted(files):
+                if file_name.lower().endswith(IMAGE_EXTENSIONS):
+                    path = os.path.join(directory, file_name)
+                    images.append((os.path.relpath(path, image_root), label_id))
+    return images
+
+
+# 工作进程状态 ########################################################################
+_worker = {}
+
+
+def init_worker(args):
+    """工作进程初始化：每个进程创建一次静态图像模式的 MediaPipe Hands"""
+    _worker['args'] = args
+    _worker['hands'] = mp.solutions.hands.Hands(
+        static_image_mode=True,
+        max_num_hands=1,
+        min_detection_confidence=args.min_detection_confidence,
+    )
+
+
+def extract_image(task):
+    """
+    提取单张图片的关键点
+
+    返回:
+        (相对路径, 数据集行或 None)，未检测到手或读取失败时为 None
+    """
+    relative_path, label_id = task
+    args = _worker['args']
+    image = cv.imread(os.path.join(args.image_root, relative_path))
+    if image is None:
+        return relative_path, None
+
+    results = _worker['hands'].process(cv.cvtColor(image, cv.COLOR_BGR2RGB))
+    if results.multi_hand_landmarks is None:
+        return relative_path, None
+
+    mirror = not args.no_mirror
+    for hand_landmarks, handedness in zip(results.multi_hand_landmarks,
+                                          results.multi_handedness):
+        label = handedness.classification[0].label
+        if mirror:
+            label = mirror_handedness(label)
+        if args.right_only and label != 'Right':
+            continue
+        landmark_list = calc_landmark_list(image, hand_landmarks, mirror=mirror)
+        # 与 app.py 的 logging_csv 相同的行格式: [标签编号, 42个归一化坐标]
+        return relative_path, [label_id, *pre_process_landmark(landmark_list)]
+    return relative_path, None
+
+
+def main():
+    args = get_args()
+
+    images = collect_images(args.image_root, load_label_ids(args.label_csv))
+
+    # 断点续传：已处理的图片记录在 <output>.done 中
+    done_path = args.output + '.done'
+    done = set()
+    if os.path.exists(done_path):
+        with open(done_path, encoding='utf-8') as f:
+            done = set(line.rstrip('\n') for line in f)
+    tasks = [task for task in images if task[0] not in done]
+    print(f"图片总数: {len(images)}, 已处理: {len(images) - len(tasks)}, 待处理: {len(tasks)}")
+    if not tasks:
+        return
+
+    start_time = time.time()
+    processed = 0
+    extracted = 0
+    pending_rows = []
+    pending_done = []
+
+    def flush():
+        # 先写数据行再写断点记录，中断时最多重复写入一批数据，不会漏掉
+        with open(args.output, 'a', newline='') as f:
+            csv.writer(f).writerows(pending_rows)
+        with open(done_path, 'a', encoding='utf-8') as f:
+            f.writelines(path + '\n' for path in pending_done)
+        pending_rows.clear()
+        pending_done.clear()
+
+    with multi_proc.Pool(args.workers, initializer=init_worker, initargs=(args,)) as pool:
+        try:
+            for relative_path, row in pool.imap_unordered(extract_image, tasks, chunksize=16):
+                processed += 1
+                pending_done.append(relative_path)
+                if row is not None:
+                    extracted += 1
+                    pending_rows.append(row)
+
+                if processed % args.flush_every == 0 or processed == len(tasks):
+                    flush()
+                    elapsed = time.time() - start_time
+                    rate = processed / elapsed
+                    remaining = (len(tasks) - processed) / rate if rate > 0 else 0
+                    print(f"[{processed}/{len(tasks)}] 提取 {extracted} 条, "
+                          f"{rate:.1f} 张/秒, 预计剩余 {remaining:.0f}s")
+        except KeyboardInterrupt:
+            print("中断，保存已处理的结果")
+        finally:
+            if pending_done:
+                flush()
+
+    print(f"完成: 处理 {processed} 张, 写入 {extracted} 条到 {args.output} "
+          f"(未检测到手: {processed - extracted})")
+
+
+if __name__ == '__main__':
+    multi_proc.freeze_support()
+    main()
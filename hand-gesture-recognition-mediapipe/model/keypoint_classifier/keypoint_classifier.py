@@ -16,11 +16,14 @@ class KeyPointClassifier(object):
         self.interpreter.allocate_tensors()
         self.input_details = self.interpreter.get_input_details()
         self.output_details = self.interpreter.get_output_details()
+        self._batch_size = 1
 
     def __call__(
         self,
         landmark_list,
     ):
+        self._resize_batch(1)
+
         input_details_tensor_index = self.input_details[0]['index']
         self.interpreter.set_tensor(
             input_details_tensor_index,
@@ -34,3 +37,35 @@ class KeyPointClassifier(object):
         result_index = np.argmax(np.squeeze(result))
 
         return result_index
+
+    def classify_batch(
+        self,
+        landmark_lists,
+    ):
+        # 多只手的关键点在一次解释器调用中完成分类
+        if len(landmark_lists) == 0:
+            return []
+        self._resize_batch(len(landmark_lists))
+
+        input_details_tensor_index = self.input_details[0]['index']
+        self.interpreter.set_tensor(
+            input_details_tensor_index,
+            np.array(landmark_lists, dtype=np.float32))
+        self.interpreter.invoke()
+
+        output_details_tensor_index = self.output_details[0]['index']
+
+        result = self.interpreter.get_tensor(output_details_tensor_index)
+
+        return [int(index) for index in np.argmax(result, axis=1)]
+
+    def _resize_batch(self, batch_size):
+        # 仅在批大小变化时重新分配张量
+        if batch_size == self._batch_size:
+            return
+        input_shape = list(self.input_details[0]['shape'])
+        input_shape[0] = batch_size
+        self.interpreter.resize_tensor_input(self.input_details[0]['index'],
+                                             input_shape)
+        self.interpreter.allocate_tensors()
+        self._batch_size = batch_size
@@ -18,6 +18,7 @@ class PointHistoryClassifier(object):
         self.interpreter.allocate_tensors()
         self.input_details = self.interpreter.get_input_details()
         self.output_details = self.interpreter.get_output_details()
+        self._batch_size = 1
 
         self.score_th = score_th
         self.invalid_value = invalid_value
@@ -26,6 +27,8 @@ class PointHistoryClassifier(object):
         self,
         point_history,
     ):
+        self._resize_batch(1)
+
         input_details_tensor_index = self.input_details[0]['index']
         self.interpreter.set_tensor(
             input_details_tensor_index,
@@ -42,3 +45,39 @@ class PointHistoryClassifier(object):
             result_index = self.invalid_value
 
         return result_index
+
+    def classify_batch(
+        self,
+        point_histories,
+    ):
+        # 多只手的轨迹在一次解释器调用中完成分类
+        if len(point_histories) == 0:
+            return []
+        self._resize_batch(len(point_histories))
+
+        input_details_tensor_index = self.input_details[0]['index']
+        self.interpreter.set_tensor(
+            input_details_tensor_index,
+            np.array(point_histories, dtype=np.float32))
+        self.interpreter.invoke()
+
+        output_details_tensor_index = self.output_details[0]['index']
+
+        result = self.interpreter.get_tensor(output_details_tensor_index)
+
+        result_indexes = np.argmax(result, axis=1)
+        result_scores = result[np.arange(len(result_indexes)), result_indexes]
+        result_indexes[result_scores < self.score_th] = self.invalid_value
+
+        return [int(index) for index in result_indexes]
+
+    def _resize_batch(self, batch_size):
+        # 仅在批大小变化时重新分配张量
+        if batch_size == self._batch_size:
+            return
+        input_shape = list(self.input_details[0]['shape'])
+        input_shape[0] = batch_size
+        self.interpreter.resize_tensor_input(self.input_details[0]['index'],
+                                             input_shape)
+        self.interpreter.allocate_tensors()
+        self._batch_size = batch_size
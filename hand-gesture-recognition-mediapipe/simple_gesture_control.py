@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import argparse
 import cv2 as cv
 import numpy as np
 import mediapipe as mp
@@ -9,14 +10,57 @@ import pyautogui  # 导入pyautogui库控制鼠标
 import time
 import screeninfo  # 用于更可靠地获取屏幕分辨率
 import multiprocessing as mp_proc  # 导入多进程模块，使用不同的别名避免冲突
-from multiprocessing import Process, Queue, Value, Array  # 导入多进程相关工具
+from multiprocessing import Process, Value  # 导入多进程相关工具
 import ctypes  # 用于共享内存类型定义
-import queue  # 导入queue模块用于异常处理
 
 from model import KeyPointClassifier
+from utils import MouseCommandChannel
+from utils import create_mouse_backend
+from utils import CursorInterpolator
+from utils import mirror_x
+from utils import mirror_handedness
+from utils import FramePool
+from utils import PoseChangeGate
 import csv
 
 
+def get_args():
+    parser = argparse.ArgumentParser()
+
+    # 鼠标注入后端: pyautogui / xtest (X11) / uinput (Linux) / recording (测试用)
+    parser.add_argument("--mouse_backend",
+                        help='mouse injection backend',
+                        choices=['pyautogui', 'xtest', 'uinput', 'recording'],
+                        default='pyautogui')
+    # 移动注入频率，连续移动在一个刷新周期内合并为一次注入
+    parser.add_argument("--refresh_rate",
+                        help='display refresh rate for move coalescing',
+                        type=int,
+                        default=60)
+    # 按刷新率在摄像头样本之间插值光标位置: none / linear / hermite
+    parser.add_argument("--interpolate",
+                        help='cursor interpolation mode between camera samples',
+                        choices=['none', 'linear', 'hermite'],
+                        default='none')
+    parser.add_argument("--interp_delay",
+                        help='interpolation render delay (ms)',
+                        type=float,
+                        default=20)
+    # 姿态变化门控：关键点向量变化小于阈值时复用上次分类结果
+    parser.add_argument("--pose_gate_threshold",
+                        help='max landmark vector change to reuse the last hand sign (0: disabled)',
+                        type=float,
+                        default=0.02)
+    parser.add_argument("--pose_gate_max_age",
+                        help='force keypoint reclassification every N frames',
+                        type=int,
+                        default=10)
+
+    args = parser.parse_args()
+
+    return args
+
+
 def calc_center_point(landmark_list, point_indices=[0, 4, 8, 12, 16, 20]):
     """计算指定关键点的中心坐标"""
     # 如果关键点列表为空，返回None
@@ -35,13 +79,18 @@ def calc_center_point(landmark_list, point_indices=[0, 4, 8, 12, 16, 20]):
     return [int(x_sum / len(point_indices)), int(y_sum / len(point_indices))]
 
 
-def mouse_control_process(command_queue, running):
+def mouse_control_process(channel, running, backend_name='pyautogui', refresh_rate=60,
+                          interpolate='none', interp_delay=0.02):
     """
-    专门负责鼠标控制的子进程 - 优化为低延迟模式
+    专门负责鼠标控制的子进程 - 阻塞等待命令，不空转占用CPU
     
     参数:
-        command_queue: 命令队列，用于接收主进程发送的坐标和点击指令
+        channel: 鼠标命令通道 (最新位置槽 + 有序按键事件队列)
         running: 共享变量，用于控制进程退出
+        backend_name: 鼠标注入后端名称
+        refresh_rate: 移动注入频率 (Hz)
+        interpolate: 光标插值模式 ('none' / 'linear' / 'hermite')
+        interp_delay: 插值渲染延迟 (秒)
     """
     # 获取屏幕分辨率
     try:
@@ -51,59 +100,58 @@ def mouse_control_process(command_queue, running):
     except:
         screen_width, screen_height = pyautogui.size()
     
-    print(f"鼠标控制进程启动 - 屏幕分辨率: {screen_width}x{screen_height}")
+    backend = create_mouse_backend(backend_name, (screen_width, screen_height), refresh_rate)
+    print(f"鼠标控制进程启动 - 屏幕分辨率: {screen_width}x{screen_height}, 后端: {backend_name}")
     
-    # 鼠标控制参数
-    # 移除平滑参数，直接使用精确位置
     mouse_down = False  # 跟踪鼠标按下状态
     
-    # 设置鼠标移动速度为最快
-    pyautogui.MINIMUM_DURATION = 0  # 设置移动持续时间为0
-    pyautogui.MINIMUM_SLEEP = 0     # 设置最小休眠时间为0
-    pyautogui.PAUSE = 0             # 设置命令间暂停时间为0
+    # 插值模式下按刷新率输出插值位置，而不是直接使用摄像头样本
+    interpolator = None
+    if interpolate != 'none':
+        interpolator = CursorInterpolator(delay=interp_delay, mode=interpolate)
+    frame_interval = 1.0 / refresh_rate
     
     while running.value:
         try:
-            # 非阻塞方式尝试获取命令
-            try:
-                cmd_data = command_queue.get(block=False)
-                # 解析命令数据
-                cmd_type = cmd_data["type"]
-                
-                if cmd_type == "move":
-                    # 处理移动命令 - 直接移动到目标位置，不进行平滑
-                    target_x = cmd_data["x"]
-                    target_y = cmd_data["y"]
-                    
-                    # 直接移动鼠标到目标位置
-                    pyautogui.moveTo(target_x, target_y)
-                    
-                elif cmd_type == "mouse_down":
-                    # 鼠标按下命令
-                    if not mouse_down:  # 避免重复按下
-                        pyautogui.mouseDown()
+            # 阻塞等待唤醒；有未注入的移动时只等到下一个刷新周期
+            timeout = frame_interval if interpolator is not None else backend.flush_timeout()
+            if channel.wait(timeout=timeout):
+                # 按顺序处理所有按键事件，先移动到事件发生时的位置再按下/释放
+                for event in channel.take_events():
+                    if event["type"] == "mouse_down" and not mouse_down:  # 避免重复按下
+                        backend.move(event["x"], event["y"])
+                        backend.button_down()
                         mouse_down = True
-                
-                elif cmd_type == "mouse_up":
-                    # 鼠标释放命令
-                    if mouse_down:  # 避免重复释放
-                        pyautogui.mouseUp()
+                    elif event["type"] == "mouse_up" and mouse_down:  # 避免重复释放
+                        backend.move(event["x"], event["y"])
+                        backend.button_up()
                         mouse_down = False
                 
-            except (queue.Empty, Exception) as e:
-                # 队列为空，继续执行，不做任何等待
-                if not isinstance(e, queue.Empty):
-                    print(f"命令处理错误: {e}")
-                pass
-                
-            # 移除休眠，让进程持续以最高优先级处理命令
+                # 只保留最新的移动命令，中间的旧坐标已被覆盖
+                if interpolator is not None:
+                    sample = channel.take_sample()
+                    if sample is not None:
+                        interpolator.add_sample(*sample)
+                else:
+                    position = channel.take_move()
+                    if position is not None:
+                        backend.move(position[0], position[1])
+            
+            if interpolator is not None:
+                position = interpolator.sample(time.perf_counter())
+                if position is not None:
+                    backend.move(position[0], position[1])
+            
+            # 每个刷新周期最多注入一次移动
+            backend.flush()
                 
         except Exception as e:
             print(f"鼠标控制进程错误: {str(e)}")
     
     # 确保进程退出前释放鼠标按键
     if mouse_down:
-        pyautogui.mouseUp()
+        backend.button_up()
+    backend.close()
     
     print("鼠标控制进程已退出")
 
@@ -144,12 +192,16 @@ def apply_coordinate_filter(new_point, history, smoothing_factor=0.5, history_we
 
 
 def main():
+    args = get_args()
+
     # 创建进程间通信的队列和共享变量
-    command_queue = mp_proc.Queue()  # 修正: 使用mp_proc作为multiprocessing的别名
+    channel = MouseCommandChannel()  # 最新位置槽 + 不丢失的按键事件队列
     running = mp_proc.Value(ctypes.c_bool, True)  # 修正: 使用mp_proc
     
     # 创建并启动鼠标控制进程
-    mouse_process = Process(target=mouse_control_process, args=(command_queue, running))
+    mouse_process = Process(target=mouse_control_process, args=(channel, running,
+                                                                  args.mouse_backend, args.refresh_rate,
+                                                                  args.interpolate, args.interp_delay / 1000.0))
     mouse_process.daemon = True  # 将进程设为守护进程，这样主进程结束时它会自动终止
     mouse_process.start()
     
@@ -200,6 +252,13 @@ def main():
     actual_fps = cap.get(cv.CAP_PROP_FPS)
     print(f"摄像头帧率: {actual_fps}")
 
+    # 姿态变化门控：手势保持不变 (例如握拳拖动植物) 时跳过关键点分类
+    pose_gate = PoseChangeGate(threshold=args.pose_gate_threshold,
+                               max_age=args.pose_gate_max_age)
+
+    # 预分配帧缓冲，采集、颜色转换和调试图像每帧复用
+    frame_pool = FramePool(actual_width, actual_height)
+
     # 初始化MediaPipe Hands，调整参数提高响应性
     mp_hands = mp.solutions.hands
     hands = mp_hands.Hands(
@@ -234,7 +293,7 @@ def main():
     
     while True:
         # 获取帧
-        ret, image = cap.read()  # 从摄像头读取一帧图像
+        ret, image = frame_pool.read(cap)  # 从摄像头读取一帧图像到复用缓冲
         if not ret:
             break  # 如果读取失败，退出循环
         frame_count += 1  # 增加帧计数器
@@ -246,17 +305,14 @@ def main():
             frame_count = 0  # 重置帧计数器
             start_time = current_time  # 更新开始时间
             
-        image = cv.flip(image, 1)  # 镜像显示图像
-        
-        # 创建调试图像的副本 (仅当窗口可见时)
+        # 不再翻转整帧：关键点x坐标和左右手标签按镜像换算，只有窗口可见时才翻转生成调试图像
         if window_visible:
-            # 使用浅拷贝而不是深拷贝，提高性能
-            debug_image = image.copy()  # 替换copy.deepcopy减少性能开销
+            debug_image = frame_pool.debug_view(image)
         
         # 控制处理频率 - 仅在特定帧处理手势识别
         if frame_count % process_every_n_frames == 0:
             # 转换为RGB格式并处理
-            image = cv.cvtColor(image, cv.COLOR_BGR2RGB)  # 转换为RGB格式
+            image = frame_pool.to_rgb(image)  # 转换为RGB格式 (写入复用缓冲)
             image.flags.writeable = False  # 设置为只读以提高性能
             results = hands.process(image)  # 使用MediaPipe Hands处理图像
             image.flags.writeable = True  # 恢复为可写
@@ -269,11 +325,12 @@ def main():
             if results.multi_hand_landmarks is not None:
                 for hand_landmarks, handedness in zip(results.multi_hand_landmarks,
                                                     results.multi_handedness):
+                    handedness_label = mirror_handedness(handedness.classification[0].label)
                     # 只处理右手
-                    if handedness.classification[0].label == 'Right':
+                    if handedness_label == 'Right':
                         hand_detected = True
                         # 计算关键点列表 - 优化版本
-                        landmark_list = calc_landmark_list(image, hand_landmarks)
+                        landmark_list = calc_landmark_list(image, hand_landmarks, mirror=True)
                         
                         # 修改：使用索引为0的点(手腕点)而不是中心点
                         wrist_point = None
@@ -314,21 +371,8 @@ def main():
                             target_x = filtered_point[0]
                             target_y = filtered_point[1]
                             
-                            # 通过队列发送鼠标移动命令到子进程
-                            # 设置队列最大大小为1，确保总是处理最新的坐标
-                            try:
-                                # 如果队列已满，先清空它
-                                while not command_queue.empty():
-                                    _ = command_queue.get_nowait()
-                                
-                                # 放入最新的移动命令
-                                command_queue.put({
-                                    "type": "move",
-                                    "x": target_x,
-                                    "y": target_y
-                                })
-                            except:
-                                pass
+                            # 写入最新位置槽，鼠标进程只会执行最新的坐标
+                            channel.post_move(target_x, target_y)
                         
                             # 如果窗口可见，显示原始点和滤波点用于调试
                             if window_visible and wrist_point:
@@ -353,27 +397,27 @@ def main():
                         
                         # 获取手势分类
                         pre_processed_landmark_list = pre_process_landmark(landmark_list)
-                        hand_sign_id = keypoint_classifier(pre_processed_landmark_list)
+                        # 姿态未变化时复用上次分类结果
+                        hand_sign_id = pose_gate.lookup(pre_processed_landmark_list)
+                        if hand_sign_id is None:
+                            hand_sign_id = keypoint_classifier(pre_processed_landmark_list)
+                            pose_gate.store(pre_processed_landmark_list, hand_sign_id)
                         current_hand_gesture = keypoint_classifier_labels[hand_sign_id]
                         
                         # 处理鼠标按钮状态变化
                         if current_hand_gesture == "Close" and last_hand_gesture != "Close":
                             # 手势从其他变为"Close"，发送鼠标按下命令
-                            command_queue.put({
-                                "type": "mouse_down"
-                            })
+                            channel.post_button("mouse_down")
                             mouse_button_down = True
                         elif current_hand_gesture != "Close" and last_hand_gesture == "Close":
                             # 手势从"Close"变为其他，发送鼠标释放命令
-                            command_queue.put({
-                                "type": "mouse_up"
-                            })
+                            channel.post_button("mouse_up")
                             mouse_button_down = False
                         
                         # 仅当窗口可见时执行绘制操作
                         if window_visible:
                             # 计算边界框
-                            brect = calc_bounding_rect(debug_image, hand_landmarks)
+                            brect = calc_bounding_rect(debug_image, hand_landmarks, mirror=True)
                             
                             # 在图像上显示鼠标控制点
                             if wrist_point:
@@ -385,15 +429,13 @@ def main():
                             debug_image = draw_info_text(
                                 debug_image,
                                 brect,
-                                handedness.classification[0].label,
+                                handedness_label,
                                 current_hand_gesture
                             )
             
             # 如果没有检测到手，但上次是"Close"状态，需要释放鼠标按键
             if not hand_detected and last_hand_gesture == "Close" and mouse_button_down:
-                command_queue.put({
-                    "type": "mouse_up"
-                })
+                channel.post_button("mouse_up")
                 mouse_button_down = False
                 current_hand_gesture = ""
             
@@ -430,6 +472,7 @@ def main():
             except:
                 # 如果显示失败，可能窗口已关闭或最小化
                 window_visible = False
+                frame_pool.release_debug()
         else:
             # 尝试创建一个窗口 (如果窗口被关闭)
             try:
@@ -452,12 +495,15 @@ def main():
     cv.destroyAllWindows()
 
 
-def calc_bounding_rect(image, landmarks):
+def calc_bounding_rect(image, landmarks, mirror=False):
     image_width, image_height = image.shape[1], image.shape[0]
     landmark_array = np.empty((0, 2), int)
 
     for _, landmark in enumerate(landmarks.landmark):
-        landmark_x = min(int(landmark.x * image_width), image_width - 1)
+        if mirror:
+            landmark_x = mirror_x(landmark.x, image_width)
+        else:
+            landmark_x = min(int(landmark.x * image_width), image_width - 1)
         landmark_y = min(int(landmark.y * image_height), image_height - 1)
         landmark_point = [np.array((landmark_x, landmark_y))]
         landmark_array = np.append(landmark_array, landmark_point, axis=0)
@@ -466,12 +512,16 @@ def calc_bounding_rect(image, landmarks):
     return [x, y, x + w, y + h]
 
 
-def calc_landmark_list(image, landmarks):
+def calc_landmark_list(image, landmarks, mirror=False):
     image_width, image_height = image.shape[1], image.shape[0]
     landmark_point = []
 
     for _, landmark in enumerate(landmarks.landmark):
-        landmark_x = min(int(landmark.x * image_width), image_width - 1)
+        # mirror=True: 在未镜像帧上运行MediaPipe，坐标按镜像图像换算
+        if mirror:
+            landmark_x = mirror_x(landmark.x, image_width)
+        else:
+            landmark_x = min(int(landmark.x * image_width), image_width - 1)
         landmark_y = min(int(landmark.y * image_height), image_height - 1)
         landmark_point.append([landmark_x, landmark_y])
 
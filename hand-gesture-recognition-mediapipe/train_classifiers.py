@@ -0,0 +1,406 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import argparse
+import csv
+import datetime
+import itertools
+import os
+import shutil
+import time
+import multiprocessing as multi_proc
+
+import numpy as np
+
+from utils import compile_dataset
+from utils import LandmarkAugmenter
+from utils.dataset_cache import CompiledDataset
+from utils.model_reloader import load_labels
+
+RANDOM_SEED = 42
+
+# 与 keypoint_classification*.ipynb / point_history_classification.ipynb 保持一致
+DATASETS = {
+    'keypoint': {
+        'directory': 'model/keypoint_classifier',
+        'dataset': 'model/keypoint_classifier/keypoint.csv',
+        'labels': 'model/keypoint_classifier/keypoint_classifier_label.csv',
+        'test_datasets': ['model/keypoint_classifier/keypoint_test.csv',
+                          'model/keypoint_classifier/keypoint_test2.csv'],
+        'num_classes': 4,
+        'input_size': 21 * 2,
+    },
+    'point_history': {
+        'directory': 'model/point_history_classifier',
+        'dataset': 'model/point_history_classifier/point_history.csv',
+        'labels': 'model/point_history_classifier/point_history_classifier_label.csv',
+        'test_datasets': ['model/point_history_classifier/point_history_test.csv',
+                          'model/point_history_classifier/point_history_test2.csv'],
+        'num_classes': 5,
+        'input_size': 16 * 2,  # TIME_STEPS * DIMENSION
+    },
+}
+
+# 左右镜像后互换的标签 (轨迹的旋转方向随镜像反转)
+MIRROR_LABEL_PAIRS = {
+    'keypoint': [],
+    'point_history': [('clockwise', 'counterclockwise')],
+}
+
+# 结果表的列，每个候选一行
+SWEEP_COLUMNS = ['candidate', 'arch', 'learning_rate', 'batch_size', 'epochs',
+                 'val_accuracy', 'val_loss', 'params', 'tflite_bytes', 'latency_ms',
+                 'train_seconds']
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("model_type", choices=sorted(DATASETS))
+    parser.add_argument("--dataset", help='training csv (default: the notebook dataset)', default=None)
+    parser.add_argument("--near_step", type=float, default=0.01)
+    parser.add_argument("--train_size", type=float, default=0.75)
+
+    # 搜索空间：所有组合各训练一个候选
+    parser.add_argument("--archs", help='notebook model choices', type=int, nargs='+', default=[0, 1])
+    parser.add_argument("--learning_rates", type=float, nargs='+', default=[0.001, 0.003])
+    parser.add_argument("--batch_sizes", type=int, nargs='+', default=[128])
+    parser.add_argument("--epochs", type=int, default=1000)
+    parser.add_argument("--patience", type=int, default=20)
+
+    # 训练时在线增强 (不写入CSV)，验证集不增强
+    # 幅度参数省略时按模型类型使用 utils/landmark_augment.py 中的默认值
+    parser.add_argument("--augment", action='store_true')
+    parser.add_argument("--aug_rotation", help='degrees', type=float, default=None)
+    parser.add_argument("--aug_scale", type=float, default=None)
+    parser.add_argument("--aug_shear", type=float, default=None)
+    parser.add_argument("--aug_jitter", help='relative to each sample extent', type=float, default=None)
+    parser.add_argument("--aug_time_warp", type=float, default=None)
+    parser.add_argument("--aug_mirror_prob", type=float, default=0.5)
+
+    # 每个进程只用少量线程，多个候选并行占满CPU
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 1) // 2))
+    parser.add_argument("--threads_per_worker", type=int, default=2)
+
+    # 选择：验证准确率与最佳候选相差不超过该值时，取延迟最低的候选
+    parser.add_argument("--accuracy_tolerance", type=float, default=0.005)
+    parser.add_argument("--latency_runs", type=int, default=500)
+    # 导出目录，默认与笔记本相同 (覆盖 <类型>_classifier<arch>.keras/.tflite)
+    parser.add_argument("--export_dir", default=None)
+    parser.add_argument("--no_export", action='store_true')
+    parser.add_argument("--no_eval", action='store_true')
+
+    args = parser.parse_args()
+
+    return args
+
+
+def build_model(tf, model_type, arch, num_classes):
+    """
+    构建笔记本中的模型结构
+
+    参数:
+        tf: tensorflow 模块
+        model_type: 'keypoint' / 'point_history'
+        arch: 笔记本中的 choice (0: 简单模型, 1: 复杂模型)
+        num_classes: 类别数
+    """
+    layers = tf.keras.layers
+    l2 = tf.keras.regularizers.l2
+    input_size = DATASETS[model_type]['input_size']
+    if model_type == 'keypoint':
+        if arch == 0:
+            return tf.keras.models.Sequential([
+                layers.Input((input_size, )),
+                layers.Dropout(0.2),
+                layers.Dense(20, activation='relu'),
+                layers.Dropout(0.4),
+                layers.Dense(10, activation='relu'),
+                layers.Dense(num_classes, activation='softmax')
+            ])
+        return tf.keras.models.Sequential([
+            layers.Input((input_size, )),
+            layers.Dense(128, activation='relu', kernel_regularizer=l2(1e-4)),
+            layers.BatchNormalization(),
+            layers.Dropout(0.3),
+            layers.Dense(64, activation='relu', kernel_regularizer=l2(1e-4)),
+            layers.BatchNormalization(),
+            layers.Dropout(0.3),
+            layers.Dense(32, activation='relu', kernel_regularizer=l2(1e-4)),
+            layers.BatchNormalization(),
+            layers.Dense(num_classes, activation='softmax')
+        ])
+
+    if arch == 0:
+        return tf.keras.models.Sequential([
+            layers.Input((input_size, )),
+            layers.Dropout(0.2),
+            layers.Dense(24, activation='relu'),
+            layers.Dropout(0.5),
+            layers.Dense(10, activation='relu'),
+            layers.Dense(num_classes, activation='softmax')
+        ])
+    return tf.keras.models.Sequential([
+        layers.Input((input_size, )),
+        layers.Dense(32, activation='relu', kernel_regularizer=l2(1e-4)),
+        layers.BatchNormalization(),
+        layers.Dropout(0.2),
+        layers.Dense(16, activation='relu', kernel_regularizer=l2(1e-4)),
+        layers.BatchNormalization(),
+        layers.Dense(num_classes, activation='softmax')
+    ])
+
+
+def convert_tflite(tf, model):
+    # 与笔记本相同的量化设置
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    return converter.convert()
+
+
+def create_augmenter(args, seed):
+    """按命令行参数创建增强器，镜像标签对由标签名换算为编号"""
+    labels = load_labels(DATASETS[args.model_type]['labels'])
+    mirror_label_map = {}
+    for first, second in MIRROR_LABEL_PAIRS[args.model_type]:
+        if first in labels and second in labels:
+            mirror_label_map[labels.index(first)] = labels.index(second)
+            mirror_label_map[labels.index(second)] = labels.index(first)
+    return LandmarkAugmenter(args.model_type,
+                             rotation=args.aug_rotation,
+                             scale=args.aug_scale,
+                             shear=args.aug_shear,
+                             jitter=args.aug_jitter,
+                             time_warp=args.aug_time_warp,
+                             mirror_prob=args.aug_mirror_prob,
+                             mirror_label_map=mirror_label_map,
+                             seed=seed)
+
+
+def measure_latency(tf, tflite_path, runs):
+    """单样本推理延迟的中位数 (毫秒)，与实时程序一样使用单线程解释器"""
+    interpreter = tf.lite.Interpreter(model_path=tflite_path, num_threads=1)
+    interpreter.allocate_tensors()
+    input_details = interpreter.get_input_details()[0]
+    sample = np.zeros(input_details['shape'], dtype=np.float32)
+    timings = []
+    for index in range(runs + 20):
+        start = time.perf_counter()
+        interpreter.set_tensor(input_details['index'], sample)
+        interpreter.invoke()
+        if index >= 20:  # 前20次作为预热
+            timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+# 工作进程状态 ########################################################################
+_worker = {}
+
+
+def init_worker(args, dataset_path, sweep_dir):
+    """工作进程初始化：只使用CPU，限制线程数，打开编译后的数据集"""
+    os.environ['CUDA_VISIBLE_DEVICES'] = '-1'
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(args.threads_per_worker)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    _worker['tf'] = tf
+    _worker['args'] = args
+    _worker['sweep_dir'] = sweep_dir
+    # 内存映射打开，多个进程共享同一份页缓存
+    _worker['split'] = CompiledDataset(dataset_path).split(args.train_size, RANDOM_SEED)
+
+
+def train_candidate(task):
+    """
+    训练一个候选并保存 .keras / .tflite
+
+    参数:
+        task: (候选编号, {'arch', 'learning_rate', 'batch_size'})
+    返回:
+        结果行 (dict)，latency_ms 由主进程在训练结束后统一测量
+    """
+    index, config = task
+    tf = _worker['tf']
+    args = _worker['args']
+    X_train, X_test, y_train, y_test = _worker['split']
+
+    tf.keras.utils.set_random_seed(RANDOM_SEED)
+    model = build_model(tf, args.model_type, config['arch'],
+                        DATASETS[args.model_type]['num_classes'])
+    model.compile(
+        optimizer=tf.keras.optimizers.Adam(learning_rate=config['learning_rate']),
+        loss='sparse_categorical_crossentropy',
+        metrics=['accuracy']
+    )
+    # 提前中止并恢复验证损失最低的权重，相当于笔记本中的检查点回调
+    es_callback = tf.keras.callbacks.EarlyStopping(patience=args.patience,
+                                                   restore_best_weights=True)
+
+    start_time = time.time()
+    if args.augment:
+        augmenter = create_augmenter(args, RANDOM_SEED + index)
+        history = model.fit(
+            augmenter.flow(X_train, y_train, config['batch_size']),
+            steps_per_epoch=augmenter.steps_per_epoch(len(y_train), config['batch_size']),
+            epochs=args.epochs,
+            validation_data=(np.asarray(X_test), y_test),
+            callbacks=[es_callback],
+            verbose=0
+        )
+    else:
+        history = model.fit(
+            np.asarray(X_train),
+            y_train,
+            epochs=args.epochs,
+            batch_size=config['batch_size'],
+            validation_data=(np.asarray(X_test), y_test),
+            callbacks=[es_callback],
+            verbose=0
+        )
+    train_seconds = time.time() - start_time
+    val_loss, val_accuracy = model.evaluate(np.asarray(X_test), y_test, verbose=0)
+
+    name = f'candidate{index:02d}'
+    keras_path = os.path.join(_worker['sweep_dir'], name + '.keras')
+    tflite_path = os.path.join(_worker['sweep_dir'], name + '.tflite')
+    model.save(keras_path, include_optimizer=False)
+    tflite_model = convert_tflite(tf, model)
+    with open(tflite_path, 'wb') as f:
+        f.write(tflite_model)
+
+    return {
+        'candidate': name,
+        'arch': config['arch'],
+        'learning_rate': config['learning_rate'],
+        'batch_size': config['batch_size'],
+        'epochs': len(history.history['loss']),
+        'val_accuracy': round(float(val_accuracy), 4),
+        'val_loss': round(float(val_loss), 4),
+        'params': int(model.count_params()),
+        'tflite_bytes': len(tflite_model),
+        'latency_ms': None,
+        'train_seconds': round(train_seconds, 1),
+    }
+
+
+def select_best(records, accuracy_tolerance):
+    """验证准确率接近最佳 (在容差内) 的候选中选择延迟最低的"""
+    best_accuracy = max(record['val_accuracy'] for record in records)
+    candidates = [record for record in records
+                  if record['val_accuracy'] >= best_accuracy - accuracy_tolerance]
+    return min(candidates, key=lambda record: (record['latency_ms'], -record['val_accuracy']))
+
+
+def evaluate_exported(model_type, arch, tflite_path):
+    """用 valid.py 的评估流程在测试集上评估导出的模型"""
+    from model import KeyPointClassifier
+    from model import PointHistoryClassifier
+    from valid import evaluate_model, load_labels
+
+    labels = load_labels(model_type)
+    if model_type == 'keypoint':
+        classifier = KeyPointClassifier(model_path=tflite_path)
+    else:
+        classifier = PointHistoryClassifier(model_path=tflite_path)
+
+    eval_dirs = []
+    for csv_path in DATASETS[model_type]['test_datasets']:
+        if not os.path.exists(csv_path):
+            continue
+        dataset = compile_dataset(csv_path, dedup=False)
+        if len(dataset) == 0:
+            continue
+        y_pred = classifier.classify_batch(np.asarray(dataset.X))
+        print(f"\n{csv_path} 评估结果:")
+        eval_dir = evaluate_model(dataset.y.tolist(), y_pred, labels, model_type, csv_path)
+        # 与已有的评估目录命名一致: eval_<类型>_<时间>_<arch>，同一秒内的多次评估追加序号
+        target = f'{eval_dir}_{arch}'
+        suffix = 1
+        while os.path.exists(target):
+            target = f'{eval_dir}_{arch}_{suffix}'
+            suffix += 1
+        os.rename(eval_dir, target)
+        eval_dirs.append(target)
+    return eval_dirs
+
+
+def main():
+    args = get_args()
+    config = DATASETS[args.model_type]
+
+    dataset = compile_dataset(args.dataset or config['dataset'], near_step=args.near_step)
+    class_count = len(dataset.info['class_counts'])
+    if class_count > config['num_classes']:
+        print(f"数据集中有 {class_count} 个类别，超过 NUM_CLASSES={config['num_classes']}")
+        return
+    print(f"数据集: {dataset.info['source']} ({dataset.info['rows']} 行 -> {len(dataset)} 条)")
+
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    sweep_dir = os.path.join(config['directory'], 'sweeps', timestamp)
+    os.makedirs(sweep_dir, exist_ok=True)
+
+    grid = [{'arch': arch, 'learning_rate': learning_rate, 'batch_size': batch_size}
+            for arch, learning_rate, batch_size in itertools.product(
+                args.archs, args.learning_rates, args.batch_sizes)]
+    tasks = list(enumerate(grid))
+    print(f"候选数: {len(tasks)}, 工作进程: {args.workers} x {args.threads_per_worker} 线程")
+
+    # TensorFlow 不支持 fork 后继续使用，工作进程用 spawn 启动
+    context = multi_proc.get_context('spawn')
+    records = []
+    start_time = time.time()
+    with context.Pool(args.workers, initializer=init_worker,
+                      initargs=(args, dataset.path, sweep_dir)) as pool:
+        for record in pool.imap_unordered(train_candidate, tasks):
+            records.append(record)
+            print(f"[{len(records)}/{len(tasks)}] {record['candidate']}: arch={record['arch']} "
+                  f"lr={record['learning_rate']} batch={record['batch_size']} "
+                  f"epochs={record['epochs']} val_accuracy={record['val_accuracy']:.4f}")
+    print(f"训练用时 {time.time() - start_time:.0f}s")
+
+    # 训练全部结束后在主进程中逐个测量延迟，避免并行训练干扰计时
+    os.environ['CUDA_VISIBLE_DEVICES'] = '-1'
+    import tensorflow as tf
+    records.sort(key=lambda record: record['candidate'])
+    for record in records:
+        record['latency_ms'] = round(measure_latency(
+            tf, os.path.join(sweep_dir, record['candidate'] + '.tflite'), args.latency_runs), 4)
+
+    sweep_csv = os.path.join(sweep_dir, 'sweep_results.csv')
+    with open(sweep_csv, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=SWEEP_COLUMNS)
+        writer.writeheader()
+        writer.writerows(records)
+
+    print("\n准确率 / 延迟:")
+    for record in sorted(records, key=lambda record: -record['val_accuracy']):
+        print(f"  {record['candidate']}: arch={record['arch']} lr={record['learning_rate']} "
+              f"batch={record['batch_size']} val_accuracy={record['val_accuracy']:.4f} "
+              f"latency={record['latency_ms']:.4f}ms params={record['params']}")
+
+    best = select_best(records, args.accuracy_tolerance)
+    print(f"\n最佳候选: {best['candidate']} (arch={best['arch']}, "
+          f"val_accuracy={best['val_accuracy']:.4f}, latency={best['latency_ms']:.4f}ms)")
+    print(f"结果表: {sweep_csv}")
+
+    tflite_path = os.path.join(sweep_dir, best['candidate'] + '.tflite')
+    if not args.no_export:
+        export_dir = args.export_dir or config['directory']
+        model_name = f"{args.model_type}_classifier{best['arch']}"
+        os.makedirs(export_dir, exist_ok=True)
+        shutil.copyfile(os.path.join(sweep_dir, best['candidate'] + '.keras'),
+                        os.path.join(export_dir, model_name + '.keras'))
+        tflite_path = os.path.join(export_dir, model_name + '.tflite')
+        shutil.copyfile(os.path.join(sweep_dir, best['candidate'] + '.tflite'), tflite_path)
+        print(f"已导出: {os.path.join(export_dir, model_name)}.keras / .tflite")
+
+    if not args.no_eval:
+        eval_dirs = evaluate_exported(args.model_type, best['arch'], tflite_path)
+        with open(os.path.join(sweep_dir, 'evaluations.txt'), 'w', encoding='utf-8') as f:
+            f.writelines(eval_dir + '\n' for eval_dir in eval_dirs)
+
+
+if __name__ == '__main__':
+    multi_proc.freeze_support()
+    main()
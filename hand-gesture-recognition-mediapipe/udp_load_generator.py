@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import argparse
+import math
+import time
+import ctypes
+import multiprocessing as multi_proc
+
+from PVZ_gesture_control import (
+    create_shared_data,
+    udp_sender_process,
+    udp_publisher_process,
+    pre_process_landmark,
+)
+
+# 张开手掌的21个关键点相对手腕的偏移 (像素)，用于合成关键点流
+OPEN_HAND_OFFSETS = [
+    (0, 0), (-30, -20), (-50, -45), (-65, -70), (-75, -95),
+    (-25, -90), (-30, -130), (-32, -155), (-34, -175),
+    (0, -95), (0, -140), (0, -168), (0, -190),
+    (22, -90), (26, -130), (28, -155), (30, -175),
+    (40, -80), (48, -110), (52, -130), (55, -148),
+]
+
+GESTURES = ['Open', 'Close', 'Hammer', 'OK']
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("--rate", help='synthetic sample rate (Hz)', type=float, default=1000)
+    parser.add_argument("--duration", help='seconds', type=float, default=10)
+    parser.add_argument("--publisher", action='store_true')
+    parser.add_argument("--control_port", type=int, default=12346)
+    parser.add_argument("--control_host", default='127.0.0.1')
+    parser.add_argument("--udp_rate", type=int, default=0)
+    parser.add_argument("--bundle",
+                        help='bundled samples per packet (>=1 so packets carry seq)',
+                        type=int,
+                        default=1)
+    # 对合成关键点运行真实的关键点分类器 (需要 TensorFlow)
+    parser.add_argument("--classify", action='store_true')
+    parser.add_argument("--width", type=int, default=960)
+    parser.add_argument("--height", type=int, default=540)
+
+    args = parser.parse_args()
+
+    return args
+
+
+def synthetic_landmarks(t, width, height):
+    """手腕沿椭圆运动，手指带轻微抖动"""
+    wrist_x = width * (0.5 + 0.25 * math.cos(t))
+    wrist_y = height * (0.6 + 0.15 * math.sin(t))
+    wobble = 3 * math.sin(t * 7)
+    return [[int(wrist_x + dx + wobble), int(wrist_y + dy - wobble)] for dx, dy in OPEN_HAND_OFFSETS]
+
+
+def main():
+    args = get_args()
+
+    shared_data = create_shared_data()
+    exit_flag = multi_proc.Value(ctypes.c_bool, False)
+
+    if args.publisher:
+        process = multi_proc.Process(target=udp_publisher_process,
+                                     args=(shared_data, exit_flag, args.control_port, args.bundle,
+                                           args.control_host))
+    else:
+        process = multi_proc.Process(target=udp_sender_process,
+                                     args=(shared_data, exit_flag, args.udp_rate, 'linear', 0.02, args.bundle))
+    process.daemon = True
+    process.start()
+
+    keypoint_classifier = None
+    if args.classify:
+        from model import KeyPointClassifier
+        keypoint_classifier = KeyPointClassifier()
+
+    # 等待发送进程就绪
+    time.sleep(1.0)
+    print(f"负载生成: {args.rate:.0f}Hz, {args.duration:.0f}s")
+
+    interval = 1.0 / args.rate
+    start_time = time.perf_counter()
+    next_time = start_time
+    samples = 0
+    overwritten = 0
+
+    try:
+        while True:
+            now = time.perf_counter()
+            if now - start_time > args.duration:
+                break
+            if now < next_time:
+                # 高频率时用 sleep(0) 让出CPU，避免 sleep 精度不足
+                time.sleep(0 if next_time - now < 0.002 else next_time - now - 0.001)
+                continue
+            next_time += interval
+
+            landmark_list = synthetic_landmarks(now - start_time, args.width, args.height)
+            if keypoint_classifier is not None:
+                gesture = GESTURES[keypoint_classifier(pre_process_landmark(landmark_list)) % len(GESTURES)]
+            else:
+                gesture = GESTURES[int(now - start_time) % len(GESTURES)]
+
+            # 发送进程尚未取走上一个样本时，该样本被覆盖
+            if shared_data['trigger_send'].value:
+                overwritten += 1
+
+            shared_data['x'].value = landmark_list[0][0] / args.width
+            shared_data['y'].value = landmark_list[0][1] / args.height
+            shared_data['timestamp'].value = now
+            shared_data['gesture'].value = gesture.encode('utf-8')[:19].ljust(20, b' ')
+            with shared_data['trigger_send'].get_lock():
+                shared_data['trigger_send'].value = True
+            samples += 1
+
+    except KeyboardInterrupt:
+        pass
+    finally:
+        elapsed = time.perf_counter() - start_time
+        exit_flag.value = True
+        process.join(timeout=2.0)
+        if process.is_alive():
+            process.terminate()
+        print(f"生成样本: {samples} ({samples / elapsed:.1f}/s), 发送前被覆盖: {overwritten}")
+
+
+if __name__ == '__main__':
+    multi_proc.freeze_support()
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import argparse
+import json
+import socket
+import time
+
+from utils.sample_bundle import SampleBundleDecoder
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("--host", default='127.0.0.1')
+    parser.add_argument("--port", type=int, default=12345)
+    parser.add_argument("--duration",
+                        help='stop after N seconds (0: until exit packet or Ctrl+C)',
+                        type=float,
+                        default=0)
+    parser.add_argument("--quiet", action='store_true')
+
+    args = parser.parse_args()
+
+    return args
+
+
+def parse_packet(datagram):
+    """
+    与Qt游戏 HandGestureReceiver::readPendingDatagrams 相同的解析：
+    JSON对象，读取 hand_gesture / x / y / finger_gesture，缺失字段取默认值
+    """
+    try:
+        obj = json.loads(datagram)
+    except ValueError:
+        return None
+    if not isinstance(obj, dict):
+        return None
+    return {
+        "hand_gesture": str(obj.get("hand_gesture", "")),
+        "x": float(obj.get("x", 0.0)),
+        "y": float(obj.get("y", 0.0)),
+        "finger_gesture": str(obj.get("finger_gesture", "")),
+        "seq": obj.get("seq"),
+        "t": obj.get("t"),
+        "samples": obj.get("samples"),
+    }
+
+
+def percentile(values, ratio):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+class ReceiverStats(object):
+    """统计到达间隔、序号缺失/乱序/重复、解码耗时和端到端延迟"""
+
+    def __init__(self):
+        self.packets = 0
+        self.invalid = 0
+        self.lost = 0
+        self.reordered = 0
+        self.duplicated = 0
+        self.intervals = []
+        self.decode_times = []
+        self.latencies = []
+        self._last_arrival = None
+        self._max_seq = None
+        self._seen = set()
+        self.bundle_decoder = SampleBundleDecoder()
+
+    def add(self, arrival, decode_time, packet):
+        if packet is None:
+            self.invalid += 1
+            return
+        self.packets += 1
+        self.decode_times.append(decode_time)
+        if self._last_arrival is not None:
+            self.intervals.append(arrival - self._last_arrival)
+        self._last_arrival = arrival
+
+        seq = packet["seq"]
+        if seq is not None:
+            if seq in self._seen:
+                self.duplicated += 1
+            elif self._max_seq is not None and seq < self._max_seq:
+                # 乱序到达的数据包之前被记为丢失
+                self.reordered += 1
+                self.lost -= 1
+            elif self._max_seq is not None:
+                self.lost += seq - self._max_seq - 1
+            self._seen.add(seq)
+            self._max_seq = seq if self._max_seq is None else max(self._max_seq, seq)
+
+        if packet["t"] is not None:
+            # 发送端和接收端在同一台机器上，time.perf_counter() 时钟可直接比较
+            self.latencies.append(arrival - packet["t"])
+        if packet["samples"]:
+            self.bundle_decoder.decode(packet)
+
+    def report(self, elapsed):
+        rate = self.packets / elapsed if elapsed > 0 else 0.0
+        lines = [
+            f"数据包: {self.packets} ({rate:.1f}/s), 无效: {self.invalid}",
+            f"序号: 丢失 {self.lost}, 乱序 {self.reordered}, 重复 {self.duplicated}",
+        ]
+        if self.intervals:
+            mean = sum(self.intervals) / len(self.intervals)
+            jitter = (sum((i - mean) ** 2 for i in self.intervals) / len(self.intervals)) ** 0.5
+            lines.append(f"到达间隔: 平均 {mean * 1000:.3f}ms, p99 {percentile(self.intervals, 0.99) * 1000:.3f}ms, "
+                         f"抖动(标准差) {jitter * 1000:.3f}ms")
+        if self.decode_times:
+            lines.append(f"解码耗时: 平均 {sum(self.decode_times) / len(self.decode_times) * 1e6:.1f}us, "
+                         f"p99 {percentile(self.decode_times, 0.99) * 1e6:.1f}us")
+        if self.latencies:
+            lines.append(f"端到端延迟: 平均 {sum(self.latencies) / len(self.latencies) * 1000:.3f}ms, "
+                         f"p99 {percentile(self.latencies, 0.99) * 1000:.3f}ms")
+        if self.bundle_decoder.received:
+            lines.append(f"样本数组: 恢复 {self.bundle_decoder.recovered}, 无法恢复 {self.bundle_decoder.lost}")
+        return "\n".join(lines)
+
+
+def main():
+    args = get_args()
+
+    udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+    udp_socket.bind((args.host, args.port))
+    udp_socket.settimeout(0.5)
+    print(f"替身接收端已绑定: {args.host}:{args.port}")
+
+    stats = ReceiverStats()
+    start_time = None
+    last_report = time.perf_counter()
+
+    try:
+        while True:
+            now = time.perf_counter()
+            if args.duration > 0 and start_time is not None and now - start_time > args.duration:
+                break
+            if not args.quiet and now - last_report > 1 and start_time is not None:
+                print(stats.report(now - start_time) + "\n")
+                last_report = now
+
+            try:
+                datagram = udp_socket.recv(65536)
+            except socket.timeout:
+                continue
+            arrival = time.perf_counter()
+            if start_time is None:
+                start_time = arrival
+
+            packet = parse_packet(datagram)
+            stats.add(arrival, time.perf_counter() - arrival, packet)
+
+            if packet is not None and packet["hand_gesture"] == "exit":
+                print("收到退出消息")
+                break
+
+    except KeyboardInterrupt:
+        pass
+    finally:
+        udp_socket.close()
+        if start_time is not None:
+            print("===== 汇总 =====")
+            print(stats.report(time.perf_counter() - start_time))
+
+
+if __name__ == '__main__':
+    main()
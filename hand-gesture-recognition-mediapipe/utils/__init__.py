@@ -1 +1,32 @@
-from utils.cvfpscalc import CvFpsCalc
\ No newline at end of file
+from utils.cvfpscalc import CvFpsCalc
+from utils.gesture_vote import GestureVote
+from utils.hand_tracker import HandTrack
+from utils.hand_tracker import HandTracker
+from utils.shared_ring import SharedArrayRing
+from utils.shared_ring import LatestArrayRing
+from utils.mouse_channel import MouseCommandChannel
+from utils.mouse_backend import MouseBackend
+from utils.mouse_backend import create_mouse_backend
+from utils.cursor_interpolator import CursorInterpolator
+from utils.gesture_publisher import GesturePublisher
+from utils.sample_bundle import SampleBundler
+from utils.sample_bundle import SampleBundleDecoder
+from utils.landmark_mirror import mirror_x
+from utils.landmark_mirror import mirror_handedness
+from utils.frame_pool import FramePool
+from utils.capture_profile import CaptureProfile
+from utils.capture_profile import negotiate_capture
+from utils.idle_scan import IdleScanner
+from utils.pose_gate import PoseChangeGate
+from utils.pose_gate import classify_gated
+from utils.pipelined_executor import PipelinedExecutor
+from utils.latest_frame import LatestFrameReader
+from utils.model_reloader import HotSwapClassifier
+from utils.model_reloader import watch_model_files
+from utils.model_reloader import reload_control_listener
+from utils.hand_landmarker_backend import TasksHandsBackend
+from utils.dataset_cache import CompiledDataset
+from utils.dataset_cache import compile_dataset
+from utils.dataset_cache import stratified_split
+from utils.landmark_augment import LandmarkAugmenter
+from utils.eval_index import EvaluationIndex
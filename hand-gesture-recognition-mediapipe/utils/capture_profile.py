@@ -0,0 +1,266 @@
+import os
+import sys
+import json
+import time
+import cv2 as cv
+
+
+def _candidate_backends():
+    """按平台列出候选采集后端，最后总是回退到 CAP_ANY"""
+    if sys.platform.startswith('linux'):
+        names = ['CAP_V4L2']
+    elif sys.platform == 'win32':
+        names = ['CAP_DSHOW', 'CAP_MSMF']
+    elif sys.platform == 'darwin':
+        names = ['CAP_AVFOUNDATION']
+    else:
+        names = []
+    backends = [(name, getattr(cv, name)) for name in names if hasattr(cv, name)]
+    backends.append(('CAP_ANY', cv.CAP_ANY))
+    return backends
+
+
+# 候选像素格式，None 表示保持驱动默认格式
+CANDIDATE_FOURCCS = ['MJPG', 'YUYV', None]
+
+
+def _fourcc_to_str(value):
+    value = int(value)
+    return ''.join(chr((value >> (8 * i)) & 0xFF) for i in range(4)).strip('\0')
+
+
+class CaptureProfile(object):
+    """
+    一个摄像头的采集配置及其实测结果
+
+    参数:
+        backend: 采集后端名称，例如 'CAP_V4L2'
+        fourcc: 像素格式，例如 'MJPG'，None 表示驱动默认
+        width, height: 实际分辨率
+        fps: 实测送帧率
+        retrieve_ms: 实测每帧解码/转换耗时 (retrieve)
+        buffer_size: 驱动内部缓冲深度
+    """
+
+    def __init__(self, backend, fourcc, width, height, fps=0.0, retrieve_ms=0.0, buffer_size=1):
+        self.backend = backend
+        self.fourcc = fourcc
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.retrieve_ms = retrieve_ms
+        self.buffer_size = buffer_size
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def __repr__(self):
+        return (f"CaptureProfile({self.backend}, {self.fourcc or 'default'}, "
+                f"{self.width}x{self.height}, {self.fps:.1f}fps, retrieve {self.retrieve_ms:.2f}ms)")
+
+
+def open_capture(device, profile, requested_fps=60):
+    """
+    按配置打开摄像头
+
+    参数:
+        device: 摄像头编号
+        profile: CaptureProfile
+        requested_fps: 向驱动请求的帧率
+    返回:
+        cv.VideoCapture，打开失败时为 None
+    """
+    cap = cv.VideoCapture(device, getattr(cv, profile.backend, cv.CAP_ANY))
+    if not cap.isOpened():
+        cap.release()
+        return None
+    apply_capture_settings(cap, profile.width, profile.height, requested_fps,
+                           profile.fourcc, profile.buffer_size)
+    return cap
+
+
+def apply_capture_settings(cap, width, height, fps, fourcc=None, buffer_size=None):
+    """
+    向驱动请求分辨率、帧率，以及可选的像素格式和内部缓冲深度
+
+    参数:
+        cap: cv.VideoCapture
+        width, height: 请求的分辨率
+        fps: 请求的帧率
+        fourcc: 像素格式，None 表示不设置
+        buffer_size: 驱动内部缓冲帧数，None 表示不设置
+    """
+    # 部分后端要求先设置像素格式再设置分辨率
+    if fourcc:
+        cap.set(cv.CAP_PROP_FOURCC, cv.VideoWriter_fourcc(*fourcc))
+    cap.set(cv.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv.CAP_PROP_FRAME_HEIGHT, height)
+    cap.set(cv.CAP_PROP_FPS, fps)
+    # 驱动内部缓冲越浅，读到的帧越新
+    if buffer_size:
+        cap.set(cv.CAP_PROP_BUFFERSIZE, buffer_size)
+
+
+def _default_capture(device, width, height, fps):
+    # 回退: 默认后端，但仍按请求的分辨率和帧率打开
+    cap = cv.VideoCapture(device)
+    apply_capture_settings(cap, width, height, fps)
+    return cap
+
+
+def probe_capture(cap, probe_frames=30, warmup_frames=5):
+    """
+    计时探测: 实测送帧率和每帧 retrieve 耗时
+
+    返回:
+        (fps, retrieve_ms)，读取失败时为 (0.0, 0.0)
+    """
+    for _ in range(warmup_frames):
+        if not cap.grab():
+            return 0.0, 0.0
+
+    grab_times = []
+    retrieve_total = 0.0
+    for _ in range(probe_frames):
+        if not cap.grab():
+            return 0.0, 0.0
+        grab_times.append(time.perf_counter())
+        retrieve_start = time.perf_counter()
+        ret, _ = cap.retrieve()
+        retrieve_total += time.perf_counter() - retrieve_start
+        if not ret:
+            return 0.0, 0.0
+
+    elapsed = grab_times[-1] - grab_times[0]
+    fps = (len(grab_times) - 1) / elapsed if elapsed > 0 else 0.0
+    return fps, retrieve_total / probe_frames * 1000
+
+
+def _cache_key(device, width, height, fps):
+    return f"{device}:{width}x{height}@{fps}"
+
+
+def _load_cache(cache_path):
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache_path, key, profile_dict, lock_timeout=5.0):
+    """
+    把一个设备的配置合并写入缓存文件
+
+    多个摄像头工作进程可能同时写同一个文件：用锁文件串行化"读取-合并-写入"，
+    并先写临时文件再 os.replace 原子替换，读取方不会看到写了一半的文件。
+    """
+    if not cache_path:
+        return
+    lock_path = cache_path + '.lock'
+    deadline = time.time() + lock_timeout
+    lock_fd = None
+    while lock_fd is None:
+        try:
+            lock_fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if time.time() > deadline:
+                # 持有锁的进程可能已异常退出，清除残留的锁文件
+                try:
+                    os.remove(lock_path)
+                except OSError:
+                    pass
+                deadline = time.time() + lock_timeout
+            time.sleep(0.05)
+        except OSError as e:
+            print(f"保存采集配置缓存失败: {e}")
+            return
+    try:
+        cache = _load_cache(cache_path)
+        cache[key] = profile_dict
+        temp_path = f'{cache_path}.tmp{os.getpid()}'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"保存采集配置缓存失败: {e}")
+    finally:
+        os.close(lock_fd)
+        try:
+            os.remove(lock_path)
+        except OSError:
+            pass
+
+
+def negotiate_capture(device, width, height, fps=60,
+                      cache_path='capture_profiles.json', reprobe=False,
+                      probe_frames=30, fps_tolerance=0.9):
+    """
+    协商摄像头的最低延迟采集模式并按设备缓存
+
+    依次尝试候选后端和像素格式 (MJPG / YUYV / 驱动默认)，内部缓冲设为1，
+    用短时计时探测实测送帧率和解码耗时。在送帧率不低于最佳值 fps_tolerance 倍的配置中
+    选择解码耗时最小的一个。选中的配置写入 cache_path，下次启动直接使用。
+
+    参数:
+        device: 摄像头编号
+        width, height, fps: 请求的分辨率和帧率
+        cache_path: 配置缓存文件，None 表示不缓存
+        reprobe: 忽略缓存重新探测
+        probe_frames: 每个候选配置的计时帧数
+        fps_tolerance: 送帧率容差
+    返回:
+        (cap, profile)，全部候选都失败时回退为按请求分辨率和帧率打开的默认摄像头 (cap, None)
+    """
+    key = _cache_key(device, width, height, fps)
+    cache = _load_cache(cache_path)
+
+    if not reprobe and key in cache:
+        profile = CaptureProfile.from_dict(cache[key])
+        cap = open_capture(device, profile, fps)
+        if cap is not None:
+            print(f"使用缓存的采集配置: {profile}")
+            return cap, profile
+        print("缓存的采集配置无法打开，重新探测")
+
+    results = []
+    for backend_name, _ in _candidate_backends():
+        for fourcc in CANDIDATE_FOURCCS:
+            profile = CaptureProfile(backend_name, fourcc, width, height)
+            cap = open_capture(device, profile, fps)
+            if cap is None:
+                break  # 后端不可用，跳过其他像素格式
+            # 驱动可能不支持请求的格式/分辨率，记录实际值
+            actual_fourcc = _fourcc_to_str(cap.get(cv.CAP_PROP_FOURCC))
+            if fourcc and actual_fourcc and actual_fourcc != fourcc:
+                cap.release()
+                continue
+            profile.width = int(cap.get(cv.CAP_PROP_FRAME_WIDTH))
+            profile.height = int(cap.get(cv.CAP_PROP_FRAME_HEIGHT))
+            profile.fps, profile.retrieve_ms = probe_capture(cap, probe_frames)
+            cap.release()
+            if profile.fps > 0:
+                print(f"探测: {profile}")
+                results.append(profile)
+
+    if not results:
+        print("采集配置探测失败，使用默认设置")
+        return _default_capture(device, width, height, fps), None
+
+    best_fps = max(profile.fps for profile in results)
+    candidates = [profile for profile in results if profile.fps >= best_fps * fps_tolerance]
+    best = min(candidates, key=lambda profile: profile.retrieve_ms)
+
+    cap = open_capture(device, best, fps)
+    if cap is None:
+        return _default_capture(device, width, height, fps), None
+
+    _save_cache(cache_path, key, best.to_dict())
+    print(f"选择采集配置: {best}")
+    return cap, best
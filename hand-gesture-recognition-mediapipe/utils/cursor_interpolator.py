@@ -0,0 +1,70 @@
+from collections import deque
+
+
+class CursorInterpolator(object):
+    """
+    光标插值器：把 30-60Hz 的带时间戳坐标样本插值为显示刷新率的光标位置
+
+    输出位置对应 (当前时间 - delay) 时刻，因此最多增加 delay 秒的延迟；
+    超出最新样本时保持在最新样本位置，不做外推。
+
+    参数:
+        delay: 渲染延迟 (秒)，通常取一个摄像头帧周期
+        mode: 'linear' 线性插值 / 'hermite' 三次Hermite (Catmull-Rom切线) 插值
+        max_samples: 保留的样本数量
+    """
+
+    def __init__(self, delay=0.02, mode='linear', max_samples=8):
+        self._delay = delay
+        self._mode = mode
+        self._samples = deque(maxlen=max_samples)
+
+    def add_sample(self, timestamp, x, y):
+        # 丢弃乱序样本
+        if self._samples and timestamp <= self._samples[-1][0]:
+            return
+        self._samples.append((timestamp, x, y))
+
+    def sample(self, now):
+        """返回 now 时刻应显示的位置 (x, y)，没有样本时返回 None"""
+        if not self._samples:
+            return None
+        render_time = now - self._delay
+        samples = self._samples
+
+        if render_time <= samples[0][0]:
+            return samples[0][1], samples[0][2]
+        if render_time >= samples[-1][0]:
+            return samples[-1][1], samples[-1][2]
+
+        # 找到 render_time 所在的区间 [i, i+1]，样本很少，从最新往回找
+        i = len(samples) - 2
+        while samples[i][0] > render_time:
+            i -= 1
+        t1, x1, y1 = samples[i]
+        t2, x2, y2 = samples[i + 1]
+        u = (render_time - t1) / (t2 - t1)
+
+        if self._mode != 'hermite':
+            return x1 + (x2 - x1) * u, y1 + (y2 - y1) * u
+
+        # Catmull-Rom 切线，边界处退化为割线
+        t0, x0, y0 = samples[i - 1] if i > 0 else samples[i]
+        t3, x3, y3 = samples[i + 2] if i + 2 < len(samples) else samples[i + 1]
+        dt = t2 - t1
+        mx1 = (x2 - x0) / (t2 - t0) * dt if t2 > t0 else x2 - x1
+        my1 = (y2 - y0) / (t2 - t0) * dt if t2 > t0 else y2 - y1
+        mx2 = (x3 - x1) / (t3 - t1) * dt if t3 > t1 else x2 - x1
+        my2 = (y3 - y1) / (t3 - t1) * dt if t3 > t1 else y2 - y1
+
+        u2 = u * u
+        u3 = u2 * u
+        h00 = 2 * u3 - 3 * u2 + 1
+        h10 = u3 - 2 * u2 + u
+        h01 = -2 * u3 + 3 * u2
+        h11 = u3 - u2
+        return (h00 * x1 + h10 * mx1 + h01 * x2 + h11 * mx2,
+                h00 * y1 + h10 * my1 + h01 * y2 + h11 * my2)
+
+    def reset(self):
+        self._samples.clear()
@@ -0,0 +1,182 @@
+import os
+import json
+import hashlib
+import numpy as np
+
+# 编译后的数据集默认存放位置: <cache_dir>/<csv文件名>_<内容哈希前12位>/
+DEFAULT_CACHE_DIR = 'model/dataset_cache'
+
+# 缓存格式版本，编译逻辑改变时加1使旧缓存失效
+CACHE_FORMAT_VERSION = 1
+
+
+def content_hash(csv_path, dedup, near_step):
+    """
+    数据集内容哈希：CSV原始字节 + 编译参数
+
+    CSV 被追加或修改、或去重参数改变时哈希随之改变，对应新的缓存目录
+    """
+    digest = hashlib.sha256()
+    with open(csv_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    digest.update(json.dumps({'version': CACHE_FORMAT_VERSION,
+                              'dedup': bool(dedup),
+                              'near_step': float(near_step)}).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def parse_csv(csv_path):
+    """
+    解析 logging_csv 格式的数据集: [标签编号, 特征...]
+
+    返回:
+        (X float32 [N, D], y int32 [N])
+    """
+    data = np.loadtxt(csv_path, delimiter=',', dtype=np.float32, ndmin=2)
+    if data.size == 0:
+        return np.zeros((0, 0), dtype=np.float32), np.zeros(0, dtype=np.int32)
+    return np.ascontiguousarray(data[:, 1:]), data[:, 0].astype(np.int32)
+
+
+def deduplicate(X, y, near_step=0.0):
+    """
+    去除重复样本，保留每组重复中最先出现的一条
+
+    参数:
+        X, y: 特征和标签
+        near_step: 近似重复的量化步长，特征量化到该网格后相同的同类样本视为重复；
+                   0 表示只去除完全相同的样本
+    返回:
+        保留样本的下标 (按原顺序)
+    """
+    if len(y) == 0:
+        return np.zeros(0, dtype=np.int64)
+    if near_step > 0:
+        keys = np.round(X / near_step).astype(np.int32)
+    else:
+        # +0.0 把 -0.0 归一为 0.0，避免按字节比较时被当作不同样本
+        keys = X + np.float32(0.0)
+    keys = np.concatenate([y[:, None].astype(keys.dtype), keys], axis=1)
+    rows = np.ascontiguousarray(keys).view(np.dtype((np.void, keys.dtype.itemsize * keys.shape[1])))
+    _, first = np.unique(rows.ravel(), return_index=True)
+    return np.sort(first)
+
+
+def stratified_split(y, train_size=0.75, seed=42):
+    """
+    可复现的分层划分：每个类别按相同比例划分训练集和测试集
+
+    参数:
+        y: 标签
+        train_size: 训练集比例
+        seed: 随机种子，相同的数据和种子得到相同的划分
+    返回:
+        (训练集下标, 测试集下标)
+    """
+    rng = np.random.RandomState(seed)
+    train_index = []
+    test_index = []
+    for label in np.unique(y):
+        index = np.flatnonzero(y == label)
+        rng.shuffle(index)
+        # 样本多于一条的类别至少保留一条测试样本
+        train_count = int(round(len(index) * train_size))
+        if len(index) > 1:
+            train_count = min(train_count, len(index) - 1)
+        train_index.append(index[:train_count])
+        test_index.append(index[train_count:])
+    train_index = np.concatenate(train_index) if train_index else np.zeros(0, dtype=np.int64)
+    test_index = np.concatenate(test_index) if test_index else np.zeros(0, dtype=np.int64)
+    rng.shuffle(train_index)
+    rng.shuffle(test_index)
+    return train_index, test_index
+
+
+class CompiledDataset(object):
+    """
+    编译后的数据集
+
+    X 以只读内存映射方式打开，加载几乎不耗时，也不会在多个进程中各复制一份
+
+    属性:
+        X: float32 [N, D] 特征
+        y: int32 [N] 标签
+        info: 编译信息 (来源、哈希、去重前后的样本数、各类别样本数)
+        path: 缓存目录
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.X = np.load(os.path.join(path, 'X.npy'), mmap_mode='r')
+        self.y = np.load(os.path.join(path, 'y.npy'))
+        with open(os.path.join(path, 'info.json'), encoding='utf-8') as f:
+            self.info = json.load(f)
+
+    def __len__(self):
+        return len(self.y)
+
+    def split(self, train_size=0.75, seed=42):
+        """
+        分层划分，返回值顺序与 train_test_split 相同
+
+        返回:
+            (X_train, X_test, y_train, y_test)
+        """
+        train_index, test_index = stratified_split(self.y, train_size, seed)
+        return (self.X[train_index], self.X[test_index],
+                self.y[train_index], self.y[test_index])
+
+
+def compile_dataset(csv_path, cache_dir=DEFAULT_CACHE_DIR, dedup=True, near_step=0.0,
+                    rebuild=False):
+    """
+    把CSV数据集编译为 float32 数组缓存，已有相同内容哈希的缓存时直接打开
+
+    参数:
+        csv_path: logging_csv 格式的数据集
+        cache_dir: 缓存根目录
+        dedup: 是否去除重复样本 (评估用的测试集应保持原样时设为 False)
+        near_step: 近似重复的量化步长，见 deduplicate()
+        rebuild: 忽略已有缓存重新编译
+    返回:
+        CompiledDataset
+    """
+    digest = content_hash(csv_path, dedup, near_step)
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    path = os.path.join(cache_dir, f'{name}_{digest[:12]}')
+    if not rebuild and os.path.exists(os.path.join(path, 'info.json')):
+        return CompiledDataset(path)
+
+    X, y = parse_csv(csv_path)
+    row_total = len(y)
+    if dedup:
+        keep = deduplicate(X, y, near_step)
+        X, y = X[keep], y[keep]
+
+    labels, counts = np.unique(y, return_counts=True)
+    info = {
+        'source': os.path.abspath(csv_path),
+        'sha256': digest,
+        'dedup': bool(dedup),
+        'near_step': float(near_step),
+        'rows': row_total,
+        'samples': int(len(y)),
+        'feature_size': int(X.shape[1]),
+        'class_counts': {str(label): int(count) for label, count in zip(labels, counts)},
+    }
+
+    # 先写入临时目录再改名，编译中断时不会留下不完整的缓存
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = f'{path}.tmp{os.getpid()}'
+    os.makedirs(temp_path, exist_ok=True)
+    np.save(os.path.join(temp_path, 'X.npy'), np.ascontiguousarray(X, dtype=np.float32))
+    np.save(os.path.join(temp_path, 'y.npy'), y.astype(np.int32))
+    with open(os.path.join(temp_path, 'info.json'), 'w', encoding='utf-8') as f:
+        json.dump(info, f, ensure_ascii=False, indent=4)
+    if os.path.exists(path):
+        for file_name in os.listdir(path):
+            os.remove(os.path.join(path, file_name))
+        os.rmdir(path)
+    os.rename(temp_path, path)
+    return CompiledDataset(path)
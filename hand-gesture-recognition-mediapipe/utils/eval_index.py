@@ -0,0 +1,197 @@
+import os
+import re
+import json
+import sqlite3
+
+# 评估目录命名: eval_<类型>_<日期>_<时间>[_<arch>[_<序号>]]
+EVAL_DIR_PATTERN = re.compile(r'^eval_(.+?)_(\d{8})_(\d{6})(?:_([^_]+))?(?:_\d+)?$')
+
+# 可用于排序和回退检测的整体指标
+METRICS = ('accuracy', 'recall', 'precision', 'f1_score')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_dir TEXT UNIQUE NOT NULL,
+    mtime REAL NOT NULL,
+    model_type TEXT NOT NULL,
+    arch TEXT NOT NULL,
+    dataset TEXT NOT NULL,
+    evaluated_at TEXT NOT NULL,
+    sample_total INTEGER,
+    accuracy REAL,
+    recall REAL,
+    precision REAL,
+    f1_score REAL
+);
+CREATE INDEX IF NOT EXISTS runs_by_dataset ON runs (model_type, dataset, evaluated_at);
+CREATE TABLE IF NOT EXISTS class_metrics (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    label TEXT NOT NULL,
+    sample_count INTEGER,
+    precision REAL,
+    recall REAL,
+    f1_score REAL,
+    PRIMARY KEY (run_id, label)
+);
+'''
+
+
+def normalize_dataset(csv_path):
+    # 评估结果中的相对路径可能来自 Windows，统一为 '/' 分隔
+    return csv_path.replace('\\', '/')
+
+
+class EvaluationIndex(object):
+    """
+    evaluation/ 目录下评估结果的 SQLite 索引
+
+    update() 只读取新增或修改过的 evaluation_results.json，之后的查询都在索引上完成，
+    不再逐个打开评估目录。
+
+    参数:
+        db_path: 索引文件路径
+    """
+
+    def __init__(self, db_path='evaluation/index.sqlite'):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(db_path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def update(self, eval_root='evaluation'):
+        """
+        增量扫描评估目录
+
+        返回:
+            (新增或更新的评估数, 已删除的评估数)
+        """
+        known = {row['run_dir']: row['mtime'] for row in
+                 self.connection.execute('SELECT run_dir, mtime FROM runs')}
+        seen = set()
+        updated = 0
+        for run_dir in sorted(os.listdir(eval_root)) if os.path.isdir(eval_root) else []:
+            match = EVAL_DIR_PATTERN.match(run_dir)
+            results_path = os.path.join(eval_root, run_dir, 'evaluation_results.json')
+            if match is None or not os.path.exists(results_path):
+                continue
+            seen.add(run_dir)
+            mtime = os.path.getmtime(results_path)
+            if known.get(run_dir) == mtime:
+                continue
+            try:
+                with open(results_path, encoding='utf-8') as f:
+                    results = json.load(f)
+            except ValueError:
+                print(f"跳过无法解析的评估结果: {results_path}")
+                continue
+            self._insert(run_dir, mtime, match, results)
+            updated += 1
+
+        removed = [run_dir for run_dir in known if run_dir not in seen]
+        self.connection.executemany('DELETE FROM runs WHERE run_dir = ?',
+                                    [(run_dir, ) for run_dir in removed])
+        self.connection.commit()
+        return updated, len(removed)
+
+    def _insert(self, run_dir, mtime, match, results):
+        model_type, date, time_of_day, arch = match.groups()
+        evaluated_at = results.get('evaluation_time') or (
+            f'{date[:4]}-{date[4:6]}-{date[6:]} '
+            f'{time_of_day[:2]}:{time_of_day[2:4]}:{time_of_day[4:]}')
+        self.connection.execute('DELETE FROM runs WHERE run_dir = ?', (run_dir, ))
+        cursor = self.connection.execute(
+            'INSERT INTO runs (run_dir, mtime, model_type, arch, dataset, evaluated_at, '
+            'sample_total, accuracy, recall, precision, f1_score) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (run_dir, mtime, results.get('model_type', model_type), arch or '',
+             normalize_dataset(results.get('csv_relative_path', '')), evaluated_at,
+             results.get('sample_total'), results.get('accuracy'), results.get('recall'),
+             results.get('precision'), results.get('f1_score')))
+        self.connection.executemany(
+            'INSERT INTO class_metrics (run_id, label, sample_count, precision, recall, f1_score) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            [(cursor.lastrowid, label, metrics.get('sample_count'), metrics.get('precision'),
+              metrics.get('recall'), metrics.get('f1_score'))
+             for label, metrics in results.get('class_metrics', {}).items()])
+
+    def trend(self, model_type, dataset=None, arch=None):
+        """
+        按时间排列的评估记录，包含各类别的 F1
+
+        返回:
+            [(run 行, {类别: F1}), ...]
+        """
+        runs = self._select_runs(model_type, dataset, arch, 'evaluated_at, run_dir')
+        return [(run, self.class_f1(run['id'])) for run in runs]
+
+    def best(self, model_type, dataset=None, metric='f1_score'):
+        """每个数据集上指定指标最高的评估记录"""
+        if metric not in METRICS:
+            raise ValueError(f'unknown metric: {metric}')
+        query = (f'SELECT * FROM runs AS r WHERE model_type = ? AND id = ('
+                 f'SELECT id FROM runs WHERE model_type = r.model_type AND dataset = r.dataset '
+                 f'ORDER BY {metric} DESC, evaluated_at DESC LIMIT 1)')
+        parameters = [model_type]
+        if dataset is not None:
+            query += ' AND dataset = ?'
+            parameters.append(normalize_dataset(dataset))
+        return self.connection.execute(query + ' ORDER BY dataset', parameters).fetchall()
+
+    def regressions(self, model_type=None, threshold=0.01, metric='f1_score'):
+        """
+        回退检测：同一类型、同一数据集、同一 arch 的相邻两次评估，
+        整体指标或任一类别的 F1 下降超过 threshold 时记为回退
+
+        返回:
+            [(上一次 run 行, 本次 run 行, [(项目, 上一次值, 本次值), ...]), ...]
+        """
+        if metric not in METRICS:
+            raise ValueError(f'unknown metric: {metric}')
+        query = ('SELECT id, LAG(id) OVER (PARTITION BY model_type, dataset, arch '
+                 'ORDER BY evaluated_at, run_dir) AS previous_id FROM runs')
+        parameters = []
+        if model_type is not None:
+            query += ' WHERE model_type = ?'
+            parameters.append(model_type)
+        flagged = []
+        for row in self.connection.execute(query, parameters).fetchall():
+            if row['previous_id'] is None:
+                continue
+            previous = self._run(row['previous_id'])
+            current = self._run(row['id'])
+            drops = []
+            if previous[metric] - current[metric] > threshold:
+                drops.append((metric, previous[metric], current[metric]))
+            previous_f1 = self.class_f1(previous['id'])
+            for label, f1 in self.class_f1(current['id']).items():
+                if label in previous_f1 and previous_f1[label] - f1 > threshold:
+                    drops.append((f'F1[{label}]', previous_f1[label], f1))
+            if drops:
+                flagged.append((previous, current, drops))
+        flagged.sort(key=lambda item: item[1]['evaluated_at'])
+        return flagged
+
+    def class_f1(self, run_id):
+        return {row['label']: row['f1_score'] for row in self.connection.execute(
+            'SELECT label, f1_score FROM class_metrics WHERE run_id = ?', (run_id, ))}
+
+    def _run(self, run_id):
+        return self.connection.execute('SELECT * FROM runs WHERE id = ?', (run_id, )).fetchone()
+
+    def _select_runs(self, model_type, dataset, arch, order):
+        query = 'SELECT * FROM runs WHERE model_type = ?'
+        parameters = [model_type]
+        if dataset is not None:
+            query += ' AND dataset = ?'
+            parameters.append(normalize_dataset(dataset))
+        if arch is not None:
+            query += ' AND arch = ?'
+            parameters.append(str(arch))
+        return self.connection.execute(f'{query} ORDER BY {order}', parameters).fetchall()
@@ -0,0 +1,118 @@
+import threading
+import numpy as np
+import cv2 as cv
+
+
+class FramePool(object):
+    """
+    采集->推理路径的预分配帧缓冲池
+
+    cap.read()、颜色转换和调试图像翻转都写入复用的数组，稳定运行时每帧不再分配新的整帧内存。
+    调试图像缓冲只在有窗口显示时分配，窗口关闭后释放。
+
+    注意: 每个采集槽在 num_slots 帧之后会被覆盖，需要更长时间保存时请自行复制。
+    流水线模式下同时有多帧在处理中，num_slots 应为在途帧数 + 1。
+    在途帧数不固定时 (例如异步推理后端)，用 pin() 锁定仍被引用的帧，read() 会跳过
+    被锁定的槽，所有槽都被锁定时新增一个槽。
+
+    参数:
+        width, height: 预期的帧尺寸 (驱动实际返回的尺寸不同时会自动重新分配)
+        num_slots: 采集/RGB缓冲槽数量
+    """
+
+    def __init__(self, width, height, num_slots=1):
+        self._captures = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(num_slots)]
+        self._rgbs = [np.empty_like(capture) for capture in self._captures]
+        self._slot = num_slots - 1
+        self._debug = None
+        self._pins = [0] * num_slots
+        self._pin_lock = threading.Lock()  # 异步后端可能在回调线程中 unpin()
+        self.reallocations = 0  # 帧尺寸变化导致的重新分配次数
+
+    def read(self, cap):
+        """
+        读取一帧到采集缓冲
+
+        参数:
+            cap: cv.VideoCapture
+        返回:
+            (ret, frame)，frame 为复用的采集缓冲
+        """
+        with self._pin_lock:
+            slot_total = len(self._captures)
+            for step in range(1, slot_total + 1):
+                slot = (self._slot + step) % slot_total
+                if self._pins[slot] == 0:
+                    break
+            else:
+                # 所有槽都被锁定，新增一个槽
+                self._captures.append(np.empty_like(self._captures[self._slot]))
+                self._rgbs.append(np.empty_like(self._captures[-1]))
+                self._pins.append(0)
+                slot = slot_total
+                self.reallocations += 1
+            self._slot = slot
+        capture = self._captures[self._slot]
+        ret, frame = cap.read(capture)
+        if not ret:
+            return ret, None
+        if frame is not capture:
+            # 尺寸或类型与缓冲不一致时 OpenCV 会新分配数组，之后改用新数组作为缓冲
+            if frame.shape != capture.shape:
+                self._rgbs[self._slot] = np.empty_like(frame)
+                self.reallocations += 1
+            self._captures[self._slot] = frame
+        return ret, frame
+
+    def _find_slot(self, frame):
+        for index, capture in enumerate(self._captures):
+            if capture is frame:
+                return index
+        return None
+
+    def pin(self, frame):
+        """锁定 frame 所在的槽，unpin() 之前 read() 不会覆盖它"""
+        with self._pin_lock:
+            slot = self._find_slot(frame)
+            if slot is not None:
+                self._pins[slot] += 1
+
+    def unpin(self, frame):
+        """解除 pin() 的锁定"""
+        with self._pin_lock:
+            slot = self._find_slot(frame)
+            if slot is not None and self._pins[slot] > 0:
+                self._pins[slot] -= 1
+
+    def to_rgb(self, frame):
+        """BGR -> RGB，写入该采集槽对应的RGB缓冲并返回它"""
+        slot = self._slot
+        for index, capture in enumerate(self._captures):
+            if capture is frame:
+                slot = index
+                break
+        rgb = self._rgbs[slot]
+        if rgb.shape != frame.shape:
+            rgb = self._rgbs[slot] = np.empty_like(frame)
+        cv.cvtColor(frame, cv.COLOR_BGR2RGB, dst=rgb)
+        return rgb
+
+    def debug_view(self, frame, mirror=True):
+        """
+        生成调试图像 (默认水平镜像)，写入复用的调试缓冲并返回它
+
+        参数:
+            frame: 采集到的BGR帧
+            mirror: 是否水平镜像
+        """
+        if self._debug is None or self._debug.shape != frame.shape:
+            self._debug = np.empty_like(frame)
+        if mirror:
+            cv.flip(frame, 1, dst=self._debug)
+        else:
+            np.copyto(self._debug, frame)
+        return self._debug
+
+    def release_debug(self):
+        """窗口关闭时释放调试缓冲"""
+        self._debug = None
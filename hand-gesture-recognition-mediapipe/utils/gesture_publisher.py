@@ -0,0 +1,169 @@
+import json
+import time
+import struct
+import asyncio
+
+# 二进制格式: 序号, 时间戳, x, y, 手势, 手指手势 (小端, 字符串按16字节截断/补零)
+BINARY_PACKET_FORMAT = '<Idff16s16s'
+
+# asyncio 发送缓冲区上限 (字节)，超过后丢弃数据而不是排队
+MAX_WRITE_BUFFER = 64 * 1024
+
+
+def encode_packet(data, packet_format, seq=0):
+    """按订阅者格式编码数据包，data 为 udp_sender_process 使用的字典"""
+    if packet_format == 'binary':
+        return struct.pack(BINARY_PACKET_FORMAT,
+                           seq & 0xFFFFFFFF,
+                           data.get("timestamp", 0.0),
+                           data["x"], data["y"],
+                           data["hand_gesture"].encode('utf-8')[:16],
+                           data["finger_gesture"].encode('utf-8')[:16])
+    return json.dumps(data).encode('utf-8')
+
+
+def decode_binary_packet(payload):
+    """二进制数据包的参考解码"""
+    seq, timestamp, x, y, hand_gesture, finger_gesture = struct.unpack(BINARY_PACKET_FORMAT, payload)
+    return {
+        "seq": seq,
+        "timestamp": timestamp,
+        "x": x,
+        "y": y,
+        "hand_gesture": hand_gesture.rstrip(b'\0').decode('utf-8'),
+        "finger_gesture": finger_gesture.rstrip(b'\0').decode('utf-8'),
+    }
+
+
+class Subscriber(object):
+    """
+    单个订阅者的状态
+
+    参数:
+        addr: 订阅者地址 (host, port)
+        rate: 最大发送频率 (Hz)，0表示每个新样本都发送
+        packet_format: 'json' / 'binary'
+        permanent: 是否为固定订阅者 (不会因超时被移除)
+    """
+
+    def __init__(self, addr, rate=0, packet_format='json', permanent=False):
+        self.addr = addr
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.packet_format = packet_format
+        self.permanent = permanent
+        self.last_seen = time.monotonic()
+        self.last_sent = 0.0
+        self.sent_seq = -1
+
+
+class _ControlProtocol(asyncio.DatagramProtocol):
+    def __init__(self, publisher):
+        self._publisher = publisher
+
+    def datagram_received(self, data, addr):
+        self._publisher.handle_control(data, addr)
+
+    def error_received(self, exc):
+        # 订阅者端口关闭等错误 (ICMP) 不影响其他订阅者
+        pass
+
+
+class GesturePublisher(object):
+    """
+    基于 asyncio 的手势数据发布器
+
+    订阅者向控制端口发送 JSON 注册消息:
+        {"cmd": "subscribe", "rate": 30, "format": "binary"}
+    之后需要在 timeout 秒内重复发送 (心跳)，否则会被移除；发送 {"cmd": "unsubscribe"} 主动退出。
+    发送使用非阻塞 UDP，某个订阅者处理慢不会影响其他订阅者。
+
+    参数:
+        control_port: 控制端口 (同时作为发送端口)
+        control_host: 控制端口绑定的地址，默认只接受本机订阅者；
+                      绑定 0.0.0.0 时局域网内任意主机 (包括伪造的源地址) 都可以注册订阅
+        static_targets: 固定订阅者地址列表，例如 Qt 游戏 [('127.0.0.1', 12345)]
+        timeout: 订阅者心跳超时 (秒)
+    """
+
+    def __init__(self, control_port=12346, static_targets=(), timeout=5.0,
+                 control_host='127.0.0.1'):
+        self._control_port = control_port
+        self._control_host = control_host
+        self._timeout = timeout
+        self._transport = None
+        self._subscribers = {}
+        for addr in static_targets:
+            self._subscribers[tuple(addr)] = Subscriber(tuple(addr), permanent=True)
+        self._latest = None
+        self._seq = 0
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _ControlProtocol(self),
+            local_addr=(self._control_host, self._control_port))
+
+    def handle_control(self, data, addr):
+        try:
+            message = json.loads(data.decode('utf-8'))
+        except ValueError:
+            return
+        if not isinstance(message, dict):
+            return
+
+        cmd = message.get("cmd", "subscribe")
+        if cmd == "unsubscribe":
+            subscriber = self._subscribers.get(addr)
+            if subscriber is not None and not subscriber.permanent:
+                del self._subscribers[addr]
+            return
+
+        subscriber = self._subscribers.get(addr)
+        if subscriber is None or "rate" in message or "format" in message:
+            permanent = subscriber.permanent if subscriber is not None else False
+            subscriber = Subscriber(addr,
+                                    rate=float(message.get("rate", 0)),
+                                    packet_format=message.get("format", "json"),
+                                    permanent=permanent)
+            self._subscribers[addr] = subscriber
+            print(f"新订阅者: {addr}, 频率: {message.get('rate', 0)}, 格式: {subscriber.packet_format}")
+        subscriber.last_seen = time.monotonic()
+
+    def publish(self, data):
+        """发布新的状态，立即发送给不受频率限制的订阅者"""
+        self._latest = data
+        self._seq += 1
+        self.flush()
+
+    def flush(self):
+        """向到达发送时间且尚未收到最新状态的订阅者发送数据，并移除超时订阅者"""
+        if self._transport is None:
+            return
+        now = time.monotonic()
+        for addr, subscriber in list(self._subscribers.items()):
+            if not subscriber.permanent and now - subscriber.last_seen > self._timeout:
+                del self._subscribers[addr]
+                print(f"订阅者超时已移除: {addr}")
+                continue
+            if self._latest is None or subscriber.sent_seq == self._seq:
+                continue
+            if now - subscriber.last_sent < subscriber.interval:
+                continue
+            # 内核发送缓冲区已满时丢弃本次数据，不在内存中堆积
+            if self._transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                continue
+            self._transport.sendto(encode_packet(self._latest, subscriber.packet_format, self._seq), addr)
+            subscriber.last_sent = now
+            subscriber.sent_seq = self._seq
+
+    def broadcast(self, data):
+        """不受频率限制地发送给所有订阅者 (用于退出消息)"""
+        if self._transport is None:
+            return
+        for subscriber in self._subscribers.values():
+            self._transport.sendto(encode_packet(data, subscriber.packet_format, self._seq), subscriber.addr)
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
@@ -0,0 +1,78 @@
+from collections import deque
+
+
+class GestureVote(object):
+    """
+    手势滑动窗口投票器（增量计数 + 迟滞）
+
+    替代每帧 Counter(history).most_common()：手势ID进出窗口时以O(1)更新各类计数，
+    只有当新的多数手势占比达到 min_ratio 且连续保持 min_dwell 帧后才切换输出结果，
+    减少输出手势的抖动。
+
+    参数:
+        window_len: 投票窗口长度（帧）
+        min_ratio: 切换所需的最小多数占比 (0-1)
+        min_dwell: 切换前候选手势需要连续领先的帧数
+        default_id: 初始输出的手势ID
+    """
+
+    def __init__(self, window_len=16, min_ratio=0.5, min_dwell=3, default_id=0):
+        self._history = deque()
+        self._window_len = window_len
+        self._min_ratio = min_ratio
+        self._min_dwell = max(1, min_dwell)
+        self._default_id = default_id
+
+        self._counts = {}
+        self._leader = default_id
+        self._current = default_id
+        self._candidate = None
+        self._dwell = 0
+
+    def update(self, gesture_id):
+        # 新手势进入窗口
+        self._history.append(gesture_id)
+        self._counts[gesture_id] = self._counts.get(gesture_id, 0) + 1
+        if self._counts[gesture_id] > self._counts.get(self._leader, 0):
+            self._leader = gesture_id
+
+        # 最旧的手势离开窗口
+        if len(self._history) > self._window_len:
+            old_id = self._history.popleft()
+            self._counts[old_id] -= 1
+            if self._counts[old_id] == 0:
+                del self._counts[old_id]
+            if old_id == self._leader:
+                # 类别数很少，仅在领先者减少时重新扫描
+                self._leader = max(self._counts, key=self._counts.get)
+
+        # 迟滞判断：候选手势需占多数并持续领先若干帧
+        leader_count = self._counts.get(self._leader, 0)
+        if (self._leader != self._current
+                and leader_count > self._counts.get(self._current, 0)
+                and leader_count >= self._min_ratio * len(self._history)):
+            if self._leader == self._candidate:
+                self._dwell += 1
+            else:
+                self._candidate = self._leader
+                self._dwell = 1
+            if self._dwell >= self._min_dwell:
+                self._current = self._leader
+                self._candidate = None
+                self._dwell = 0
+        else:
+            self._candidate = None
+            self._dwell = 0
+
+        return self._current
+
+    def get(self):
+        return self._current
+
+    def reset(self):
+        self._history.clear()
+        self._counts.clear()
+        self._leader = self._default_id
+        self._current = self._default_id
+        self._candidate = None
+        self._dwell = 0
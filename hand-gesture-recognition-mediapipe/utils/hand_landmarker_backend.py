@@ -0,0 +1,138 @@
+import queue
+import threading
+from types import SimpleNamespace
+
+# 官方模型下载地址，--landmarker_model 指向的文件不存在时提示
+HAND_LANDMARKER_MODEL_URL = ('https://storage.googleapis.com/mediapipe-models/hand_landmarker/'
+                             'hand_landmarker/float16/latest/hand_landmarker.task')
+
+
+def to_legacy_results(result):
+    """
+    把 HandLandmarkerResult 转换为与 mp.solutions.hands 相同结构的结果对象，
+    主循环中的 results.multi_hand_landmarks / results.multi_handedness 处理代码无需修改
+    """
+    if not result.hand_landmarks:
+        return SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+    return SimpleNamespace(
+        multi_hand_landmarks=[SimpleNamespace(landmark=landmarks)
+                              for landmarks in result.hand_landmarks],
+        multi_handedness=[SimpleNamespace(classification=[
+                              SimpleNamespace(label=categories[0].category_name,
+                                              score=categories[0].score)])
+                          for categories in result.handedness],
+    )
+
+
+class TasksHandsBackend(object):
+    """
+    基于 MediaPipe Tasks HandLandmarker 的手部检测后端
+
+    running_mode='live_stream' 时 submit() 立即返回，推理在 MediaPipe 内部线程中进行，
+    结果通过回调放入队列，主循环用 poll() 取回，采集不再被推理阻塞。
+    推理忙时 MediaPipe 会丢弃新帧且不回调，对应的上下文在收到更新的结果时清理。
+    running_mode='video' 时 process() 同步返回结果，用于与旧后端逐帧对比。
+
+    参数:
+        model_path: hand_landmarker.task 模型文件
+        max_num_hands: 最多检测的手数
+        min_detection_confidence, min_tracking_confidence: 置信度阈值
+        running_mode: 'live_stream' / 'video'
+        max_in_flight: 在途帧数上限，超过时 submit() 直接丢弃新帧
+        on_drop: 已提交的帧被 MediaPipe 丢弃时以其上下文调用 (在回调线程中)，
+                 用于释放上下文引用的缓冲
+    """
+
+    def __init__(self, model_path, max_num_hands=1, min_detection_confidence=0.5,
+                 min_tracking_confidence=0.5, running_mode='live_stream', max_in_flight=2,
+                 on_drop=None):
+        import mediapipe as mp
+        from mediapipe.tasks import python as mp_tasks
+        from mediapipe.tasks.python import vision
+
+        self._mp = mp
+        self._live = running_mode == 'live_stream'
+        self._max_in_flight = max_in_flight
+        self._on_drop = on_drop
+        self._contexts = {}
+        self._lock = threading.Lock()
+        self._results = queue.Queue()
+        self._last_timestamp = -1
+        self.dropped = 0  # 推理忙时被丢弃的帧数
+
+        options = vision.HandLandmarkerOptions(
+            base_options=mp_tasks.BaseOptions(model_asset_path=model_path),
+            running_mode=(vision.RunningMode.LIVE_STREAM if self._live
+                          else vision.RunningMode.VIDEO),
+            num_hands=max_num_hands,
+            min_hand_detection_confidence=min_detection_confidence,
+            min_hand_presence_confidence=min_tracking_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            result_callback=self._on_result if self._live else None,
+        )
+        self._landmarker = vision.HandLandmarker.create_from_options(options)
+
+    def _timestamp_ms(self, capture_time):
+        # MediaPipe 要求时间戳严格递增
+        timestamp = max(int(capture_time * 1000), self._last_timestamp + 1)
+        self._last_timestamp = timestamp
+        return timestamp
+
+    def _to_image(self, rgb):
+        return self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=rgb)
+
+    def _on_result(self, result, output_image, timestamp_ms):
+        with self._lock:
+            context = self._contexts.pop(timestamp_ms, None)
+            # 比该结果更早、仍未回调的帧已被 MediaPipe 丢弃
+            dropped_contexts = [self._contexts.pop(t) for t in
+                                sorted(t for t in self._contexts if t < timestamp_ms)]
+            self.dropped += len(dropped_contexts)
+        if self._on_drop is not None:
+            for dropped_context in dropped_contexts:
+                self._on_drop(dropped_context)
+        if context is not None:
+            self._results.put((context, to_legacy_results(result)))
+
+    def submit(self, rgb, capture_time, context=None):
+        """
+        异步提交一帧 (live_stream)
+
+        参数:
+            rgb: RGB图像 (MediaPipe 会复制数据，调用返回后缓冲可以复用)
+            capture_time: 采集时间 (秒)
+            context: 随结果返回的上下文，例如 (原帧, 采集时间)
+        返回:
+            是否已提交
+        """
+        with self._lock:
+            if len(self._contexts) >= self._max_in_flight:
+                self.dropped += 1
+                return False
+            timestamp = self._timestamp_ms(capture_time)
+            self._contexts[timestamp] = context
+        self._landmarker.detect_async(self._to_image(rgb), timestamp)
+        return True
+
+    def poll(self, timeout=0.0):
+        """
+        取回一个已完成的结果，按提交顺序返回
+
+        返回:
+            (context, results)，没有已完成的结果时返回 None
+        """
+        try:
+            if timeout > 0:
+                return self._results.get(timeout=timeout)
+            return self._results.get_nowait()
+        except queue.Empty:
+            return None
+
+    def process(self, rgb, capture_time):
+        """同步处理一帧 (video)，返回与 mp.solutions.hands 相同结构的结果"""
+        result = self._landmarker.detect_for_video(self._to_image(rgb),
+                                                   self._timestamp_ms(capture_time))
+        return to_legacy_results(result)
+
+    def close(self):
+        self._landmarker.close()
@@ -0,0 +1,108 @@
+from collections import deque
+
+from utils.gesture_vote import GestureVote
+from utils.pose_gate import PoseChangeGate
+
+
+class HandTrack(object):
+    """
+    单只手的跟踪状态：每只手拥有独立的滤波历史、轨迹历史和手势投票器
+
+    参数:
+        track_id: 跟踪ID
+        handedness: 左右手标签 ('Left' / 'Right')
+        history_length: 轨迹历史长度
+        vote_kwargs: 传给 GestureVote 的参数
+        gate_kwargs: 传给 PoseChangeGate 的参数
+    """
+
+    def __init__(self, track_id, handedness, history_length=16, vote_kwargs=None,
+                 gate_kwargs=None):
+        self.track_id = track_id
+        self.handedness = handedness
+        self.wrist_point = None
+        self.missed = 0
+
+        self.positions_history = []  # 坐标滤波历史
+        self.point_history = deque(maxlen=history_length)  # 指尖轨迹历史
+        self.finger_gesture_vote = GestureVote(window_len=history_length,
+                                               **(vote_kwargs or {}))
+        self.pose_gate = PoseChangeGate(**(gate_kwargs or {}))  # 姿态不变时复用关键点分类结果
+
+        self.last_valid_position = (0.5, 0.5)  # 归一化坐标 (0-1)
+        self.hand_gesture = ""
+        self.finger_gesture = "None"
+
+
+class HandTracker(object):
+    """
+    简单的多手跟踪器：按左右手标签和手腕距离把每帧的检测结果匹配到已有的跟踪ID
+
+    参数:
+        max_distance: 同一只手相邻两帧手腕点允许的最大移动距离（像素）
+        max_missed: 跟踪丢失多少帧后删除
+        history_length: 每只手的轨迹历史长度
+        vote_kwargs: 传给 GestureVote 的参数
+        gate_kwargs: 传给 PoseChangeGate 的参数
+    """
+
+    def __init__(self, max_distance=200, max_missed=30, history_length=16,
+                 vote_kwargs=None, gate_kwargs=None):
+        self._max_distance = max_distance
+        self._max_missed = max_missed
+        self._history_length = history_length
+        self._vote_kwargs = vote_kwargs
+        self._gate_kwargs = gate_kwargs
+        self._tracks = []
+        self._next_id = 0
+
+    def update(self, detections):
+        """
+        参数:
+            detections: [(handedness, wrist_point), ...]
+
+        返回:
+            与 detections 顺序一致的 HandTrack 列表
+        """
+        unmatched = list(self._tracks)
+        matched = []
+        for handedness, wrist_point in detections:
+            best_track = None
+            best_distance = self._max_distance
+            for track in unmatched:
+                if track.handedness != handedness:
+                    continue
+                if track.wrist_point is None:
+                    distance = 0
+                else:
+                    distance = max(abs(track.wrist_point[0] - wrist_point[0]),
+                                   abs(track.wrist_point[1] - wrist_point[1]))
+                if distance <= best_distance:
+                    best_track = track
+                    best_distance = distance
+
+            if best_track is None:
+                best_track = HandTrack(self._next_id, handedness,
+                                       self._history_length, self._vote_kwargs,
+                                       self._gate_kwargs)
+                self._next_id += 1
+                self._tracks.append(best_track)
+            else:
+                unmatched.remove(best_track)
+
+            best_track.wrist_point = wrist_point
+            best_track.missed = 0
+            matched.append(best_track)
+
+        # 本帧未出现的手：轨迹中补空点，超时后删除
+        for track in unmatched:
+            track.missed += 1
+            track.point_history.append([0, 0])
+            track.pose_gate.reset()
+            if track.missed > self._max_missed:
+                self._tracks.remove(track)
+
+        return matched
+
+    def tracks(self):
+        return list(self._tracks)
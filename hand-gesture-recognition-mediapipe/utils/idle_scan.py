@@ -0,0 +1,112 @@
+import time
+import numpy as np
+import cv2 as cv
+
+
+class IdleScanner(object):
+    """
+    无手时的省电扫描模式
+
+    连续 idle_after 秒没有检测到手后进入空闲状态：主循环按 scan_rate 降频，
+    只在缩小到 scan_scale 的图像上做检测扫描；可选用帧差运动检测作为门控，
+    画面静止时连扫描都跳过。扫描发现手后立即恢复全分辨率、全帧率跟踪。
+
+    参数:
+        idle_after: 无手多少秒后进入空闲状态，0表示禁用
+        scan_rate: 空闲状态下的扫描频率 (Hz)
+        scan_scale: 扫描图像相对原图的缩放比例
+        motion_threshold: 运动门控阈值 (灰度平均绝对差)，0表示不使用运动门控
+        force_scan_interval: 运动门控下的强制扫描间隔 (秒)，防止静止的手一直检测不到
+    """
+
+    # 运动检测使用的小图尺寸
+    MOTION_SIZE = (80, 45)
+
+    def __init__(self, idle_after=3.0, scan_rate=5.0, scan_scale=0.5,
+                 motion_threshold=0.0, force_scan_interval=1.0):
+        self._idle_after = idle_after
+        self._scan_interval = 1.0 / scan_rate if scan_rate > 0 else 0.0
+        self._scan_scale = scan_scale
+        self._motion_threshold = motion_threshold
+        self._force_scan_interval = force_scan_interval
+
+        self._last_hand_time = time.perf_counter()
+        self._next_scan_time = 0.0
+        self._last_scan_time = 0.0
+        self._scan_buffer = None
+        self._motion_small = None
+        self._motion_gray = None
+        self._motion_reference = None
+        self.idle = False
+
+    def update(self, hand_present, now):
+        """
+        每帧更新手的检测状态，返回是否处于空闲状态
+
+        参数:
+            hand_present: 本帧是否检测到手
+            now: 当前时间 (time.perf_counter)
+        """
+        if hand_present:
+            self._last_hand_time = now
+            if self.idle:
+                self.idle = False
+                print("检测到手，恢复全速跟踪")
+        elif (not self.idle and self._idle_after > 0
+              and now - self._last_hand_time > self._idle_after):
+            self.idle = True
+            self._motion_reference = None
+            self._next_scan_time = now
+            print("长时间未检测到手，进入空闲扫描模式")
+        return self.idle
+
+    def wait_next_scan(self):
+        """空闲状态下休眠到下一次扫描时间"""
+        if not self.idle:
+            return
+        delay = self._next_scan_time - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _motion_detected(self, frame, now):
+        if self._motion_threshold <= 0:
+            return True
+        if self._motion_small is None:
+            width, height = self.MOTION_SIZE
+            self._motion_small = np.empty((height, width, 3), dtype=np.uint8)
+            self._motion_gray = np.empty((height, width), dtype=np.uint8)
+        cv.resize(frame, self.MOTION_SIZE, dst=self._motion_small, interpolation=cv.INTER_AREA)
+        cv.cvtColor(self._motion_small, cv.COLOR_BGR2GRAY, dst=self._motion_gray)
+
+        if self._motion_reference is None:
+            self._motion_reference = self._motion_gray.copy()
+            return True
+        motion = cv.absdiff(self._motion_gray, self._motion_reference).mean()
+        np.copyto(self._motion_reference, self._motion_gray)
+        if motion >= self._motion_threshold:
+            return True
+        # 运动门控下仍定期强制扫描一次
+        return now - self._last_scan_time >= self._force_scan_interval
+
+    def scan_image(self, frame, now):
+        """
+        空闲状态下生成用于检测扫描的小尺寸RGB图像
+
+        参数:
+            frame: 采集到的BGR帧
+            now: 当前时间 (time.perf_counter)
+        返回:
+            缩小后的RGB图像 (复用缓冲)，运动门控跳过本次扫描时返回 None
+        """
+        self._next_scan_time = now + self._scan_interval
+        if not self._motion_detected(frame, now):
+            return None
+        self._last_scan_time = now
+
+        height = max(1, int(frame.shape[0] * self._scan_scale))
+        width = max(1, int(frame.shape[1] * self._scan_scale))
+        if self._scan_buffer is None or self._scan_buffer.shape[:2] != (height, width):
+            self._scan_buffer = np.empty((height, width, 3), dtype=np.uint8)
+        small = cv.resize(frame, (width, height), interpolation=cv.INTER_AREA)
+        cv.cvtColor(small, cv.COLOR_BGR2RGB, dst=self._scan_buffer)
+        return self._scan_buffer
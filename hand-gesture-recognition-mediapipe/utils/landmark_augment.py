@@ -0,0 +1,136 @@
+import numpy as np
+
+# 各类数据的默认增强幅度 (参数为 None 时使用)
+# 轨迹特征是像素位移除以画面尺寸，量级远小于归一化的关键点；Stop 等静止类别
+# 只靠极小的位移区分，因此轨迹的横纵比和错切变化取得更小，噪声按样本幅度缩放
+AUGMENT_DEFAULTS = {
+    'keypoint': {'rotation': 15.0, 'scale': 0.1, 'shear': 0.1, 'jitter': 0.01, 'time_warp': 0.0},
+    'point_history': {'rotation': 10.0, 'scale': 0.05, 'shear': 0.05, 'jitter': 0.01,
+                      'time_warp': 0.2},
+}
+
+
+class LandmarkAugmenter(object):
+    """
+    关键点 / 轨迹数据的向量化增强
+
+    一次处理整批样本 (N, 21, 2) 关键点或 (N, 16, 2) 轨迹，所有随机变换都按样本
+    生成参数后用数组运算完成，没有逐样本的 Python 循环。增强结果只在训练时
+    通过 flow() 生成，不写回CSV。
+
+    变换后按 pre_process_landmark / pre_process_point_history 的方式重新换算：
+    关键点以手腕为原点并按最大绝对值归一化，轨迹以第一个点为原点。
+
+    参数:
+        kind: 'keypoint' / 'point_history'
+        rotation: 最大旋转角度 (度)，以下幅度参数为 None 时使用 AUGMENT_DEFAULTS 中该类数据的默认值
+        scale: 缩放幅度，缩放系数取 [1-scale, 1+scale]，x/y 方向各自取值
+               (关键点会重新归一化，只有横纵比的变化保留下来)
+        shear: 最大错切系数
+        jitter: 每个点的高斯噪声标准差，相对于每个样本的幅度 (最大绝对坐标)；
+                关键点幅度为1，轨迹的噪声随位移大小缩放，静止轨迹只加入极小的噪声
+        time_warp: 轨迹时间扭曲幅度，0 表示不扭曲 (仅 point_history)
+        mirror_prob: 左右镜像的概率 (模拟另一只手 / 反方向的轨迹)
+        mirror_label_map: 镜像后标签的对应关系，例如 {3: 4, 4: 3} (顺时针 <-> 逆时针)
+        seed: 随机种子
+    """
+
+    def __init__(self, kind='keypoint', rotation=None, scale=None, shear=None, jitter=None,
+                 time_warp=None, mirror_prob=0.0, mirror_label_map=None, seed=None):
+        defaults = AUGMENT_DEFAULTS[kind]
+        self.kind = kind
+        self.rotation = defaults['rotation'] if rotation is None else rotation
+        self.scale = defaults['scale'] if scale is None else scale
+        self.shear = defaults['shear'] if shear is None else shear
+        self.jitter = defaults['jitter'] if jitter is None else jitter
+        time_warp = defaults['time_warp'] if time_warp is None else time_warp
+        self.time_warp = time_warp if kind == 'point_history' else 0.0
+        self.mirror_prob = mirror_prob
+        self.mirror_label_map = mirror_label_map or {}
+        self._rng = np.random.RandomState(seed)
+
+    def _affine(self, count):
+        # 每个样本一个 2x2 变换矩阵: 旋转 @ 错切 @ 缩放
+        rng = self._rng
+        angle = np.deg2rad(rng.uniform(-self.rotation, self.rotation, count))
+        cos, sin = np.cos(angle), np.sin(angle)
+        rotate = np.stack([np.stack([cos, -sin], axis=-1),
+                           np.stack([sin, cos], axis=-1)], axis=-2)
+
+        shear = rng.uniform(-self.shear, self.shear, count)
+        scale_x = rng.uniform(1 - self.scale, 1 + self.scale, count)
+        scale_y = rng.uniform(1 - self.scale, 1 + self.scale, count)
+        shear_scale = np.stack([np.stack([scale_x, shear * scale_y], axis=-1),
+                                np.stack([np.zeros(count), scale_y], axis=-1)], axis=-2)
+        return np.matmul(rotate, shear_scale)
+
+    def _warp_time(self, points):
+        # 归一化时间 t 映射为 t**gamma，起点和终点不变，中间加速或减速，线性插值取值
+        count, steps = points.shape[0], points.shape[1]
+        gamma = np.exp(self._rng.uniform(-self.time_warp, self.time_warp, count))
+        source = np.linspace(0.0, 1.0, steps)[None, :] ** gamma[:, None] * (steps - 1)
+        lower = np.floor(source).astype(np.int64)
+        upper = np.minimum(lower + 1, steps - 1)
+        fraction = (source - lower)[:, :, None]
+        lower_points = np.take_along_axis(points, lower[:, :, None], axis=1)
+        upper_points = np.take_along_axis(points, upper[:, :, None], axis=1)
+        return lower_points + (upper_points - lower_points) * fraction
+
+    def augment(self, X, y):
+        """
+        增强一批样本
+
+        参数:
+            X: [N, 42] 关键点特征或 [N, 32] 轨迹特征
+            y: [N] 标签
+        返回:
+            (X, y)，X 为 float32，镜像样本的标签按 mirror_label_map 替换
+        """
+        X = np.asarray(X, dtype=np.float32)
+        y = np.array(y, dtype=np.int32)
+        count = len(X)
+        points = X.reshape(count, -1, 2).astype(np.float64)
+
+        if self.mirror_prob > 0:
+            mirrored = self._rng.random_sample(count) < self.mirror_prob
+            points[mirrored, :, 0] *= -1
+            # 按原标签查表，3->4、4->3 互换时不会相互覆盖
+            mapped = y.copy()
+            for source_label, target_label in self.mirror_label_map.items():
+                mapped[y == source_label] = target_label
+            y = np.where(mirrored, mapped, y).astype(np.int32)
+
+        if self.time_warp > 0:
+            points = self._warp_time(points)
+
+        points = np.einsum('nij,ntj->nti', self._affine(count), points)
+        if self.jitter > 0:
+            # 噪声相对于样本幅度 (以第一个点为原点的最大绝对坐标)
+            extent = np.abs(points - points[:, :1, :]).max(axis=(1, 2), keepdims=True)
+            points += self._rng.normal(0.0, 1.0, points.shape) * (self.jitter * extent)
+
+        # 重新以第一个点 (手腕 / 轨迹起点) 为原点
+        points -= points[:, :1, :]
+        X = points.reshape(count, -1)
+        if self.kind == 'keypoint':
+            max_value = np.abs(X).max(axis=1, keepdims=True)
+            X = X / np.where(max_value > 0, max_value, 1.0)
+        return X.astype(np.float32), y
+
+    def flow(self, X, y, batch_size=128, shuffle=True):
+        """
+        无限生成增强后的批次，用于 model.fit(..., steps_per_epoch=...)
+
+        每轮重新打乱顺序并重新抽取变换参数，同一个样本每轮得到不同的增强结果
+        """
+        X = np.asarray(X, dtype=np.float32)
+        y = np.asarray(y, dtype=np.int32)
+        while True:
+            order = self._rng.permutation(len(y)) if shuffle else np.arange(len(y))
+            for start in range(0, len(order), batch_size):
+                index = order[start:start + batch_size]
+                yield self.augment(X[index], y[index])
+
+    @staticmethod
+    def steps_per_epoch(sample_count, batch_size):
+        return max(1, -(-sample_count // batch_size))
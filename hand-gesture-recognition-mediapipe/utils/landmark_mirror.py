@@ -0,0 +1,29 @@
+def mirror_x(normalized_x, image_width):
+    """
+    把未镜像帧上的归一化x坐标换算为镜像后图像中的像素x坐标
+
+    与先 cv.flip(image, 1) 再计算坐标的结果一致，但不需要翻转整帧图像
+
+    参数:
+        normalized_x: MediaPipe归一化x坐标 (基于未镜像帧)
+        image_width: 图像宽度
+    返回:
+        镜像图像中的像素x坐标
+    """
+    return min(int((1.0 - normalized_x) * image_width), image_width - 1)
+
+
+def mirror_handedness(label):
+    """
+    MediaPipe 假设输入是镜像 (自拍) 图像，在未镜像帧上左右手标签相反，交换后与原先翻转图像时一致
+
+    参数:
+        label: MediaPipe 输出的 'Left' / 'Right'
+    返回:
+        交换后的标签
+    """
+    if label == 'Left':
+        return 'Right'
+    if label == 'Right':
+        return 'Left'
+    return label
@@ -0,0 +1,107 @@
+import time
+import cv2 as cv
+
+
+class LatestFrameReader(object):
+    """
+    只读取最新帧的摄像头包装：处理跟不上摄像头时丢弃驱动中缓冲的旧帧
+
+    用 cap.grab() 跳过旧帧 (不解码，几乎没有开销)，只对最新的一帧 retrieve()。
+    判断旧帧的依据:
+      1. 驱动时间戳 (CAP_PROP_POS_MSEC) 可用时，用"当前时间 - 驱动时间戳"的最小值
+         估计两个时钟的偏移，帧龄 = 当前差值 - 最小差值，帧龄超过 stale_periods 个帧周期即为旧帧；
+      2. 驱动不提供时间戳时 (DSHOW/MSMF)，单次 grab() 立即返回只说明最新帧已在等待，
+         它仍是可用的最新帧，不能丢弃。只有连续 backlog_reads 次读取的 grab() 都立即返回
+         (处理持续慢于摄像头，缓冲中积压了多帧) 才继续 grab()，并且只在后续 grab() 也
+         立即返回时继续丢弃；一旦 grab() 需要等待，说明积压已清空，停止丢弃。
+         如果第一次额外的 grab() 就需要等待，说明驱动缓冲只有一帧 (例如 BUFFERSIZE=1 生效)，
+         立即返回的帧就是最新帧，之后不再丢弃。
+         这种情况下无法得到帧龄，last_age 为 None。
+
+    提供与 cv.VideoCapture.read 相同的接口，可以直接传给 FramePool.read()。
+
+    参数:
+        cap: cv.VideoCapture
+        fps: 摄像头帧率
+        max_drops: 每次读取最多丢弃的帧数
+        stale_periods: 帧龄超过多少个帧周期视为旧帧
+        backlog_reads: 没有驱动时间戳时，连续多少次读取的 grab() 立即返回才认为存在积压
+    """
+
+    def __init__(self, cap, fps=60.0, max_drops=4, stale_periods=1.5, backlog_reads=3):
+        self._cap = cap
+        self._period = 1.0 / fps if fps > 0 else 1.0 / 30
+        self._max_drops = max_drops
+        self._stale_periods = stale_periods
+        self._clock_offset = None    # 当前时间与驱动时间戳之差的最小值 (秒)
+        self._last_driver_time = None
+        self._driver_timestamps = True
+        self._backlog_reads = backlog_reads
+        self._instant_reads = 0      # 连续立即返回的读取次数
+        self._drain_backlog = True   # 驱动缓冲只有一帧时关闭
+        self.last_age = 0.0   # 最近一帧的帧龄 (秒)，无法估计时为 None
+        self.dropped = 0      # 累计丢弃的旧帧数
+
+    def _driver_age(self):
+        """按驱动时间戳估计帧龄 (秒)，驱动不提供单调时间戳时返回 None"""
+        now = time.monotonic()
+        driver_time = self._cap.get(cv.CAP_PROP_POS_MSEC) / 1000.0
+        if driver_time <= 0 or (self._last_driver_time is not None
+                                and driver_time < self._last_driver_time):
+            # 驱动不提供单调的帧时间戳，改用 grab 耗时判断积压
+            self._driver_timestamps = False
+            return None
+        self._last_driver_time = driver_time
+        difference = now - driver_time
+        if self._clock_offset is None or difference < self._clock_offset:
+            self._clock_offset = difference
+        return difference - self._clock_offset
+
+    def _grab(self):
+        """返回 (是否成功, grab() 是否立即返回)"""
+        grab_start = time.perf_counter()
+        ret = self._cap.grab()
+        return ret, time.perf_counter() - grab_start < self._period * 0.1
+
+    def read(self, image=None):
+        drops = 0
+        ret, instant = self._grab()
+        if not ret:
+            return False, None
+
+        if self._driver_timestamps:
+            age = self._driver_age()
+            while (age is not None and age > self._period * self._stale_periods
+                   and drops < self._max_drops):
+                ret, instant = self._grab()
+                if not ret:
+                    return False, None
+                drops += 1
+                age = self._driver_age()
+
+        if not self._driver_timestamps:
+            age = None
+            self._instant_reads = self._instant_reads + 1 if instant else 0
+            if self._drain_backlog and self._instant_reads >= self._backlog_reads:
+                # 持续积压：继续丢弃，直到 grab() 需要等待 (取到的是刚到达的新帧)
+                while instant and drops < self._max_drops:
+                    ret, instant = self._grab()
+                    if not ret:
+                        return False, None
+                    drops += 1
+                if drops == 1 and not instant:
+                    self._drain_backlog = False
+                self._instant_reads = 0
+
+        self.dropped += drops
+        self.last_age = age
+        return self._cap.retrieve(image)
+
+    def get(self, prop_id):
+        return self._cap.get(prop_id)
+
+    def set(self, prop_id, value):
+        return self._cap.set(prop_id, value)
+
+    def release(self):
+        self._cap.release()
@@ -0,0 +1,172 @@
+import os
+import csv
+import json
+import time
+import socket
+import threading
+import numpy as np
+
+
+def load_labels(label_path):
+    with open(label_path, encoding='utf-8-sig') as f:
+        return [row[0] for row in csv.reader(f) if row]
+
+
+class HotSwapClassifier(object):
+    """
+    可在运行时热替换的分类器 (模型 + 标签)
+
+    新模型和标签在后台线程中加载并预热 (执行一次推理，完成张量分配)，
+    完成后通过一次引用赋值原子地替换。主循环每帧开始时调用 snapshot()
+    取得本帧使用的 (分类器, 标签, 版本)，替换只会发生在两帧之间，不会阻塞视觉循环。
+    版本号与模型在同一个元组中发布，取到新模型时一定同时取到新版本号。
+
+    参数:
+        factory: 分类器构造函数，例如 KeyPointClassifier，需要接受 model_path 参数
+        model_path: 模型文件路径
+        label_path: 标签CSV路径
+        name: 日志中使用的名称
+    """
+
+    def __init__(self, factory, model_path, label_path, name='classifier'):
+        self._factory = factory
+        self._name = name
+        self._lock = threading.Lock()
+        self._loading = False
+        self.model_path = model_path
+        self.label_path = label_path
+        # (分类器, 标签, 版本)，版本每次替换加1，主循环据此重置依赖旧模型输出的状态
+        self._current = (factory(model_path=model_path), load_labels(label_path), 0)
+
+    @property
+    def version(self):
+        return self._current[2]
+
+    def snapshot(self):
+        """返回 (分类器, 标签, 版本)，同一帧内应只使用同一个快照"""
+        return self._current
+
+    def request_reload(self, model_path=None, label_path=None):
+        """
+        在后台线程中加载新模型，已有加载任务时忽略本次请求
+
+        参数:
+            model_path: 新模型路径，None 表示重新加载当前路径
+            label_path: 新标签路径，None 表示重新加载当前路径
+        """
+        with self._lock:
+            if self._loading:
+                return False
+            self._loading = True
+        thread = threading.Thread(target=self._reload,
+                                  args=(model_path or self.model_path, label_path or self.label_path),
+                                  daemon=True)
+        thread.start()
+        return True
+
+    def _reload(self, model_path, label_path):
+        try:
+            start_time = time.time()
+            classifier = self._factory(model_path=model_path)
+            labels = load_labels(label_path)
+
+            # 预热：执行一次推理，避免替换后的第一帧出现延迟尖峰
+            input_size = int(classifier.input_details[0]['shape'][-1])
+            classifier(np.zeros(input_size, dtype=np.float32))
+
+            output_size = int(classifier.output_details[0]['shape'][-1])
+            if output_size != len(labels):
+                print(f"[{self._name}] 模型输出 {output_size} 类与标签数 {len(labels)} 不一致，放弃替换")
+                return
+
+            self.model_path = model_path
+            self.label_path = label_path
+            self._current = (classifier, labels, self._current[2] + 1)
+            print(f"[{self._name}] 已替换为 {model_path} ({len(labels)} 类), "
+                  f"加载用时 {(time.time() - start_time) * 1000:.0f}ms")
+        except Exception as e:
+            print(f"[{self._name}] 加载模型失败，继续使用旧模型: {e}")
+        finally:
+            with self._lock:
+                self._loading = False
+
+
+def watch_model_files(models, interval=1.0, stop_event=None):
+    """
+    文件监视：模型或标签文件的修改时间变化并稳定一个周期后触发重新加载
+
+    参数:
+        models: HotSwapClassifier 列表
+        interval: 轮询间隔 (秒)
+        stop_event: threading.Event，置位后停止监视
+    """
+    def mtimes(model):
+        try:
+            return (os.path.getmtime(model.model_path), os.path.getmtime(model.label_path))
+        except OSError:
+            return None
+
+    def run():
+        known = {id(model): (model.model_path, mtimes(model)) for model in models}
+        changed = {}
+        while stop_event is None or not stop_event.is_set():
+            time.sleep(interval)
+            for model in models:
+                current = (model.model_path, mtimes(model))
+                if current[0] != known[id(model)][0]:
+                    # 路径已被其他方式替换，只更新记录
+                    known[id(model)] = current
+                if current[1] is None or current == known[id(model)]:
+                    changed.pop(id(model), None)
+                    continue
+                # 文件可能仍在写入，等待修改时间连续两个周期不变再加载
+                if changed.get(id(model)) != current:
+                    changed[id(model)] = current
+                    continue
+                known[id(model)] = current
+                changed.pop(id(model), None)
+                model.request_reload()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def reload_control_listener(port, models, stop_event=None):
+    """
+    控制消息：在UDP端口上接收重新加载请求
+
+    消息格式 (JSON):
+        {"cmd": "reload", "target": "keypoint", "model_path": "...", "label_path": "..."}
+    target 省略时重新加载全部模型，model_path / label_path 省略时重新加载当前文件。
+
+    参数:
+        port: 监听端口 (仅本机)
+        models: {target名称: HotSwapClassifier}
+        stop_event: threading.Event，置位后停止监听
+    """
+    def run():
+        control_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        control_socket.bind(('127.0.0.1', port))
+        control_socket.settimeout(0.5)
+        try:
+            while stop_event is None or not stop_event.is_set():
+                try:
+                    data, _ = control_socket.recvfrom(4096)
+                    message = json.loads(data.decode('utf-8'))
+                except socket.timeout:
+                    continue
+                except ValueError:
+                    continue
+                if not isinstance(message, dict) or message.get("cmd") != "reload":
+                    continue
+                target = message.get("target")
+                for name, model in models.items():
+                    if target is None or target == name:
+                        model.request_reload(message.get("model_path"), message.get("label_path"))
+        finally:
+            control_socket.close()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
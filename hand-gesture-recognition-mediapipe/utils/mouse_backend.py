@@ -0,0 +1,159 @@
+import time
+
+
+class MouseBackend(object):
+    """
+    鼠标注入后端基类
+
+    连续的移动命令只保存最新坐标，由 flush() 按显示刷新率合并为一次注入；
+    按键事件会先注入尚未执行的移动，再立即注入按键，保证顺序。
+
+    参数:
+        screen_size: 屏幕分辨率 (宽, 高)
+        refresh_rate: 移动注入频率 (Hz)，通常等于显示器刷新率
+    """
+
+    def __init__(self, screen_size, refresh_rate=60):
+        self.screen_width, self.screen_height = screen_size
+        self._interval = 1.0 / refresh_rate
+        self._pending = None
+        self._last_inject = 0.0
+
+    def move(self, x, y):
+        self._pending = (int(x), int(y))
+
+    def button_down(self):
+        self._flush_pending()
+        self._inject_button(True)
+
+    def button_up(self):
+        self._flush_pending()
+        self._inject_button(False)
+
+    def flush(self):
+        """到达刷新周期时注入最新的移动"""
+        if self._pending is not None and \
+                time.perf_counter() - self._last_inject >= self._interval:
+            self._flush_pending()
+
+    def flush_timeout(self, idle_timeout=0.1):
+        """距离下一次需要 flush() 的时间 (秒)"""
+        if self._pending is None:
+            return idle_timeout
+        return max(0.0, self._last_inject + self._interval - time.perf_counter())
+
+    def close(self):
+        pass
+
+    def _flush_pending(self):
+        if self._pending is not None:
+            self._inject_move(*self._pending)
+            self._pending = None
+            self._last_inject = time.perf_counter()
+
+    def _inject_move(self, x, y):
+        raise NotImplementedError
+
+    def _inject_button(self, down):
+        raise NotImplementedError
+
+
+class PyAutoGUIBackend(MouseBackend):
+    """通用后端：pyautogui，兼容所有平台"""
+
+    def __init__(self, screen_size, refresh_rate=60):
+        super().__init__(screen_size, refresh_rate)
+        import pyautogui
+        pyautogui.MINIMUM_DURATION = 0  # 设置移动持续时间为0
+        pyautogui.MINIMUM_SLEEP = 0     # 设置最小休眠时间为0
+        pyautogui.PAUSE = 0             # 设置命令间暂停时间为0
+        self._pyautogui = pyautogui
+
+    def _inject_move(self, x, y):
+        self._pyautogui.moveTo(x, y)
+
+    def _inject_button(self, down):
+        if down:
+            self._pyautogui.mouseDown()
+        else:
+            self._pyautogui.mouseUp()
+
+
+class XTestBackend(MouseBackend):
+    """X11 后端：通过 XTest 扩展直接注入事件 (需要 python-xlib)"""
+
+    def __init__(self, screen_size, refresh_rate=60):
+        super().__init__(screen_size, refresh_rate)
+        from Xlib import X, display
+        from Xlib.ext import xtest
+        self._X = X
+        self._xtest = xtest
+        self._display = display.Display()
+
+    def _inject_move(self, x, y):
+        self._xtest.fake_input(self._display, self._X.MotionNotify, x=x, y=y)
+        self._display.flush()
+
+    def _inject_button(self, down):
+        event_type = self._X.ButtonPress if down else self._X.ButtonRelease
+        self._xtest.fake_input(self._display, event_type, 1)
+        self._display.flush()
+
+    def close(self):
+        self._display.close()
+
+
+class UInputBackend(MouseBackend):
+    """Linux 后端：uinput 虚拟绝对坐标指针 (需要 python-evdev 和 /dev/uinput 写权限)"""
+
+    def __init__(self, screen_size, refresh_rate=60):
+        super().__init__(screen_size, refresh_rate)
+        from evdev import UInput, AbsInfo, ecodes
+        self._ecodes = ecodes
+        capabilities = {
+            ecodes.EV_KEY: [ecodes.BTN_LEFT],
+            ecodes.EV_ABS: [
+                (ecodes.ABS_X, AbsInfo(0, 0, self.screen_width - 1, 0, 0, 0)),
+                (ecodes.ABS_Y, AbsInfo(0, 0, self.screen_height - 1, 0, 0, 0)),
+            ],
+        }
+        self._uinput = UInput(capabilities, name='hand-gesture-pointer')
+
+    def _inject_move(self, x, y):
+        self._uinput.write(self._ecodes.EV_ABS, self._ecodes.ABS_X, x)
+        self._uinput.write(self._ecodes.EV_ABS, self._ecodes.ABS_Y, y)
+        self._uinput.syn()
+
+    def _inject_button(self, down):
+        self._uinput.write(self._ecodes.EV_KEY, self._ecodes.BTN_LEFT, 1 if down else 0)
+        self._uinput.syn()
+
+    def close(self):
+        self._uinput.close()
+
+
+class RecordingBackend(MouseBackend):
+    """测试用后端：不注入任何事件，只记录 (时间戳, 类型, 参数)"""
+
+    def __init__(self, screen_size=(1920, 1080), refresh_rate=60):
+        super().__init__(screen_size, refresh_rate)
+        self.events = []
+
+    def _inject_move(self, x, y):
+        self.events.append((time.perf_counter(), 'move', (x, y)))
+
+    def _inject_button(self, down):
+        self.events.append((time.perf_counter(), 'mouse_down' if down else 'mouse_up', None))
+
+
+MOUSE_BACKENDS = {
+    'pyautogui': PyAutoGUIBackend,
+    'xtest': XTestBackend,
+    'uinput': UInputBackend,
+    'recording': RecordingBackend,
+}
+
+
+def create_mouse_backend(name, screen_size, refresh_rate=60):
+    """按名称创建鼠标后端，name 为 MOUSE_BACKENDS 中的键"""
+    return MOUSE_BACKENDS[name](screen_size, refresh_rate)
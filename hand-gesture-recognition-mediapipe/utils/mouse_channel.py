@@ -0,0 +1,67 @@
+import time
+import ctypes
+import multiprocessing as multi_proc
+
+
+class MouseCommandChannel(object):
+    """
+    鼠标控制进程的命令通道
+
+    - 移动: 共享内存中的"最新位置"槽，只保留最新坐标，旧坐标直接被覆盖
+    - 按键: 有序队列，按下/释放事件永不丢弃
+    - 消费者阻塞在唤醒事件上，而不是空转轮询
+    """
+
+    def __init__(self):
+        # [序号, x, y, 时间戳]，序号变化表示有新的位置
+        self._position = multi_proc.Array(ctypes.c_double, 4)
+        # SimpleQueue 在put返回时数据已写入管道，唤醒后消费者一定能读到事件
+        self._events = multi_proc.SimpleQueue()
+        self._wakeup = multi_proc.Event()
+        self._last_seq = 0
+
+    # 生产者 (主进程) ###########################################################
+    def post_move(self, x, y, timestamp=None):
+        with self._position.get_lock():
+            self._position[0] += 1
+            self._position[1] = x
+            self._position[2] = y
+            self._position[3] = time.perf_counter() if timestamp is None else timestamp
+        self._wakeup.set()
+
+    def post_button(self, event_type):
+        """event_type: "mouse_down" / "mouse_up"，附带事件发生时的位置"""
+        with self._position.get_lock():
+            x, y = self._position[1], self._position[2]
+        self._events.put({"type": event_type, "x": int(x), "y": int(y)})
+        self._wakeup.set()
+
+    # 消费者 (鼠标控制进程) #####################################################
+    def wait(self, timeout=None):
+        """阻塞直到有新命令，返回是否被唤醒"""
+        woken = self._wakeup.wait(timeout)
+        if woken:
+            self._wakeup.clear()
+        return woken
+
+    def take_events(self):
+        events = []
+        while not self._events.empty():
+            events.append(self._events.get())
+        return events
+
+    def take_move(self):
+        """返回自上次读取以来的最新位置，没有新位置时返回None"""
+        sample = self.take_sample()
+        if sample is None:
+            return None
+        return int(sample[1]), int(sample[2])
+
+    def take_sample(self):
+        """返回自上次读取以来的最新样本 (时间戳, x, y)，没有新样本时返回None"""
+        with self._position.get_lock():
+            seq, x, y, timestamp = self._position[:]
+        if seq == self._last_seq:
+            return None
+        self._last_seq = seq
+        return timestamp, x, y
@@ -0,0 +1,70 @@
+import queue
+import threading
+
+
+class PipelinedExecutor(object):
+    """
+    两阶段流水线执行器
+
+    工作线程对第 N 帧运行 stage_fn (例如 MediaPipe 推理)，
+    同时主线程处理第 N-1 帧的结果 (分类、滤波、发送、绘制)。
+    MediaPipe 和 TFLite 在本地推理时释放GIL，两个阶段可以真正重叠，
+    稳定吞吐量接近最慢阶段的速度而不是各阶段耗时之和。
+
+    只有一个工作线程、输入输出都是FIFO，因此结果顺序与提交顺序一致，
+    提交时的参数 (包括时间戳) 会原样随结果返回。
+
+    参数:
+        stage_fn: 工作线程中执行的函数
+        depth: 在途帧数，主线程在流水线填满后才开始取结果
+    """
+
+    def __init__(self, stage_fn, depth=1):
+        self._stage_fn = stage_fn
+        self._depth = depth
+        self._inputs = queue.Queue()
+        self._outputs = queue.Queue()
+        self._pending = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._inputs.get()
+            if item is None:
+                break
+            try:
+                self._outputs.put((item, self._stage_fn(*item), None))
+            except Exception as e:
+                self._outputs.put((item, None, e))
+
+    def submit(self, *args):
+        """
+        提交一帧
+
+        返回:
+            流水线填满后返回最早提交那一帧的 (args, result)，否则返回 None
+        """
+        self._inputs.put(args)
+        self._pending += 1
+        if self._pending <= self._depth:
+            return None
+        return self._take()
+
+    def _take(self):
+        args, result, error = self._outputs.get()
+        self._pending -= 1
+        if error is not None:
+            raise error
+        return args, result
+
+    def drain(self):
+        """取出所有在途帧的结果"""
+        results = []
+        while self._pending > 0:
+            results.append(self._take())
+        return results
+
+    def close(self):
+        self._inputs.put(None)
+        self._thread.join(timeout=2.0)
@@ -0,0 +1,73 @@
+import numpy as np
+
+
+class PoseChangeGate(object):
+    """
+    姿态变化门控：手势姿态基本不变时复用上一次的关键点分类结果
+
+    把预处理后的42维关键点向量与上次实际分类时的向量比较，
+    最大绝对差小于 threshold 时直接返回缓存的分类结果；
+    连续复用 max_age 帧后强制重新分类一次，避免缓存长期漂移。
+
+    参数:
+        threshold: 向量最大绝对差阈值 (向量已归一化到[-1, 1])，0表示禁用门控
+        max_age: 最多连续复用的帧数
+    """
+
+    def __init__(self, threshold=0.02, max_age=10):
+        self._threshold = threshold
+        self._max_age = max_age
+        self._vector = None
+        self._result = None
+        self._age = 0
+        self.hits = 0    # 复用缓存的次数
+        self.misses = 0  # 实际调用分类器的次数
+
+    def lookup(self, landmark_vector):
+        """
+        参数:
+            landmark_vector: pre_process_landmark 的输出
+        返回:
+            姿态未变化时返回缓存的分类结果，否则返回 None (需要重新分类)
+        """
+        if self._threshold <= 0 or self._vector is None or self._age >= self._max_age:
+            return None
+        difference = np.max(np.abs(np.asarray(landmark_vector, dtype=np.float32) - self._vector))
+        if difference >= self._threshold:
+            return None
+        self._age += 1
+        self.hits += 1
+        return self._result
+
+    def store(self, landmark_vector, result):
+        """记录实际分类的输入向量和结果"""
+        self._vector = np.asarray(landmark_vector, dtype=np.float32)
+        self._result = result
+        self._age = 0
+        self.misses += 1
+
+    def reset(self):
+        self._vector = None
+        self._result = None
+        self._age = 0
+
+
+def classify_gated(classifier, gates, landmark_vectors):
+    """
+    带门控的批量关键点分类：只把姿态发生变化的手送入分类器
+
+    参数:
+        classifier: 提供 classify_batch 的分类器
+        gates: 与 landmark_vectors 一一对应的 PoseChangeGate
+        landmark_vectors: 预处理后的关键点向量列表
+    返回:
+        与 landmark_vectors 顺序一致的分类结果列表
+    """
+    results = [gate.lookup(vector) for gate, vector in zip(gates, landmark_vectors)]
+    pending = [i for i, result in enumerate(results) if result is None]
+    if pending:
+        classified = classifier.classify_batch([landmark_vectors[i] for i in pending])
+        for i, result in zip(pending, classified):
+            gates[i].store(landmark_vectors[i], result)
+            results[i] = result
+    return results
@@ -0,0 +1,75 @@
+from collections import deque
+
+
+class SampleBundler(object):
+    """
+    发送端：在每个UDP数据包中附带最近 K 个带时间戳的样本
+
+    数据包中新增字段:
+        "seq": 最新样本序号
+        "t": 最新样本时间戳 (发送端时钟，秒)
+        "samples": [[序号, 相对最新样本的时间偏移(ms), x, y], ...] 按时间从旧到新
+
+    参数:
+        bundle_size: 每个数据包携带的样本数 K
+    """
+
+    def __init__(self, bundle_size=4):
+        self._samples = deque(maxlen=bundle_size)
+        self._seq = 0
+
+    def add(self, timestamp, x, y):
+        self._seq += 1
+        self._samples.append((self._seq, timestamp, x, y))
+        return self._seq
+
+    def encode(self, data):
+        """把样本数组写入数据包字典 data 并返回它"""
+        if not self._samples:
+            return data
+        newest_seq, newest_time = self._samples[-1][0], self._samples[-1][1]
+        data["seq"] = newest_seq
+        data["t"] = round(newest_time, 4)
+        data["samples"] = [
+            [seq, round((timestamp - newest_time) * 1000, 1), round(x, 4), round(y, 4)]
+            for seq, timestamp, x, y in self._samples
+        ]
+        return data
+
+
+class SampleBundleDecoder(object):
+    """
+    接收端参考解码：从带样本数组的数据包中恢复丢失的样本
+
+    decode() 返回本数据包中尚未见过的样本 [(序号, 时间戳, x, y), ...]，
+    其中除最新样本外的都是因前面数据包丢失而被恢复的样本。
+    """
+
+    def __init__(self):
+        self._last_seq = None
+        self.received = 0    # 收到的数据包数
+        self.recovered = 0   # 从样本数组中恢复的样本数
+        self.lost = 0        # 超出样本数组范围、无法恢复的样本数
+
+    def decode(self, packet):
+        samples = packet.get("samples")
+        if not samples:
+            return []
+        self.received += 1
+
+        newest_time = packet["t"]
+        new_samples = []
+        for seq, offset_ms, x, y in samples:
+            if self._last_seq is not None and seq <= self._last_seq:
+                continue  # 已经收到过，或是乱序到达的旧数据包
+            new_samples.append((seq, newest_time + offset_ms / 1000.0, x, y))
+
+        if not new_samples:
+            return []
+
+        if self._last_seq is not None:
+            self.lost += max(0, new_samples[0][0] - self._last_seq - 1)
+            self.recovered += len(new_samples) - 1
+        self._last_seq = new_samples[-1][0]
+
+        return new_samples
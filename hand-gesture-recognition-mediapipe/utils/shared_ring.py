@@ -0,0 +1,176 @@
+import ctypes
+import multiprocessing as multi_proc
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedArrayRing(object):
+    """
+    基于 multiprocessing.shared_memory 的单生产者/单消费者数组环形缓冲区
+
+    每个槽是一块预分配的共享内存数组，生产者直接写入槽、消费者直接读取槽，
+    数据在进程之间不经过pickle。空槽/满槽数量由两个信号量管理。
+
+    参数:
+        shape: 每个槽的数组形状，例如 (540, 960, 3)
+        dtype: 数组类型
+        num_slots: 槽数量
+    """
+
+    def __init__(self, shape, dtype=np.uint8, num_slots=4):
+        self._shape = tuple(shape)
+        self._dtype = np.dtype(dtype)
+        self._num_slots = num_slots
+
+        slot_nbytes = int(np.prod(self._shape)) * self._dtype.itemsize
+        self._shm = shared_memory.SharedMemory(create=True,
+                                               size=slot_nbytes * num_slots)
+        # 每个槽的元数据: 序号, 时间戳
+        self._meta = multi_proc.Array(ctypes.c_double, num_slots * 2, lock=False)
+        self._free = multi_proc.Semaphore(num_slots)
+        self._filled = multi_proc.Semaphore(0)
+
+        # 单生产者/单消费者，读写位置各自在本进程内递增即可
+        self._write_index = 0
+        self._read_index = 0
+        self._attach()
+
+    def _attach(self):
+        self._slots = np.ndarray((self._num_slots,) + self._shape,
+                                 dtype=self._dtype, buffer=self._shm.buf)
+
+    def __getstate__(self):
+        # 子进程(spawn)中重新映射共享内存视图
+        state = dict(self.__dict__)
+        del state['_slots']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._attach()
+
+    def acquire_write(self, timeout=None):
+        """
+        获取一个空槽用于写入，超时返回 None
+
+        返回:
+            (槽索引, 槽数组视图) 或 None
+        """
+        if not self._free.acquire(timeout=timeout):
+            return None
+        index = self._write_index
+        self._write_index = (self._write_index + 1) % self._num_slots
+        return index, self._slots[index]
+
+    def commit_write(self, index, seq, timestamp):
+        self._meta[index * 2] = seq
+        self._meta[index * 2 + 1] = timestamp
+        self._filled.release()
+
+    def acquire_read(self, timeout=None):
+        """
+        获取最早写入的槽用于读取，超时返回 None
+
+        返回:
+            (槽索引, 槽数组视图, 序号, 时间戳) 或 None
+        """
+        if not self._filled.acquire(timeout=timeout):
+            return None
+        index = self._read_index
+        self._read_index = (self._read_index + 1) % self._num_slots
+        return (index, self._slots[index],
+                int(self._meta[index * 2]), self._meta[index * 2 + 1])
+
+    def release_read(self, index):
+        self._free.release()
+
+    def close(self):
+        self._slots = None
+        self._shm.close()
+
+    def unlink(self):
+        self._shm.unlink()
+
+
+class LatestArrayRing(SharedArrayRing):
+    """
+    最新帧优先的共享数组环形缓冲区 (单生产者/单消费者)
+
+    与 SharedArrayRing 的先进先出不同：
+      - 没有空槽时，生产者覆盖最早写入且尚未读取的槽，写入从不阻塞；
+      - 消费者总是取最新写入的槽，更早的未读槽直接释放。
+    消费者跟不上生产者时处理的始终是最新一帧，不会因为排队增加延迟。
+    被覆盖或跳过的槽数累计在 skipped 中 (跨进程共享)。
+
+    参数:
+        shape: 每个槽的数组形状
+        dtype: 数组类型
+        num_slots: 槽数量，至少为3 (写入中、已写入、读取中各一个)
+    """
+
+    _FREE, _WRITING, _FILLED, _READING = 0, 1, 2, 3
+
+    def __init__(self, shape, dtype=np.uint8, num_slots=3):
+        super().__init__(shape, dtype, max(num_slots, 3))
+        self._state = multi_proc.Array(ctypes.c_int, self._num_slots, lock=False)
+        self._condition = multi_proc.Condition()
+        self._skipped = multi_proc.Value(ctypes.c_long, 0, lock=False)
+
+    @property
+    def skipped(self):
+        return self._skipped.value
+
+    def _slots_in(self, state):
+        return [index for index in range(self._num_slots) if self._state[index] == state]
+
+    def acquire_write(self, timeout=None):
+        """
+        获取一个槽用于写入：优先空槽，没有空槽时覆盖最早写入的未读槽
+
+        返回:
+            (槽索引, 槽数组视图)，所有槽都在写入/读取中时返回 None
+        """
+        with self._condition:
+            free = self._slots_in(self._FREE)
+            if free:
+                index = free[0]
+            else:
+                filled = self._slots_in(self._FILLED)
+                if not filled:
+                    return None
+                index = min(filled, key=lambda i: self._meta[i * 2])
+                self._skipped.value += 1
+            self._state[index] = self._WRITING
+        return index, self._slots[index]
+
+    def commit_write(self, index, seq, timestamp):
+        with self._condition:
+            self._meta[index * 2] = seq
+            self._meta[index * 2 + 1] = timestamp
+            self._state[index] = self._FILLED
+            self._condition.notify()
+
+    def acquire_read(self, timeout=None):
+        """
+        获取最新写入的槽用于读取，更早的未读槽被释放，超时返回 None
+
+        返回:
+            (槽索引, 槽数组视图, 序号, 时间戳) 或 None
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._FILLED in self._state[:], timeout):
+                return None
+            filled = self._slots_in(self._FILLED)
+            index = max(filled, key=lambda i: self._meta[i * 2])
+            for older in filled:
+                if older != index:
+                    self._state[older] = self._FREE
+            self._skipped.value += len(filled) - 1
+            self._state[index] = self._READING
+        return (index, self._slots[index],
+                int(self._meta[index * 2]), self._meta[index * 2 + 1])
+
+    def release_read(self, index):
+        with self._condition:
+            self._state[index] = self._FREE
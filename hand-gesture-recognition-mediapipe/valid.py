@@ -18,6 +18,7 @@ matplotlib.rcParams['axes.unicode_minus'] = False  # 解决负号显示问题
 
 from model import KeyPointClassifier
 from model import PointHistoryClassifier
+from utils import compile_dataset
 
 
 def load_labels(model_type):
@@ -204,25 +205,17 @@ def main():
     # 加载标签
     labels = load_labels(model_type)
     
-    # 加载CSV数据
+    # 加载CSV数据 (编译为数组缓存，CSV未修改时直接打开缓存；测试集不去重)
     print(f"正在从文件加载数据: {csv_path}")
-    data = []
-    with open(csv_path, 'r') as f:
-        reader = csv.reader(f)
-        for row in reader:
-            if len(row) > 0:  # 确保行不为空
-                data.append(row)
+    dataset = compile_dataset(csv_path, dedup=False)
     
-    if not data:
+    if len(dataset) == 0:
         print("数据为空，请检查CSV文件")
         return
     
     # 分离标签和特征
-    y_true = []
-    X = []
-    for row in data:
-        y_true.append(int(row[0]))  # 第一列作为标签
-        X.append([float(x) for x in row[1:]])  # 其余列作为特征
+    y_true = dataset.y.tolist()
+    X = np.asarray(dataset.X)
     
     # 加载模型
     if model_type == "keypoint":
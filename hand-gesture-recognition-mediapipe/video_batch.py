@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import argparse
+import csv
+import os
+import time
+import shutil
+import subprocess
+import multiprocessing as multi_proc
+from collections import deque
+
+import cv2 as cv
+import mediapipe as mp
+
+from model import KeyPointClassifier
+from model import PointHistoryClassifier
+from utils import GestureVote
+from utils import mirror_handedness
+from PVZ_gesture_control import (
+    apply_coordinate_filter,
+    calc_landmark_list,
+    pre_process_landmark,
+    pre_process_point_history,
+)
+
+# 输出表的列：每帧一行，未检测到右手时关键点列为空
+TABLE_COLUMNS = (
+    ['video', 'frame', 'time_ms', 'detected', 'score',
+     'x', 'y', 'filtered_x', 'filtered_y', 'hand_gesture', 'finger_gesture'] +
+    [f'{axis}{i}' for i in range(21) for axis in ('lx', 'ly')]
+)
+
+# 有效操作区域，与PVZ_gesture_control保持一致
+X_MIN_RANGE, X_MAX_RANGE = 0.2, 0.8
+Y_MIN_RANGE, Y_MAX_RANGE = 0.3, 0.7
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("videos", nargs='+', help='recorded video files')
+    parser.add_argument("--output", help='per-frame table (csv)', default='video_batch.csv')
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    # 每个分块的最少帧数，分块边界对齐到关键帧
+    parser.add_argument("--chunk_frames", type=int, default=600)
+    # 每个分块向前多处理的帧数，用于预热跟踪、轨迹历史、滤波和投票状态，这些帧不输出
+    parser.add_argument("--warmup_frames", type=int, default=30)
+
+    parser.add_argument("--min_detection_confidence", type=float, default=0.5)
+    parser.add_argument("--min_tracking_confidence", type=float, default=0.5)
+    parser.add_argument("--vote_min_ratio", type=float, default=0.5)
+    parser.add_argument("--vote_min_dwell", type=int, default=3)
+    # 滤波在屏幕像素坐标上进行，与实时程序的取整保持一致
+    parser.add_argument("--screen_width", type=int, default=1920)
+    parser.add_argument("--screen_height", type=int, default=1080)
+
+    args = parser.parse_args()
+
+    return args
+
+
+def probe_keyframes(video_path, fps):
+    """
+    用 ffprobe 读取关键帧位置 (帧序号)，ffprobe 不可用或失败时返回 None
+    """
+    if shutil.which('ffprobe') is None or fps <= 0:
+        return None
+    command = ['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-skip_frame', 'nokey',
+               '-show_entries', 'frame=pts_time', '-of', 'csv=p=0', video_path]
+    try:
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    keyframes = set()
+    for line in output.split():
+        try:
+            keyframes.add(int(round(float(line.strip(',')) * fps)))
+        except ValueError:
+            continue
+    return sorted(keyframes) or None
+
+
+def split_chunks(video_path, chunk_frames):
+    """
+    把视频切分为 (起始帧, 结束帧) 分块，边界尽量对齐到关键帧，
+    这样每个分块的定位只需从关键帧开始解码
+    """
+    cap = cv.VideoCapture(video_path)
+    frame_total = int(cap.get(cv.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv.CAP_PROP_FPS)
+    cap.release()
+    if frame_total <= 0:
+        return [], fps
+
+    keyframes = probe_keyframes(video_path, fps) or list(range(0, frame_total, chunk_frames))
+    boundaries = [0]
+    for keyframe in keyframes:
+        # 末尾不足半个分块的部分并入前一个分块
+        if keyframe - boundaries[-1] >= chunk_frames and frame_total - keyframe >= chunk_frames // 2:
+            boundaries.append(keyframe)
+    boundaries.append(frame_total)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:])], fps
+
+
+# 工作进程状态 ########################################################################
+_worker = {}
+
+
+def init_worker(args, keypoint_labels, point_history_labels):
+    """工作进程初始化：每个进程加载一次分类器"""
+    _worker['args'] = args
+    _worker['keypoint_classifier'] = KeyPointClassifier()
+    _worker['point_history_classifier'] = PointHistoryClassifier()
+    _worker['keypoint_labels'] = keypoint_labels
+    _worker['point_history_labels'] = point_history_labels
+
+
+def process_chunk(task):
+    """
+    处理一个分块，返回该分块的每帧结果行
+
+    参数:
+        task: (视频路径, 起始帧, 结束帧, fps)
+    """
+    video_path, start, end, fps = task
+    args = _worker['args']
+    keypoint_classifier = _worker['keypoint_classifier']
+    point_history_classifier = _worker['point_history_classifier']
+    keypoint_labels = _worker['keypoint_labels']
+    point_history_labels = _worker['point_history_labels']
+
+    # 每个分块使用新的跟踪状态，并从预热帧开始处理
+    hands = mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=1,
+        min_detection_confidence=args.min_detection_confidence,
+        min_tracking_confidence=args.min_tracking_confidence,
+        model_complexity=1
+    )
+    point_history = deque(maxlen=16)
+    positions_history = []
+    finger_gesture_vote = GestureVote(window_len=16,
+                                      min_ratio=args.vote_min_ratio,
+                                      min_dwell=args.vote_min_dwell)
+    name = os.path.basename(video_path)
+
+    first = max(0, start - args.warmup_frames)
+    cap = cv.VideoCapture(video_path)
+    if first > 0:
+        cap.set(cv.CAP_PROP_POS_FRAMES, first)
+
+    rows = []
+    rgb = None
+    for frame_index in range(first, end):
+        ret, image = cap.read()
+        if not ret:
+            break
+        if rgb is None or rgb.shape != image.shape:
+            rgb = image.copy()
+        cv.cvtColor(image, cv.COLOR_BGR2RGB, dst=rgb)
+        results = hands.process(rgb)
+
+        landmark_list = None
+        score = 0.0
+        if results.multi_hand_landmarks is not None:
+            for hand_landmarks, handedness in zip(results.multi_hand_landmarks,
+                                                  results.multi_handedness):
+                if mirror_handedness(handedness.classification[0].label) != 'Right':
+                    continue
+                landmark_list = calc_landmark_list(rgb, hand_landmarks, mirror=True)
+                score = handedness.classification[0].score
+                break
+
+        row = [name, frame_index, round(frame_index / fps * 1000, 1) if fps > 0 else 0]
+        image_height, image_width = image.shape[0], image.shape[1]
+        if landmark_list is not None:
+            hand_sign_id = keypoint_classifier(pre_process_landmark(landmark_list))
+            point_history.append(landmark_list[8] if hand_sign_id == 2 else [0, 0])
+
+            finger_gesture_id = 0
+            point_history_list = pre_process_point_history(rgb, point_history)
+            if len(point_history_list) == 32:
+                finger_gesture_id = point_history_classifier(point_history_list)
+            finger_gesture = point_history_labels[finger_gesture_vote.update(finger_gesture_id)]
+
+            x_ratio = landmark_list[0][0] / image_width
+            y_ratio = landmark_list[0][1] / image_height
+            x_mapped = max(0, min(1, (x_ratio - X_MIN_RANGE) / (X_MAX_RANGE - X_MIN_RANGE)))
+            y_mapped = max(0, min(1, (y_ratio - Y_MIN_RANGE) / (Y_MAX_RANGE - Y_MIN_RANGE)))
+            raw_point = [int(x_mapped * args.screen_width), int(y_mapped * args.screen_height)]
+            positions_history.append(raw_point)
+            if len(positions_history) > 5:
+                positions_history.pop(0)
+            target_x, target_y = apply_coordinate_filter(raw_point, positions_history, 0.6, 0.7)
+
+            row += [1, round(score, 3), round(x_mapped, 4), round(y_mapped, 4),
+                    round(target_x / args.screen_width, 4), round(target_y / args.screen_height, 4),
+                    keypoint_labels[hand_sign_id], finger_gesture]
+            for x, y in landmark_list:
+                row += [round(x / image_width, 4), round(y / image_height, 4)]
+        else:
+            point_history.append([0, 0])
+            row += [0, 0.0, '', '', '', '', 'Idle', 'None'] + [''] * 42
+
+        # 预热帧只用于建立状态，不输出
+        if frame_index >= start:
+            rows.append(row)
+
+    cap.release()
+    hands.close()
+    return video_path, start, rows
+
+
+def main():
+    args = get_args()
+
+    with open('model/keypoint_classifier/keypoint_classifier_label.csv',
+              encoding='utf-8-sig') as f:
+        keypoint_labels = [row[0] for row in csv.reader(f)]
+    with open('model/point_history_classifier/point_history_classifier_label.csv',
+              encoding='utf-8-sig') as f:
+        point_history_labels = [row[0] for row in csv.reader(f)]
+
+    tasks = []
+    video_seconds = 0.0
+    for video_path in args.videos:
+        chunks, fps = split_chunks(video_path, args.chunk_frames)
+        if not chunks:
+            print(f"无法读取视频: {video_path}")
+            continue
+        video_seconds += chunks[-1][1] / fps if fps > 0 else 0
+        print(f"{video_path}: {chunks[-1][1]} 帧, {len(chunks)} 个分块")
+        tasks += [(video_path, start, end, fps) for start, end in chunks]
+
+    if not tasks:
+        return
+
+    start_time = time.time()
+    frame_total = 0
+    with multi_proc.Pool(args.workers, initializer=init_worker,
+                         initargs=(args, keypoint_labels, point_history_labels)) as pool, \
+            open(args.output, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(TABLE_COLUMNS)
+        # imap 按提交顺序返回，输出表按视频和帧序号排列
+        for index, (video_path, start, rows) in enumerate(pool.imap(process_chunk, tasks)):
+            writer.writerows(rows)
+            frame_total += len(rows)
+            elapsed = time.time() - start_time
+            print(f"[{index + 1}/{len(tasks)}] {os.path.basename(video_path)} @{start}: "
+                  f"{frame_total} 帧, {frame_total / elapsed:.1f} 帧/秒")
+
+    elapsed = time.time() - start_time
+    print(f"完成: {frame_total} 帧, 用时 {elapsed:.1f}s, "
+          f"视频时长 {video_seconds:.1f}s ({video_seconds / elapsed:.2f}x 实时)")
+    print(f"结果已写入: {args.output}")
+
+
+if __name__ == '__main__':
+    multi_proc.freeze_support()
+    main()